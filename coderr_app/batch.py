@@ -0,0 +1,179 @@
+"""
+Batch endpoint: several GET requests of the API in one round trip.
+
+POST /api/batch/ with
+
+    {"requests": [{"path": "/api/base-info/"}, {"path": "/api/orders/?page=2"}], "concurrent": true}
+
+authenticates and throttles once, then resolves each path with the URL
+resolver and calls its view directly (no middleware), reusing the batch
+request's user and token. The sub-views run their own permission checks.
+Responses come back in request order as {"path", "status", "body"}.
+With "concurrent" the sub-requests run on a shared thread pool.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import close_old_connections
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from coderr_app.db_router import use_replica
+from coderr_app.middleware import may_read_replica
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the pool for concurrent batches, sized by BATCH_MAX_WORKERS.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BATCH_MAX_WORKERS', 4),
+                    thread_name_prefix='batch'
+                )
+    return _executor
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET'], default='GET')
+    path = serializers.CharField(max_length=2000)
+
+    def validate_path(self, value):
+        parts = urlsplit(value)
+        if parts.scheme or parts.netloc or not parts.path.startswith('/api/'):
+            raise serializers.ValidationError('Nur relative Pfade unter /api/ sind erlaubt.')
+        if parts.path.rstrip('/') == '/api/batch':
+            raise serializers.ValidationError('Batch-Anfragen können nicht verschachtelt werden.')
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+    concurrent = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        limit = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+        if len(value) > limit:
+            raise serializers.ValidationError(f'Maximal {limit} Anfragen pro Batch.')
+        return value
+
+
+class BatchEntrySerializer(serializers.Serializer):
+    path = serializers.CharField()
+    status = serializers.IntegerField()
+    body = serializers.JSONField()
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = BatchEntrySerializer(many=True)
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def build_subrequest(request, path):
+    """
+    Creates the HttpRequest of one sub-request from the batch request.
+    """
+    parts = urlsplit(path)
+    parent = request._request
+    subrequest = HttpRequest()
+    subrequest.method = 'GET'
+    subrequest.path = subrequest.path_info = parts.path
+    subrequest.META = {
+        **parent.META,
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': parts.path,
+        'QUERY_STRING': parts.query,
+        'CONTENT_LENGTH': '0',
+    }
+    subrequest.GET = QueryDict(parts.query)
+    subrequest.COOKIES = parent.COOKIES
+    subrequest._body = b''
+    subrequest._get_scheme = parent._get_scheme
+    subrequest.batch_parent = parent
+    for attribute in ('user', 'session'):
+        if hasattr(parent, attribute):
+            setattr(subrequest, attribute, getattr(parent, attribute))
+    # Reuse the batch's authentication instead of checking the token again.
+    subrequest._force_auth_user = request.user
+    subrequest._force_auth_token = request.auth
+    return subrequest
+
+
+def dispatch(request, path):
+    """
+    Runs one sub-request and returns its {"path", "status", "body"} entry.
+    """
+    subrequest = build_subrequest(request, path)
+    try:
+        match = resolve(subrequest.path_info)
+        subrequest.resolver_match = match
+        response = match.func(subrequest, *match.args, **match.kwargs)
+        if asyncio.iscoroutine(response):
+            response = async_to_sync(_await)(response)
+    except (Http404, Resolver404):
+        return {'path': path, 'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Nicht gefunden.'}}
+    except PermissionDenied:
+        return {'path': path, 'status': status.HTTP_403_FORBIDDEN, 'body': {'detail': 'Keine Berechtigung.'}}
+    except Exception:
+        logger.exception('Batch sub-request %s failed', path)
+        return {'path': path, 'status': status.HTTP_500_INTERNAL_SERVER_ERROR, 'body': {'detail': 'Serverfehler.'}}
+    if hasattr(response, 'data'):
+        body = response.data
+    else:
+        body = response.content.decode(response.charset or 'utf-8')
+    return {'path': path, 'status': response.status_code, 'body': body}
+
+
+def _dispatch_in_thread(request, path):
+    try:
+        return dispatch(request, path)
+    finally:
+        close_old_connections()
+
+
+class BatchView(APIView):
+    """
+    Runs up to BATCH_MAX_REQUESTS GET requests of the API in one request.
+    """
+    serializer_class = BatchSerializer
+
+    @extend_schema(request=BatchSerializer, responses=BatchResponseSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        paths = [item['path'] for item in serializer.validated_data['requests']]
+
+        # The batch only reads: it may use replicas and must not pin the client to the primary.
+        request._request.replica_read_only = True
+        with use_replica(may_read_replica(request)):
+            if serializer.validated_data['concurrent'] and len(paths) > 1:
+                futures = [
+                    get_executor().submit(contextvars.copy_context().run, _dispatch_in_thread, request, path)
+                    for path in paths
+                ]
+                responses = [future.result() for future in futures]
+            else:
+                responses = [dispatch(request, path) for path in paths]
+        return Response({'responses': responses})
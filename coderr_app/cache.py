@@ -0,0 +1,162 @@
+"""
+Tag-based response cache for the read endpoints.
+
+Cached entries store the version of every tag they depend on. Invalidating a
+tag stores a new version, so all entries carrying the old one become misses.
+This only needs get/set/get_many and therefore works on the locmem, file and
+shared (Redis/Memcached) cache backends alike.
+
+Tags are '<app_label>.<model>' for collections (lists) and
+'<app_label>.<model>:<pk>' for single objects. Model signals invalidate them
+(see the apps' signals modules).
+"""
+import hashlib
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+TAG_PREFIX = 'response-tag:'
+ENTRY_PREFIX = 'response:'
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def collection_tag(model):
+    return model._meta.label_lower
+
+
+def instance_tag(model, pk):
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def tag_versions(tags):
+    """
+    Returns the current version of every tag, creating missing ones.
+    """
+    cache = get_cache()
+    keys = {TAG_PREFIX + tag: tag for tag in tags}
+    versions = cache.get_many(list(keys))
+    for key in keys.keys() - versions.keys():
+        cache.add(key, uuid.uuid4().hex, None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def invalidate_tags(*tags):
+    """
+    Invalidates every cached entry carrying one of the tags.
+    """
+    get_cache().set_many({TAG_PREFIX + tag: uuid.uuid4().hex for tag in tags}, None)
+
+
+def invalidate_instance(model, pk):
+    """
+    Invalidates cached responses containing the instance or its collection.
+    """
+    invalidate_tags(collection_tag(model), instance_tag(model, pk))
+
+
+def get_entry(key):
+    """
+    Returns the cached data for key, or None if missing or invalidated.
+    """
+    entry = get_cache().get(ENTRY_PREFIX + key)
+    if entry is None:
+        return None
+    if tag_versions(entry['tags']) != entry['tags']:
+        return None
+    return entry['data']
+
+
+def set_entry(key, data, versions, timeout=None):
+    """
+    Stores data under key together with the tag versions read before it was computed.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+    get_cache().set(ENTRY_PREFIX + key, {'tags': versions, 'data': data}, timeout)
+
+
+def cacheable_response(response):
+    """
+    Marks a response whose body is shared by many clients, so its compressed
+    body is cached under its ETag (coderr_app.compression).
+    """
+    response.compression_cacheable = True
+    return response
+
+
+def response_cache_key(request, view):
+    """
+    Builds the cache key from the view, the absolute path, the normalized query
+    parameters and the user attributes that can change permissions.
+    """
+    params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+    user = request.user
+    parts = [
+        type(view).__qualname__,
+        getattr(view, 'action', None) or request.method,
+        request.build_absolute_uri(request.path),
+        repr(params),
+        repr((user.is_authenticated, user.is_staff, user.is_superuser)),
+    ]
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """
+    Caches list and retrieve responses of generic views and viewsets.
+    Lists carry the collection tag of the view's model, detail responses the
+    instance tag for the looked-up primary key. Only successful responses are
+    cached; permission checks have already run when list/retrieve is called.
+    Successful responses are marked compression_cacheable (coderr_app.compression).
+    """
+    cache_timeout = None
+
+    def get_cache_model(self):
+        return self.get_queryset().model
+
+    def get_cache_tags(self):
+        model = self.get_cache_model()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return [instance_tag(model, self.kwargs[lookup_url_kwarg])]
+        return [collection_tag(model)]
+
+    def cached_response(self, request, render):
+        key = response_cache_key(request, self)
+        data = get_entry(key)
+        if data is not None:
+            return cacheable_response(Response(data))
+        versions = tag_versions(self.get_cache_tags())
+        response = render()
+        if response.status_code == 200:
+            set_entry(key, response.data, versions, self.cache_timeout)
+            cacheable_response(response)
+        return response
+
+    async def acached_response(self, request, render):
+        """
+        Async variant of cached_response; render is a coroutine function.
+        """
+        key = response_cache_key(request, self)
+        data = await sync_to_async(get_entry)(key)
+        if data is not None:
+            return cacheable_response(Response(data))
+        versions = await sync_to_async(tag_versions)(self.get_cache_tags())
+        response = await render()
+        if response.status_code == 200:
+            await sync_to_async(set_entry)(key, response.data, versions, self.cache_timeout)
+            cacheable_response(response)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs))
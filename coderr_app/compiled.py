@@ -0,0 +1,212 @@
+"""
+Compiled read path for list endpoints.
+
+A serializer class is turned once into a flat plan: for every readable field
+the output name, the values() key of its source ('user.username' becomes
+'user__username') and how to convert the value. List requests then fetch
+values() rows and build the output dicts directly, without model instances
+or per-field get_attribute calls.
+
+Conversion is identity for fields whose to_representation returns database
+values unchanged (integers, strings, primary keys, JSON); other fields call
+the to_representation of a field bound to the request's serializer, so
+formatting (Decimals, datetimes, choices, file URLs) stays exactly the
+serializer's. Nested serializers are flattened through the foreign key.
+Many-related fields and custom serializer to_representation logic must be
+supplied by the view through `compiled_relations`.
+"""
+import copy
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.fields.files import FieldFile
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from coderr_app.metrics import serializer_timer
+
+IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+FieldPlan = namedtuple('FieldPlan', 'name key kind model_field nested')
+
+
+def _source_key(prefix, field):
+    if field.source == '*':
+        raise ImproperlyConfigured(f"Field '{field.field_name}' with source='*' cannot be compiled.")
+    return prefix + '__'.join(field.source_attrs)
+
+
+def build_plan(serializer, prefix=''):
+    """
+    Returns the FieldPlans of a serializer's readable fields.
+    """
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    plan = []
+    for field in serializer._readable_fields:
+        if isinstance(field, serializers.ListSerializer):
+            plan.append(FieldPlan(field.field_name, None, 'relation', None, None))
+        elif isinstance(field, serializers.BaseSerializer):
+            key = _source_key(prefix, field)
+            nested_model = field.Meta.model
+            nested = build_plan(field, key + '__')
+            plan.append(FieldPlan(field.field_name, f'{key}__{nested_model._meta.pk.name}', 'nested', None, nested))
+        elif isinstance(field, serializers.SerializerMethodField):
+            raise ImproperlyConfigured(f"SerializerMethodField '{field.field_name}' cannot be compiled.")
+        elif isinstance(field, serializers.FileField):
+            model_field = model._meta.get_field(field.source_attrs[-1])
+            plan.append(FieldPlan(field.field_name, _source_key(prefix, field), 'file', model_field, None))
+        elif type(field) in IDENTITY_FIELDS or (type(field) is serializers.JSONField and not field.binary):
+            plan.append(FieldPlan(field.field_name, _source_key(prefix, field), 'identity', None, None))
+        else:
+            plan.append(FieldPlan(field.field_name, _source_key(prefix, field), 'field', None, None))
+    return plan
+
+
+def plan_columns(plan):
+    columns = []
+    for entry in plan:
+        if entry.key is not None:
+            columns.append(entry.key)
+        if entry.nested is not None:
+            columns.extend(plan_columns(entry.nested))
+    return columns
+
+
+def _file_converter(field, model_field):
+    def convert(name):
+        return field.to_representation(FieldFile(None, model_field, name))
+    return convert
+
+
+def bind_plan(plan, serializer):
+    """
+    Resolves converters against a serializer instance carrying the request context.
+    Returns (name, key, converter or None, nested) tuples.
+    """
+    bound = []
+    fields = serializer.fields
+    for entry in plan:
+        field = fields[entry.name]
+        if entry.kind == 'nested':
+            bound.append((entry.name, entry.key, None, bind_plan(entry.nested, field)))
+        elif entry.kind == 'file':
+            bound.append((entry.name, entry.key, _file_converter(field, entry.model_field), None))
+        elif entry.kind == 'field':
+            bound.append((entry.name, entry.key, field.to_representation, None))
+        else:
+            bound.append((entry.name, entry.key, None, None))
+    return bound
+
+
+def represent(row, bound):
+    data = {}
+    for name, key, convert, nested in bound:
+        if key is None:
+            data[name] = None
+            continue
+        value = row[key]
+        if nested is not None:
+            data[name] = None if value is None else represent(row, nested)
+        elif value is None or convert is None:
+            data[name] = value
+        else:
+            data[name] = convert(value)
+    return data
+
+
+class CompiledSerializer:
+    """
+    The compiled plan of one serializer class.
+    """
+    _cache = {}
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.plan = build_plan(serializer_class())
+        self.columns = plan_columns(self.plan)
+        self.relations = [entry.name for entry in self.plan if entry.kind == 'relation']
+        self.hidden = []
+
+    @classmethod
+    def for_class(cls, serializer_class):
+        """
+        Plans are built lazily, on the first list request of each serializer
+        class, and kept for the life of the process.
+        """
+        compiled = cls._cache.get(serializer_class)
+        if compiled is None:
+            compiled = cls._cache[serializer_class] = cls(serializer_class)
+        return compiled
+
+    def restrict(self, fields):
+        """
+        Returns a copy limited to the given field names. Relation hooks match
+        the output dicts by primary key, so it stays in them as a hidden field.
+        """
+        restricted = copy.copy(self)
+        pk_name = self.serializer_class.Meta.model._meta.pk.name
+        keep = set(fields)
+        restricted.relations = [name for name in self.relations if name in keep]
+        if restricted.relations and pk_name not in keep:
+            keep.add(pk_name)
+            restricted.hidden = [pk_name]
+        restricted.plan = [entry for entry in self.plan if entry.name in keep]
+        restricted.columns = plan_columns(restricted.plan)
+        return restricted
+
+    def values(self, queryset, extra_columns=()):
+        columns = list(dict.fromkeys([*self.columns, *extra_columns]))
+        return queryset.prefetch_related(None).values(*columns)
+
+    def represent(self, rows, context):
+        bound = bind_plan(self.plan, self.serializer_class(context=context))
+        return [represent(row, bound) for row in rows]
+
+
+class CompiledListMixin:
+    """
+    Serves GET list requests through the compiled plan of the serializer.
+    `compiled_relations` maps each many-related field to a view method that
+    receives the output dicts and fills in that field. Retrieve and write
+    requests keep using the serializer (object permissions need the instance).
+    COMPILED_READ_SERIALIZERS = False switches back to the serializers.
+    """
+    compiled_relations = {}
+
+    def get_compiled_serializer(self):
+        return CompiledSerializer.for_class(self.get_serializer_class())
+
+    def get_compiled_columns(self):
+        """
+        Extra columns the pagination needs, e.g. cursor ordering fields.
+        """
+        model = self.get_queryset().model
+        names = {field.name for field in model._meta.concrete_fields}
+        return [name for name in getattr(self, 'ordering_fields', None) or [] if name in names]
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'COMPILED_READ_SERIALIZERS', True):
+            return super().list(request, *args, **kwargs)
+        compiled = self.get_compiled_serializer()
+        missing = set(compiled.relations) - set(self.compiled_relations)
+        if missing:
+            raise ImproperlyConfigured(f'{type(self).__name__} needs compiled_relations for {sorted(missing)}.')
+
+        rows = compiled.values(self.filter_queryset(self.get_queryset()), self.get_compiled_columns())
+        page = self.paginate_queryset(rows)
+        with serializer_timer():
+            data = compiled.represent(rows if page is None else page, self.get_serializer_context())
+            for name in compiled.relations:
+                getattr(self, self.compiled_relations[name])(data, name)
+            for item in data:
+                for name in compiled.hidden:
+                    del item[name]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
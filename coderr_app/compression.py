@@ -0,0 +1,156 @@
+"""
+Response compression.
+
+CompressionMiddleware compresses JSON responses of at least
+COMPRESSION_MIN_SIZE bytes with brotli, when the optional `brotli` package is
+installed and the client accepts it, or gzip otherwise.
+
+Responses that views mark with `compression_cacheable` (the tag-cached offer,
+review and profile reads and /api/base-info/) are the same for many clients:
+they get a weak ETag from the digest of their body, If-None-Match is answered
+with 304, and their compressed bodies are kept in the response cache under
+that ETag, so repeated hits hash the body instead of compressing it again.
+The schema endpoint keeps its own precompressed bodies (coderr_app.schema).
+"""
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from coderr_app.cache import get_cache
+from coderr_app.middleware import HybridMiddleware
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CACHE_PREFIX = 'compressed:'
+# Levels for bodies compressed once per process, like the schema.
+MAX_LEVELS = {'br': 11, 'gzip': 9}
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def accepted_encodings(header):
+    """
+    Parses an Accept-Encoding header into {coding: q}.
+    """
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(request):
+    """
+    Returns the best encoding the client accepts, or None for identity.
+    Brotli wins ties because it compresses JSON better at the same cost.
+    """
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body, encoding, level=None):
+    """
+    Compresses with the configured level, or the given one (see MAX_LEVELS).
+    """
+    if encoding == 'br':
+        quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5) if level is None else level
+        return brotli.compress(body, quality=quality)
+    level = getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6) if level is None else level
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def body_etag(body):
+    return 'W/"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def compression_cache_key(encoding, etag):
+    level = getattr(settings, 'COMPRESSION_BROTLI_QUALITY' if encoding == 'br' else 'COMPRESSION_GZIP_LEVEL', '')
+    return f'{CACHE_PREFIX}{encoding}:{level}:{etag}'
+
+
+def cached_compress(body, encoding, etag):
+    """
+    Returns the compressed body stored under the ETag, compressing on a miss.
+    """
+    cache = get_cache()
+    key = compression_cache_key(encoding, etag)
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(body, encoding)
+        cache.set(key, compressed, getattr(settings, 'COMPRESSION_CACHE_TIMEOUT', 300))
+    return compressed
+
+
+def is_json(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type == 'application/json' or content_type.endswith('+json')
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get('If-None-Match', '')
+    return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+
+class CompressionMiddleware(HybridMiddleware):
+    """
+    Compresses JSON responses; see the module docstring.
+    """
+    def process_response(self, request, response):
+        if (
+            response.status_code != 200
+            or response.streaming
+            or response.has_header('Content-Encoding')
+            or not is_json(response)
+        ):
+            return response
+
+        body = response.content
+        etag = None
+        if getattr(response, 'compression_cacheable', False) and request.method in ('GET', 'HEAD'):
+            etag = body_etag(body)
+            response['ETag'] = etag
+            if etag_matches(request, etag):
+                not_modified = HttpResponseNotModified()
+                not_modified['ETag'] = etag
+                patch_vary_headers(not_modified, ('Accept-Encoding',))
+                return not_modified
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(body) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = cached_compress(body, encoding, etag) if etag else compress(body, encoding)
+        if len(compressed) >= len(body):
+            return response
+        response.content = compressed
+        response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(compressed))
+        return response
@@ -0,0 +1,87 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+ReplicaRoutingMiddleware marks safe-method requests as replica-eligible for
+the duration of the request unless the client wrote after the start of the
+last replica sync. ReplicaRouter then sends reads of DATABASE_REPLICA_MODELS
+to one of DATABASE_REPLICAS; everything else, all writes and reads inside a
+transaction use 'default'. Without configured replicas every query goes to
+'default'.
+
+Write times and sync times live in DATABASE_REPLICA_CACHE_ALIAS, which must
+be shared between the web workers and `sync_replica` (not locmem) for the
+pins to be lifted before DATABASE_REPLICA_PIN_SECONDS expire.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SYNC_KEY_PREFIX = 'replica-synced:'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """
+    Allows (or forbids) replica reads for the code inside the block.
+    """
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, 'DATABASE_REPLICAS', []) if alias != DEFAULT_DB_ALIAS]
+
+
+def replica_cache():
+    return caches[getattr(settings, 'DATABASE_REPLICA_CACHE_ALIAS', 'default')]
+
+
+def record_sync(alias, started):
+    """
+    Stores the time (time.time()) at which the last complete copy into the replica started.
+    """
+    replica_cache().set(SYNC_KEY_PREFIX + alias, started, None)
+
+
+def replicas_synced_at():
+    """
+    Start of the oldest last sync over all replicas, or None if one was never recorded.
+    """
+    aliases = replica_aliases()
+    synced = replica_cache().get_many([SYNC_KEY_PREFIX + alias for alias in aliases])
+    if not aliases or len(synced) < len(aliases):
+        return None
+    return min(synced.values())
+
+
+class ReplicaRouter:
+    """
+    Routes replica-eligible reads to a random configured replica.
+    """
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get():
+            return DEFAULT_DB_ALIAS
+        if model._meta.label_lower not in getattr(settings, 'DATABASE_REPLICA_MODELS', []):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        aliases = replica_aliases()
+        return random.choice(aliases) if aliases else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,164 @@
+"""
+Idempotency-Key handling for POST requests that create objects.
+
+Clients send the same Idempotency-Key header with every retry of a POST.
+The first request inserts an IdempotencyKey row, committed at once so that
+concurrent duplicates see it, runs the view and stores the response data in
+the same transaction as the created objects. Retries with the same key and
+request fingerprint get the stored response back without running the
+serializers (marked with Idempotent-Replayed: true); duplicates arriving while
+the first request runs wait for it. A key reused with different data is
+rejected with 422. Keys belong to the user and expire after
+IDEMPOTENCY_KEY_TTL seconds; `python manage.py purge_idempotency_keys`
+deletes expired rows.
+"""
+import datetime
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from coderr_app.models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+IDEMPOTENCY_PARAMETER = OpenApiParameter(
+    HEADER, str, OpenApiParameter.HEADER,
+    description='Unique key per logical request; retries with the same key return the first response.',
+)
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'Der Idempotency-Key wurde bereits für eine andere Anfrage verwendet.'
+    default_code = 'idempotency_key_reused'
+
+
+class IdempotencyKeyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Eine Anfrage mit diesem Idempotency-Key wird noch verarbeitet.'
+    default_code = 'idempotency_key_in_progress'
+
+
+def _describe(value):
+    if isinstance(value, UploadedFile):
+        return [value.name, value.size]
+    return str(value)
+
+
+def request_fingerprint(request):
+    """
+    sha256 of the method, path and parsed body; uploads count by name and size.
+    """
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = sorted(data.lists())
+    payload = json.dumps([request.method, request.path, data], sort_keys=True, default=_describe)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _lease():
+    return timezone.now() + datetime.timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', 60))
+
+
+def acquire(user, key, fingerprint):
+    """
+    Returns (row, owned). owned is True when the caller inserted the row or
+    took over the key of a request whose lock expired, and must run the view.
+    """
+    for _ in range(3):
+        now = timezone.now()
+        row = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if row is None:
+            try:
+                with transaction.atomic():
+                    row = IdempotencyKey.objects.create(
+                        user=user, key=key, fingerprint=fingerprint, locked_until=_lease(),
+                        expires_at=now + datetime.timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)),
+                    )
+                return row, True
+            except IntegrityError:
+                # A concurrent request inserted the key first.
+                continue
+        if row.expires_at <= now:
+            IdempotencyKey.objects.filter(pk=row.pk, expires_at__lte=now).delete()
+            continue
+        if row.status_code is None and row.fingerprint == fingerprint and row.locked_until <= now:
+            lease = _lease()
+            taken = IdempotencyKey.objects.filter(
+                pk=row.pk, status_code__isnull=True, locked_until=row.locked_until
+            ).update(locked_until=lease)
+            if taken:
+                row.locked_until = lease
+                return row, True
+        return row, False
+    raise IdempotencyKeyInProgress()
+
+
+def replay(row):
+    response = Response(row.response_data, status=row.status_code)
+    response[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def execute(row, run):
+    """
+    Runs the view; a successful response is stored in the same transaction,
+    any other outcome releases the key so that the client can retry.
+    """
+    try:
+        with transaction.atomic():
+            response = run()
+            if status.is_success(response.status_code):
+                IdempotencyKey.objects.filter(pk=row.pk).update(
+                    status_code=response.status_code, response_data=response.data, locked_until=None
+                )
+                return response
+    except BaseException:
+        IdempotencyKey.objects.filter(pk=row.pk).delete()
+        raise
+    IdempotencyKey.objects.filter(pk=row.pk).delete()
+    return response
+
+
+def idempotent_response(request, key, run):
+    """
+    Returns the stored response for the key, or the response of run().
+    """
+    if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+        raise ValidationError({HEADER: 'Der Idempotency-Key darf höchstens 255 Zeichen lang sein.'})
+    fingerprint = request_fingerprint(request)
+    deadline = time.monotonic() + getattr(settings, 'IDEMPOTENCY_WAIT_TIMEOUT', 10)
+    delay = 0.05
+    while True:
+        row, owned = acquire(request.user, key, fingerprint)
+        if row.fingerprint != fingerprint:
+            raise IdempotencyKeyReused()
+        if row.status_code is not None:
+            return replay(row)
+        if owned:
+            return execute(row, run)
+        if time.monotonic() >= deadline:
+            raise IdempotencyKeyInProgress()
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+class IdempotentCreateMixin:
+    """
+    Makes create() idempotent for requests with an Idempotency-Key header.
+    """
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        return idempotent_response(request, key, lambda: super(IdempotentCreateMixin, self).create(request, *args, **kwargs))
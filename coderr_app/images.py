@@ -0,0 +1,209 @@
+"""
+Image handling for uploaded offer and profile images.
+
+Uploads are normalized while the request is validated: decompression bombs
+are rejected from the header, the image is downsized, EXIF is stripped and it
+is re-encoded. This runs on a bounded pool so the number of images decoded at
+once, and with it the memory used, has a fixed ceiling.
+
+After an upload is committed, a background task (tasks_app) renders downsized
+WebP/JPEG variants and stores their paths in a JSON field next to the image
+field. Serializers expose them through ImageVariantsField.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+from coderr_app.cache import invalidate_instance
+from tasks_app.queue import enqueue, task
+
+SAVE_OPTIONS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+_normalize_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_normalize_executor():
+    """
+    Returns the upload normalization pool, sized by IMAGE_NORMALIZE_WORKERS.
+    Peak decode memory is bounded by workers * IMAGE_UPLOAD_MAX_PIXELS * 4 bytes.
+    """
+    global _normalize_executor
+    if _normalize_executor is None:
+        with _executor_lock:
+            if _normalize_executor is None:
+                _normalize_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'IMAGE_NORMALIZE_WORKERS', 2),
+                    thread_name_prefix='image-normalize'
+                )
+    return _normalize_executor
+
+
+def normalize_image(file, max_side=None, max_pixels=None, max_bytes=None):
+    """
+    Downsizes an uploaded image to max_side, applies and drops EXIF data and
+    re-encodes it (JPEG, or PNG when the image has transparency).
+    Size and pixel limits are checked before any pixel data is decoded.
+    Returns a ContentFile named after the upload.
+    """
+    max_side = max_side or getattr(settings, 'IMAGE_UPLOAD_MAX_SIDE', 2048)
+    max_pixels = max_pixels or getattr(settings, 'IMAGE_UPLOAD_MAX_PIXELS', 40_000_000)
+    max_bytes = max_bytes or getattr(settings, 'IMAGE_UPLOAD_MAX_BYTES', 10 * 1024 * 1024)
+
+    if file.size is not None and file.size > max_bytes:
+        raise ValidationError('Die Bilddatei ist zu groß.')
+    file.seek(0)
+    try:
+        image = Image.open(file)
+    except Image.DecompressionBombError:
+        raise ValidationError('Das Bild hat zu viele Pixel.')
+    try:
+        with image:
+            if image.width * image.height > max_pixels:
+                raise ValidationError('Das Bild hat zu viele Pixel.')
+            # Let the JPEG decoder scale down while decoding instead of decoding at full size.
+            image.draft('RGB', (max_side, max_side))
+            image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            ImageOps.exif_transpose(image, in_place=True)
+
+            has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+            buffer = BytesIO()
+            if has_alpha:
+                image.save(buffer, format='PNG', optimize=True)
+                extension = 'png'
+            else:
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+                image.save(buffer, **SAVE_OPTIONS['jpeg'])
+                extension = 'jpg'
+    except Image.DecompressionBombError:
+        raise ValidationError('Das Bild hat zu viele Pixel.')
+    except (OSError, SyntaxError, ValueError):
+        # Truncated or corrupt pixel data only shows up while decoding.
+        raise ValidationError('Die Bilddatei ist beschädigt oder unvollständig.')
+
+    stem = PurePosixPath(file.name or 'upload').stem
+    return ContentFile(buffer.getvalue(), name=f'{stem}.{extension}')
+
+
+def variants_outdated(instance, image_field, variants_field):
+    """
+    Returns True if the stored variants were not rendered from the current image.
+    """
+    image = getattr(instance, image_field)
+    variants = getattr(instance, variants_field) or {}
+    return (image.name or None) != variants.get('source')
+
+
+def schedule_variants(instance, image_field, variants_field):
+    """
+    Queues variant rendering for the instance once the current transaction commits.
+    """
+    enqueue(update_variants, args=(instance._meta.label, instance.pk, image_field, variants_field), queue='images')
+
+
+@task(queue='images')
+def update_variants(label, pk, image_field, variants_field):
+    """
+    Renders the variants of one instance and stores their paths.
+    The update is skipped if the image was replaced in the meantime.
+    """
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).only(image_field, variants_field).first()
+    if instance is None or not variants_outdated(instance, image_field, variants_field):
+        return
+    name = getattr(instance, image_field).name
+    queryset = model.objects.filter(pk=pk)
+    if name:
+        variants = render_variants(name)
+        queryset = queryset.filter(**{image_field: name})
+    else:
+        variants = {}
+    updated = queryset.update(**{variants_field: variants})
+    if updated:
+        invalidate_instance(model, pk)
+    old_variants = getattr(instance, variants_field) or {}
+    stale = old_variants if updated else variants
+    delete_variant_files(stale)
+
+
+def render_variants(name, storage=default_storage):
+    """
+    Renders every configured size/format variant of the stored image `name`.
+    Returns {'source': name, <size>: {<format>: <path>}}.
+    """
+    sizes = getattr(settings, 'IMAGE_VARIANT_SIZES', {'thumbnail': 300})
+    formats = getattr(settings, 'IMAGE_VARIANT_FORMATS', ['webp', 'jpeg'])
+    source = PurePosixPath(name)
+    target_dir = source.parent / 'variants'
+    variants = {'source': name}
+
+    with storage.open(name, 'rb') as fh, Image.open(fh) as image:
+        # Let the JPEG decoder scale down while decoding instead of decoding at full size.
+        image.draft('RGB', (max(sizes.values()), max(sizes.values())))
+        image = ImageOps.exif_transpose(image)
+        for size_name, size in sizes.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+            variants[size_name] = {}
+            for fmt in formats:
+                output = resized if fmt == 'webp' or resized.mode == 'RGB' else resized.convert('RGB')
+                buffer = BytesIO()
+                output.save(buffer, **SAVE_OPTIONS[fmt])
+                path = str(target_dir / f'{source.stem}_{size_name}.{fmt}')
+                variants[size_name][fmt] = storage.save(path, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def delete_variant_files(variants, storage=default_storage):
+    """
+    Removes the files of a variants mapping from storage.
+    """
+    for key, formats in variants.items():
+        if key == 'source':
+            continue
+        for path in formats.values():
+            storage.delete(path)
+
+
+class NormalizedImageField(serializers.ImageField):
+    """
+    ImageField that stores the normalized image (see normalize_image) instead
+    of the raw upload. Normalization runs on the bounded normalization pool.
+    """
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        try:
+            return get_normalize_executor().submit(normalize_image, file).result()
+        except ValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Read-only field rendering stored variants as absolute URLs:
+    {'thumbnail': {'webp': url, 'jpeg': url}, ...}
+    """
+    def to_representation(self, value):
+        request = self.context.get('request')
+        representation = {}
+        for size_name, formats in (value or {}).items():
+            if size_name == 'source':
+                continue
+            representation[size_name] = {}
+            for fmt, path in formats.items():
+                url = default_storage.url(path)
+                representation[size_name][fmt] = request.build_absolute_uri(url) if request else url
+        return representation
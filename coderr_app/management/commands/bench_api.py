@@ -0,0 +1,247 @@
+import http.client
+import json
+import platform
+import subprocess
+import threading
+import time
+from importlib import import_module
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, reverse
+from rest_framework.authtoken.models import Token
+
+from coderr_app.metrics import registry
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order, Review
+
+User = get_user_model()
+
+API_URLCONFS = ['user_auth_app.api.urls', 'offers_app.api.urls', 'orders_app.api.urls']
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def iter_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def supports_get(pattern):
+    callback = pattern.callback
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return 'get' in actions
+    view_class = getattr(callback, 'cls', getattr(callback, 'view_class', None))
+    if view_class is None:
+        return True
+    return hasattr(view_class, 'get') and 'get' in view_class.http_method_names
+
+
+class Command(BaseCommand):
+    """
+    Drives every GET endpoint of the */api/urls.py modules through a threaded
+    WSGI server and reports latency percentiles, throughput and queries per
+    request as JSON. Run it against data from `generate_data`.
+
+    Example:
+        python manage.py generate_data --business 1000 --customers 10000 --orders 100000
+        python manage.py bench_api --requests 500 --concurrency 8 --output bench.json
+    """
+    help = 'Benchmarks all GET API endpoints end to end and prints JSON results.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Client threads.')
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help='Only these URL names (repeatable).')
+        parser.add_argument('--cold-cache', action='store_true', help='Clear the cache before every request.')
+        parser.add_argument('--throttle', action='store_true', help='Keep throttling enabled.')
+        parser.add_argument('--accept-encoding', default='identity', help='Accept-Encoding header, e.g. gzip.')
+        parser.add_argument('--output', help='Also write the JSON results to this file.')
+
+    def handle(self, *args, **options):
+        context = self.sample_context()
+        token = Token.objects.get_or_create(user_id=context['business_id'])[0].key
+        targets = self.targets(context, options['endpoints'])
+
+        server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler)
+        server.set_app(get_internal_wsgi_application())
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        host, port = server.server_address[:2]
+
+        results = {}
+        try:
+            with override_settings(THROTTLE_ENABLED=options['throttle']):
+                for name, url in targets:
+                    results[name] = self.run_endpoint(host, port, name, url, token, options)
+                    self.stderr.write(
+                        f'{name:<32} p50 {results[name]["latency_ms"]["p50"]:>8.2f}ms '
+                        f'{results[name]["throughput_rps"]:>8.1f} req/s'
+                    )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        report = {
+            'meta': self.meta(options),
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+        self.stdout.write(output)
+
+    def sample_context(self):
+        """
+        Picks a business user with orders, whose token is used for all requests,
+        and existing rows to fill the URL parameters.
+        """
+        order = Order.objects.filter(business_user__isnull=False).order_by('pk').first()
+        if order is None:
+            raise CommandError('No data to benchmark. Run `python manage.py generate_data` first.')
+        business = order.business_user
+        return {
+            'business_id': business,
+            'offer_id': Offer.objects.filter(user_id=business).values_list('pk', flat=True).first(),
+            'offer_detail_id': OfferDetail.objects.values_list('pk', flat=True).first(),
+            'order_id': order.pk,
+            'review_id': Review.objects.values_list('pk', flat=True).first(),
+        }
+
+    def targets(self, context, only):
+        kwargs_by_name = {
+            'offers-detail': {'pk': context['offer_id']},
+            'offerdetails-detail': {'pk': context['offer_detail_id']},
+            'orders-detail': {'pk': context['order_id']},
+            'reviews-detail': {'pk': context['review_id']},
+            'userprofile-detail': {'pk': context['business_id']},
+            'order-count': {'business_user_id': context['business_id']},
+            'completed-order-count': {'business_user_id': context['business_id']},
+        }
+        targets = []
+        for urlconf in API_URLCONFS:
+            for pattern in iter_patterns(import_module(urlconf).urlpatterns):
+                name = pattern.name
+                if not name or name == 'api-root' or 'format' in pattern.pattern.regex.groupindex:
+                    continue
+                if only and name not in only:
+                    continue
+                if not supports_get(pattern):
+                    continue
+                kwargs = kwargs_by_name.get(name)
+                if pattern.pattern.regex.groups and kwargs is None:
+                    self.stderr.write(f'Skipping {name}: no sample parameters.')
+                    continue
+                targets.append((name, reverse(name, kwargs=kwargs)))
+        return targets
+
+    def run_endpoint(self, host, port, name, url, token, options):
+        headers = {
+            'Authorization': f'Token {token}',
+            'Host': f'{host}:{port}',
+            'Accept-Encoding': options['accept_encoding'],
+        }
+        lock = threading.Lock()
+        latencies = []
+        statuses = {}
+        response_bytes = [0]
+        remaining = [options['requests']]
+
+        def worker():
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                if options['cold_cache']:
+                    cache.clear()
+                connection = http.client.HTTPConnection(host, port, timeout=60)
+                started = time.perf_counter()
+                connection.request('GET', url, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+                elapsed = time.perf_counter() - started
+                connection.close()
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[response.status] = statuses.get(response.status, 0) + 1
+                    response_bytes[0] += len(body)
+
+        # Warm up sequentially so the measured window starts with warm caches.
+        for _ in range(options['warmup']):
+            connection = http.client.HTTPConnection(host, port, timeout=60)
+            connection.request('GET', url, headers=headers)
+            connection.getresponse().read()
+            connection.close()
+
+        registry.clear()
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        stats = registry.endpoints.get(name)
+        requests = len(latencies)
+        return {
+            'url': url,
+            'requests': requests,
+            'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+            'throughput_rps': round(requests / wall, 2) if wall else None,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 0.50) * 1000, 3),
+                'p95': round(percentile(latencies, 0.95) * 1000, 3),
+                'p99': round(percentile(latencies, 0.99) * 1000, 3),
+                'mean': round(sum(latencies) / requests * 1000, 3),
+            },
+            'queries_per_request': round(stats.queries / requests, 2) if stats and requests else None,
+            'response_bytes': response_bytes[0] // requests if requests else 0,
+        }
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': settings.DATABASES['default']['ENGINE'],
+            'concurrency': options['concurrency'],
+            'cold_cache': options['cold_cache'],
+            'accept_encoding': options['accept_encoding'],
+            'rows': {
+                'users': User.objects.count(),
+                'offers': Offer.objects.count(),
+                'offer_details': OfferDetail.objects.count(),
+                'orders': Order.objects.count(),
+                'reviews': Review.objects.count(),
+            },
+        }
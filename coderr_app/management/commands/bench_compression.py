@@ -0,0 +1,75 @@
+import timeit
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+
+from coderr_app.compression import available_encodings, body_etag, cached_compress, compress
+from coderr_app.management.commands.bench_api import Command as BenchApiCommand
+from coderr_app.schema import get_schema
+
+LEVELS = {'gzip': [1, 6, 9], 'br': [1, 5, 11]}
+
+
+class Command(BaseCommand):
+    """
+    Fetches every GET endpoint once (like bench_api) plus the schema and
+    reports, per endpoint and compression level, the bytes saved and the CPU
+    time of compressing the body, next to the cost of a cached hit (hashing
+    the body for its ETag and reading the compressed body from the cache).
+    Run it against data from `generate_data`.
+
+    Example:
+        python manage.py bench_compression --endpoint offers-list --endpoint base-info
+    """
+    help = 'Compares CPU cost and bytes saved of response compression per endpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help='Only these URL names (repeatable).')
+        parser.add_argument('--seconds', type=float, default=0.2, help='Approximate time per measurement.')
+
+    def handle(self, *args, **options):
+        bench_api = BenchApiCommand(stdout=self.stdout, stderr=self.stderr)
+        context = bench_api.sample_context()
+        token = Token.objects.get_or_create(user_id=context['business_id'])[0].key
+        client = Client(HTTP_HOST='127.0.0.1', HTTP_AUTHORIZATION=f'Token {token}')
+
+        bodies = []
+        with override_settings(THROTTLE_ENABLED=False):
+            for name, url in bench_api.targets(context, options['endpoints']):
+                response = client.get(url, HTTP_ACCEPT_ENCODING='identity')
+                if response.status_code == 200:
+                    bodies.append((name, response.content))
+                else:
+                    self.stderr.write(f'Skipping {name}: status {response.status_code}.')
+        if not options['endpoints'] or 'schema' in options['endpoints']:
+            bodies.append(('schema (json)', get_schema().json.body))
+
+        self.stdout.write(
+            f'{"endpoint":<28} {"bytes":>9} {"encoding":<9} {"level":>5} {"bytes out":>10} {"saved":>7} '
+            f'{"µs/compress":>12} {"µs/cached":>10}'
+        )
+        for name, body in bodies:
+            cache.clear()
+            etag = body_etag(body)
+            for encoding in available_encodings():
+                cached_compress(body, encoding, etag)
+                hit = self.measure(lambda: cached_compress(body, encoding, body_etag(body)), options['seconds'])
+                for level in LEVELS[encoding]:
+                    compressed = compress(body, encoding, level)
+                    cost = self.measure(lambda: compress(body, encoding, level), options['seconds'])
+                    saved = 1 - len(compressed) / len(body) if body else 0
+                    self.stdout.write(
+                        f'{name:<28} {len(body):>9} {encoding:<9} {level:>5} {len(compressed):>10} '
+                        f'{saved:>7.1%} {cost * 1e6:>12.1f} {hit * 1e6:>10.1f}'
+                    )
+        if 'br' not in available_encodings():
+            self.stdout.write('brotli is not installed; only gzip is measured.')
+
+    def measure(self, func, seconds):
+        timer = timeit.Timer(func)
+        number, elapsed = timer.autorange()
+        number = max(1, int(number * seconds / max(elapsed, 1e-9)))
+        return min(timer.repeat(repeat=3, number=number)) / number
@@ -0,0 +1,104 @@
+import datetime
+import timeit
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from coderr_app.renderers import FastJSONRenderer, orjson
+
+
+def offer_page(size):
+    """
+    A paginated /api/offers/ response as produced by OfferSerializer.
+    """
+    return {
+        'count': size * 10,
+        'next': 'http://127.0.0.1:8000/api/offers/?page=2',
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'user': i % 50 + 1,
+                'title': f'Professionelles Webdesign {i}',
+                'image': None,
+                'image_variants': {},
+                'description': 'Webdesign für kleine und mittlere Unternehmen. ' * 3,
+                'created_at': '2025-01-02T03:04:05.123456Z',
+                'updated_at': '2025-01-02T03:04:05.123456Z',
+                'details': [
+                    {'id': i * 3 + n, 'url': f'http://127.0.0.1:8000/api/offerdetails/{i * 3 + n}/'}
+                    for n in range(3)
+                ],
+                'min_price': Decimal('150.00'),
+                'min_delivery_time': 2,
+                'user_details': {'first_name': 'Anna', 'last_name': 'Müller', 'username': f'business_{i}'},
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def order_page(size):
+    """
+    An /api/orders/ response as produced by OrderSerializer.
+    """
+    return [
+        {
+            'id': i,
+            'customer_user': i % 200 + 1,
+            'business_user': i % 50 + 1,
+            'title': f'Logo Design {i} premium',
+            'revisions': 3,
+            'delivery_time_in_days': 5,
+            'price': Decimal('299.90'),
+            'features': ['Logo', 'Visitenkarte', 'Briefpapier'],
+            'offer_type': 'premium',
+            'status': 'in_progress',
+            'created_at': datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            'updated_at': '2025-01-02T03:04:05.123456Z',
+        }
+        for i in range(size)
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Compares DRF's JSONRenderer with FastJSONRenderer (stdlib and orjson) on
+    pages of offers and orders.
+
+    Example:
+        python manage.py bench_renderers --size 6 --size 100 --size 1000
+    """
+    help = 'Micro-benchmarks JSON renderers on offer and order pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, action='append', dest='sizes', help='Objects per page (repeatable).')
+        parser.add_argument('--seconds', type=float, default=1.0, help='Approximate time per measurement.')
+
+    def handle(self, *args, **options):
+        stdlib = FastJSONRenderer()
+        stdlib.use_orjson = False
+        renderers = [('JSONRenderer', JSONRenderer()), ('Fast (stdlib)', stdlib)]
+        if orjson is not None:
+            renderers.append(('Fast (orjson)', FastJSONRenderer()))
+        else:
+            self.stdout.write('orjson is not installed; only the stdlib fallback is measured.')
+
+        self.stdout.write(f'{"page":<14} {"renderer":<14} {"µs/page":>10} {"pages/s":>10} {"speedup":>8}')
+        for size in options['sizes'] or [6, 100, 1000]:
+            for label, page in ((f'offers x{size}', offer_page(size)), (f'orders x{size}', order_page(size))):
+                baseline = None
+                expected = JSONRenderer().render(page)
+                for name, renderer in renderers:
+                    if renderer.render(page) != expected:
+                        self.stderr.write(f'{name} output differs from JSONRenderer for {label}.')
+                    timer = timeit.Timer(lambda: renderer.render(page))
+                    number, elapsed = timer.autorange()
+                    number = max(1, int(number * options['seconds'] / max(elapsed, 1e-9)))
+                    per_page = min(timer.repeat(repeat=3, number=number)) / number
+                    baseline = baseline or per_page
+                    self.stdout.write(
+                        f'{label:<14} {name:<14} {per_page * 1e6:>10.1f} {1 / per_page:>10.0f} '
+                        f'{baseline / per_page:>7.1f}x'
+                    )
@@ -0,0 +1,48 @@
+import difflib
+
+import yaml
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from coderr_app.schema import generate_schema, render_yaml
+
+
+class Command(BaseCommand):
+    """
+    Fails when the committed schema.yaml differs from the schema generated
+    from the code. Documents are compared after parsing, so formatting alone
+    does not count as drift.
+
+    Example:
+        python manage.py check_schema          # in CI
+        python manage.py check_schema --write  # after changing the API
+    """
+    help = 'Checks the committed OpenAPI schema against the code.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--write', action='store_true', help='Regenerate the schema file instead of checking it.')
+        parser.add_argument('--file', default=None, help='Schema file (default: SCHEMA_FILE).')
+
+    def handle(self, *args, **options):
+        path = options['file'] or settings.SCHEMA_FILE
+        expected = render_yaml(generate_schema()).decode()
+
+        if options['write']:
+            with open(path, 'w', encoding='utf-8') as schema_file:
+                schema_file.write(expected)
+            self.stdout.write(f'Wrote {path}.')
+            return
+
+        try:
+            with open(path, encoding='utf-8') as schema_file:
+                committed = schema_file.read()
+        except FileNotFoundError:
+            raise CommandError(f'{path} does not exist. Run check_schema --write.')
+
+        if yaml.safe_load(committed) != yaml.safe_load(expected):
+            diff = difflib.unified_diff(
+                committed.splitlines(), expected.splitlines(), 'committed', 'generated', lineterm='', n=2
+            )
+            self.stderr.write('\n'.join(list(diff)[:200]))
+            raise CommandError(f'{path} is out of date. Run check_schema --write and commit the result.')
+        self.stdout.write('Schema is up to date.')
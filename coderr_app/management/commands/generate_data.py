@@ -0,0 +1,209 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from coderr_app.cache import collection_tag, invalidate_tags
+from offers_app.models import Offer, OfferDetail
+from offers_app.popularity import reconcile
+from orders_app.models import Order, Review
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+CITIES = ['Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt', 'Stuttgart', 'Leipzig', 'Dresden', 'Wien', 'Zürich']
+SERVICES = ['Webdesign', 'Logo Design', 'SEO Audit', 'App Entwicklung', 'Copywriting', 'Video Schnitt',
+            'Übersetzung', 'Social Media', 'Datenanalyse', 'Fotografie']
+ADJECTIVES = ['Professionelles', 'Schnelles', 'Individuelles', 'Modernes', 'Günstiges', 'Kreatives']
+FEATURES = ['Responsive', 'Quellcode', 'Logo', 'Visitenkarte', 'Briefpapier', 'SEO', 'Support', 'Hosting']
+TIERS = [
+    ('basic', 1, 1, 2),
+    ('standard', 2, 3, 5),
+    ('premium', 4, -1, 8),
+]
+STATUSES = ['in_progress'] * 5 + ['completed'] * 4 + ['cancelled']
+
+
+class Command(BaseCommand):
+    """
+    Generates synthetic business and customer users with profiles, offers with
+    three details each, orders and reviews using batched bulk_create.
+    Scales to millions of rows; all users share the password --password.
+
+    Example:
+        python manage.py generate_data --business 2000 --customers 20000 --offers-per-business 5 --orders 200000
+    """
+    help = 'Generates realistic volumes of synthetic data for local benchmarking.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business', type=int, default=100, help='Business users to create.')
+        parser.add_argument('--customers', type=int, default=1000, help='Customer users to create.')
+        parser.add_argument('--offers-per-business', type=int, default=5, help='Offers per business user.')
+        parser.add_argument('--orders', type=int, default=10000, help='Orders to create.')
+        parser.add_argument('--reviews', type=int, default=2000, help='Reviews to create (unique per pair).')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create.')
+        parser.add_argument('--prefix', default='synthetic', help='Username prefix of generated users.')
+        parser.add_argument('--password', default='synthetic123', help='Password of all generated users.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data.')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+        password = make_password(options['password'])
+
+        business_ids = self.create_users('business', options['business'], password, options)
+        customer_ids = self.create_users('customer', options['customers'], password, options)
+        details = self.create_offers(business_ids, options['offers_per_business'])
+        orders = self.create_orders(details, customer_ids, options['orders'])
+        reviews = self.create_reviews(business_ids, customer_ids, options['reviews'])
+
+        # bulk_create does not send post_save: count the orders and drop cached responses explicitly.
+        reconcile()
+        invalidate_tags(*(collection_tag(model) for model in (Offer, OfferDetail, Order, Review, UserProfile)))
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(business_ids)} business and {len(customer_ids)} customer users, '
+            f'{len(details) // len(TIERS)} offers, {len(details)} offer details, {orders} orders '
+            f'and {reviews} reviews in {time.perf_counter() - started:.1f}s.'
+        ))
+
+    def batches(self, iterable):
+        batch = []
+        for item in iterable:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def create_users(self, profile_type, count, password, options):
+        prefix = f'{options["prefix"]}_{profile_type}_'
+        start = User.objects.filter(username__startswith=prefix).count()
+        users = (
+            User(
+                username=f'{prefix}{start + i}',
+                email=f'{prefix}{start + i}@example.com',
+                first_name=self.random.choice(['Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta', 'Jonas']),
+                last_name=self.random.choice(['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Wagner']),
+                password=password,
+            )
+            for i in range(count)
+        )
+        ids = []
+        for batch in self.batches(users):
+            with transaction.atomic():
+                created = User.objects.bulk_create(batch)
+                UserProfile.objects.bulk_create([
+                    UserProfile(
+                        user_id=user.pk,
+                        type=profile_type,
+                        location=self.random.choice(CITIES),
+                        tel=f'0{self.random.randint(100000000, 999999999)}',
+                        description=f'{profile_type.capitalize()} aus {self.random.choice(CITIES)}',
+                        working_hours='9-17' if profile_type == 'business' else '',
+                    )
+                    for user in created
+                ])
+            ids.extend(user.pk for user in created)
+        return ids
+
+    def create_offers(self, business_ids, per_business):
+        """
+        Creates the offers and their basic/standard/premium details.
+        Returns (business_user_id, detail values) pairs as order templates.
+        """
+        offers = (
+            (user_id, self.random.choice(SERVICES), self.random.randint(20, 500))
+            for user_id in business_ids
+            for _ in range(per_business)
+        )
+        details = []
+        for batch in self.batches(offers):
+            with transaction.atomic():
+                created = Offer.objects.bulk_create([
+                    Offer(
+                        user_id=user_id,
+                        title=f'{self.random.choice(ADJECTIVES)} {service}',
+                        description=f'{service} für kleine und mittlere Unternehmen. ' * 3,
+                        min_price=Decimal(base_price),
+                        min_delivery_time=TIERS[0][3],
+                    )
+                    for user_id, service, base_price in batch
+                ])
+                offer_details = OfferDetail.objects.bulk_create([
+                    OfferDetail(
+                        offer_id=offer.pk,
+                        title=f'{offer.title} {offer_type}',
+                        revisions=revisions,
+                        delivery_time_in_days=delivery,
+                        price=offer.min_price * factor,
+                        features=self.random.sample(FEATURES, 3),
+                        offer_type=offer_type,
+                    )
+                    for offer in created
+                    for offer_type, factor, revisions, delivery in TIERS
+                ])
+            business_by_offer = {offer.pk: offer.user_id for offer in created}
+            details.extend(
+                (business_by_offer[detail.offer_id], {
+                    'offer_detail_id_id': detail.pk,
+                    'title': detail.title,
+                    'revisions': detail.revisions,
+                    'delivery_time_in_days': detail.delivery_time_in_days,
+                    'price': detail.price,
+                    'features': detail.features,
+                    'offer_type': detail.offer_type,
+                })
+                for detail in offer_details
+            )
+        return details
+
+    def create_orders(self, details, customer_ids, count):
+        if not details or not customer_ids:
+            return 0
+        orders = (self.random.choice(details) for _ in range(count))
+        created = 0
+        for batch in self.batches(orders):
+            Order.objects.bulk_create([
+                Order(
+                    customer_user_id=self.random.choice(customer_ids),
+                    business_user=business_user_id,
+                    status=self.random.choice(STATUSES),
+                    **values
+                )
+                for business_user_id, values in batch
+            ])
+            created += len(batch)
+        return created
+
+    def create_reviews(self, business_ids, customer_ids, count):
+        count = min(count, len(business_ids) * len(customer_ids))
+        if not count:
+            return 0
+        # The users were created by this run, so they have no reviews yet.
+        def pairs():
+            seen = set()
+            while len(seen) < count:
+                pair = (self.random.choice(business_ids), self.random.choice(customer_ids))
+                if pair not in seen:
+                    seen.add(pair)
+                    yield pair
+
+        created = 0
+        for batch in self.batches(pairs()):
+            Review.objects.bulk_create([
+                Review(
+                    business_user_id=business_user_id,
+                    reviewer_id=reviewer_id,
+                    rating=Decimal(self.random.choice(['3.0', '3.5', '4.0', '4.5', '5.0'])),
+                    description=self.random.choice(['Sehr gut', 'Schnelle Lieferung', 'Gerne wieder', 'Top']),
+                )
+                for business_user_id, reviewer_id in batch
+            ])
+            created += len(batch)
+        return created
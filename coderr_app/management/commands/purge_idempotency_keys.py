@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from coderr_app.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    """
+    Deletes expired Idempotency-Key rows in batches. Run it periodically,
+    e.g. hourly from cron; expired keys are already ignored by the API.
+
+    Example:
+        python manage.py purge_idempotency_keys --batch-size 5000
+    """
+    help = 'Deletes expired idempotency keys.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per DELETE.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            batch = list(
+                IdempotencyKey.objects.filter(expires_at__lte=now).values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            deleted += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write(f'Deleted {deleted} expired idempotency keys.')
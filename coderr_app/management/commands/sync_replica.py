@@ -0,0 +1,82 @@
+import signal
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from coderr_app.db_router import record_sync, replica_aliases, replica_cache
+
+
+def copy_database(source_path, target_path, pages=1024):
+    """
+    Copies a SQLite database into another one with the online backup API.
+    The copy is consistent even while the source is being written.
+    """
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target, pages=pages)
+    finally:
+        target.close()
+        source.close()
+
+
+class Command(BaseCommand):
+    """
+    Refreshes the local SQLite read replicas from the primary database and
+    records the start of each copy, which lifts the primary pins of clients
+    that wrote before it. With --interval it keeps the replicas in sync until
+    SIGTERM/SIGINT; DATABASE_REPLICA_PIN_SECONDS must be longer than the
+    interval.
+
+    Example:
+        CODERR_REPLICA_DB=replica.sqlite3 python manage.py sync_replica
+        CODERR_REPLICA_DB=replica.sqlite3 python manage.py sync_replica --interval
+    """
+    help = 'Copies the default SQLite database into every configured replica.'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stopping = threading.Event()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, nargs='?', const=getattr(settings, 'DATABASE_REPLICA_SYNC_INTERVAL', 5),
+            help='Sync every N seconds (DATABASE_REPLICA_SYNC_INTERVAL without N) until stopped.',
+        )
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def handle(self, *args, **options):
+        aliases = replica_aliases()
+        if not aliases:
+            raise CommandError('No replica configured. Set CODERR_REPLICA_DB to the replica path.')
+        if isinstance(replica_cache(), LocMemCache):
+            self.stderr.write(
+                'The replica cache is process-local: web workers do not see the sync times and keep '
+                'clients that wrote on the primary until DATABASE_REPLICA_PIN_SECONDS expire.'
+            )
+        interval = options['interval']
+        if interval:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+        while True:
+            self.sync(aliases, verbose=not interval)
+            if not interval or self.stopping.wait(interval):
+                break
+
+    def sync(self, aliases, verbose=True):
+        source_path = connections['default'].settings_dict['NAME']
+        for alias in aliases:
+            target_path = connections[alias].settings_dict['NAME']
+            connections[alias].close()
+            started = time.time()
+            copy_database(source_path, target_path)
+            record_sync(alias, started)
+            if verbose:
+                self.stdout.write(f'{alias}: copied {source_path} -> {target_path}')
@@ -0,0 +1,159 @@
+"""
+Production media serving.
+
+MEDIA_SERVE_MODE selects how the file body is delivered:
+
+- 'django': zero-copy FileResponse (wsgi.file_wrapper/sendfile) with Range support.
+- 'x-accel-redirect': nginx serves the file from MEDIA_ACCEL_REDIRECT_PREFIX.
+- 'x-sendfile': Apache/lighttpd serve the absolute file path.
+
+In every mode Django sets ETag, Last-Modified and Cache-Control and answers
+conditional requests with 304.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+# Compressed files are served as what they are, like FileResponse does.
+ENCODED_CONTENT_TYPES = {
+    'br': 'application/x-brotli',
+    'bzip2': 'application/x-bzip',
+    'compress': 'application/x-compress',
+    'gzip': 'application/gzip',
+    'xz': 'application/x-xz',
+}
+
+
+def etag_for(stat):
+    return '"%x-%x"' % (stat.st_mtime_ns, stat.st_size)
+
+
+def content_type_for(path):
+    """
+    Guesses the Content-Type. A file like 'data.csv.gz' is sent as
+    application/gzip, never as text/csv with Content-Encoding: gzip.
+    """
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding:
+        return ENCODED_CONTENT_TYPES.get(encoding, 'application/octet-stream')
+    return content_type or 'application/octet-stream'
+
+
+def is_not_modified(request, etag, mtime):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def parse_range(header, size):
+    """
+    Parses a single 'bytes=' range into (start, end) inclusive.
+    Returns None for a missing or multi-part range (the full file is served)
+    and raises ValueError for an unsatisfiable one.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError('unsatisfiable range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('unsatisfiable range')
+    return start, end
+
+
+def iter_range(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serves a file below MEDIA_ROOT with caching and Range support.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Datei nicht gefunden.')
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404('Datei nicht gefunden.')
+    if not os.path.isfile(full_path):
+        raise Http404('Datei nicht gefunden.')
+
+    etag = etag_for(stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': f'public, max-age={getattr(settings, "MEDIA_CACHE_MAX_AGE", 3600)}',
+    }
+    if is_not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    content_type = content_type_for(full_path)
+    mode = getattr(settings, 'MEDIA_SERVE_MODE', 'django')
+
+    if mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type, headers=headers)
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix + quote(path)
+        return response
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response['X-Sendfile'] = full_path
+        return response
+
+    headers['Accept-Ranges'] = 'bytes'
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416, headers=headers)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                iter_range(full_path, start, length) if request.method == 'GET' else [],
+                status=206,
+                content_type=content_type,
+                headers=headers
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(length)
+            return response
+
+    return FileResponse(open(full_path, 'rb'), content_type=content_type, headers=headers)
@@ -0,0 +1,238 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+MetricsMiddleware records, per resolved URL name: the request count by method
+and status, a latency histogram, the number and duration of SQL queries, the
+serializer time and the response bytes. SQL queries are counted by an execute
+wrapper installed on every connection; it only checks a context variable, so
+requests pay a few microseconds per query. Serializer time covers the blocks
+wrapped in serializer_timer(): compiled list plans (coderr_app.compiled) and
+JSON rendering (coderr_app.renderers).
+
+Metrics are kept per process. With several worker processes, scrape each
+worker or aggregate in Prometheus.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+from coderr_app.middleware import HybridMiddleware
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_current = ContextVar('coderr_metrics_request', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'query_time', 'serializer_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+
+
+class EndpointStats:
+    __slots__ = ('requests', 'buckets', 'latency_sum', 'queries', 'query_time', 'serializer_time', 'response_bytes')
+
+    def __init__(self):
+        self.requests = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.response_bytes = 0
+
+
+class Registry:
+    """
+    Thread-safe store of EndpointStats by endpoint name.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, method, status, latency, stats, response_bytes):
+        with self.lock:
+            entry = self.endpoints.get(endpoint)
+            if entry is None:
+                entry = self.endpoints[endpoint] = EndpointStats()
+            key = (method, status)
+            entry.requests[key] = entry.requests.get(key, 0) + 1
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    entry.buckets[index] += 1
+                    break
+            entry.latency_sum += latency
+            entry.queries += stats.queries
+            entry.query_time += stats.query_time
+            entry.serializer_time += stats.serializer_time
+            entry.response_bytes += response_bytes
+
+    def clear(self):
+        with self.lock:
+            self.endpoints.clear()
+
+    def render(self):
+        """
+        Returns all metrics in the Prometheus text exposition format.
+        """
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            lines = [
+                '# HELP coderr_http_requests_total Requests by endpoint, method and status.',
+                '# TYPE coderr_http_requests_total counter',
+            ]
+            for endpoint, entry in endpoints:
+                for (method, status), count in sorted(entry.requests.items()):
+                    lines.append(
+                        f'coderr_http_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}'
+                    )
+
+            lines += [
+                '# HELP coderr_http_request_duration_seconds Request latency by endpoint.',
+                '# TYPE coderr_http_request_duration_seconds histogram',
+            ]
+            for endpoint, entry in endpoints:
+                label = f'endpoint="{endpoint}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, entry.buckets):
+                    cumulative += count
+                    lines.append(f'coderr_http_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                total = sum(entry.requests.values())
+                lines.append(f'coderr_http_request_duration_seconds_bucket{{{label},le="+Inf"}} {total}')
+                lines.append(f'coderr_http_request_duration_seconds_sum{{{label}}} {entry.latency_sum:.6f}')
+                lines.append(f'coderr_http_request_duration_seconds_count{{{label}}} {total}')
+
+            counters = (
+                ('coderr_db_queries_total', 'SQL queries by endpoint.', 'queries', '{}'),
+                ('coderr_db_query_duration_seconds_total', 'Time spent in SQL by endpoint.', 'query_time', '{:.6f}'),
+                ('coderr_serializer_duration_seconds_total', 'Time spent building and rendering response data by endpoint.', 'serializer_time', '{:.6f}'),
+                ('coderr_http_response_bytes_total', 'Response body bytes by endpoint.', 'response_bytes', '{}'),
+            )
+            for name, help_text, attr, value_format in counters:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for endpoint, entry in endpoints:
+                    value = value_format.format(getattr(entry, attr))
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_time += time.perf_counter() - start
+
+
+def add_query_wrapper(connection, **kwargs):
+    # Insert at the bottom: connection.execute_wrapper() pops the last wrapper
+    # on exit, so appending while one is active would remove ours instead.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+@contextmanager
+def serializer_timer():
+    """
+    Counts the enclosed block as serializer time of the current request.
+    """
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_time += time.perf_counter() - start
+
+
+def install():
+    """
+    Installs the SQL execute wrapper on all (current and future) connections.
+    Safe to call repeatedly.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        connection_created.connect(add_query_wrapper, dispatch_uid='coderr_metrics')
+        for connection in connections.all(initialized_only=True):
+            add_query_wrapper(connection)
+        _installed = True
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unnamed'
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """
+    Records request metrics per resolved URL name.
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        install()
+
+    def call(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    async def acall(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    def record(self, request, response, stats, latency):
+        if response.streaming:
+            response_bytes = int(response.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content)
+        registry.record(endpoint_name(request), request.method, response.status_code, latency, stats, response_bytes)
+        return response
+
+
+def metrics_view(request):
+    """
+    Serves the collected metrics. Restricted to METRICS_ALLOWED_IPS unless it is None.
+    """
+    allowed = getattr(settings, 'METRICS_ALLOWED_IPS', None)
+    if allowed is not None and request.META.get('REMOTE_ADDR') not in allowed:
+        raise PermissionDenied
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
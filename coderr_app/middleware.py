@@ -0,0 +1,109 @@
+import hashlib
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from coderr_app.db_router import replica_aliases, replica_cache, replicas_synced_at, use_replica
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def replica_pin_key(request):
+    """
+    Cache key of the primary pin; clients are identified by their Authorization header or IP address.
+    """
+    client = request.headers.get('Authorization') or request.META.get('REMOTE_ADDR', '')
+    return 'replica-pin:' + hashlib.sha256(client.encode()).hexdigest()
+
+
+def may_read_replica(request):
+    """
+    True unless the client wrote after the start of the oldest replica's last sync.
+    """
+    if not replica_aliases():
+        return False
+    written = replica_cache().get(replica_pin_key(request))
+    if written is None:
+        return True
+    synced = replicas_synced_at()
+    return synced is not None and synced > written
+
+
+class HybridMiddleware:
+    """
+    Base for middleware that runs natively under WSGI and ASGI, so Django
+    needs no sync/async adapter around it. With an async get_response the
+    instance is a coroutine function and __call__ returns acall(request).
+    Subclasses implement call()/acall(), or only process_response() if they
+    just adjust the response.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        return self.process_response(request, self.get_response(request))
+
+    async def acall(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        return response
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """
+    Lets safe-method requests read from replicas.
+    After a successful write the client is pinned to the primary until every
+    replica was synced again, so it reads its own changes; the pin expires
+    after DATABASE_REPLICA_PIN_SECONDS at the latest.
+    Clients are identified by their Authorization header, or their IP address.
+    """
+    def call(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+        if request.method in SAFE_METHODS:
+            with use_replica(may_read_replica(request)):
+                return self.get_response(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def acall(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        if request.method in SAFE_METHODS:
+            with use_replica(may_read_replica(request)):
+                return await self.get_response(request)
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        # Views that only read (the batch endpoint) set replica_read_only.
+        if response.status_code < 400 and not getattr(request, 'replica_read_only', False):
+            replica_cache().set(
+                replica_pin_key(request), time.time(), getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 60)
+            )
+        return response
+
+
+class RateLimitHeadersMiddleware(HybridMiddleware):
+    """
+    Adds the remaining throttle budget recorded by the token-bucket throttles
+    (the most restrictive scope) as X-RateLimit-* headers.
+    """
+    def process_response(self, request, response):
+        budget = getattr(request, 'rate_limit', None)
+        if budget is not None:
+            response['X-RateLimit-Limit'] = budget['limit']
+            response['X-RateLimit-Remaining'] = budget['remaining']
+            response['X-RateLimit-Reset'] = budget['reset']
+        return response
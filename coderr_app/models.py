@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db import models
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class IdempotencyKey(models.Model):
+    """
+    The outcome of a POST sent with an Idempotency-Key header (coderr_app.idempotency).
+    status_code is null while the first request with the key is still running.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    # Encoded like the JSON renderer, so replays render the same body.
+    response_data = models.JSONField(null=True, blank=True, encoder=JSONEncoder)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        return f"user: {self.user_id}, key: {self.key}, status: {self.status_code}"
@@ -0,0 +1,90 @@
+"""
+Fast JSON rendering.
+
+FastJSONRenderer produces the same bytes as DRF's compact JSONRenderer but
+encodes with orjson when it is installed (optional dependency) and with the
+C-accelerated stdlib encoder otherwise. Decimal, lazy translation strings and
+datetimes are converted exactly like rest_framework's encoder does, with the
+Decimal case (prices and ratings) checked first. Unlike the stdlib path,
+orjson renders NaN/Infinity as null instead of raising. Rendering time is
+reported as serializer time by the metrics middleware.
+"""
+import decimal
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+from coderr_app.metrics import serializer_timer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONEncoder(encoders.JSONEncoder):
+    """
+    rest_framework's encoder with a fast path for Decimal.
+    """
+    def default(self, obj):
+        if type(obj) is decimal.Decimal:
+            return float(obj)
+        return super().default(obj)
+
+
+_fallback_encoder = encoders.JSONEncoder()
+
+
+def orjson_default(obj):
+    if type(obj) is decimal.Decimal:
+        return float(obj)
+    return _fallback_encoder.default(obj)
+
+
+if orjson is not None:
+    # Datetimes go through the DRF encoder so UTC renders as 'Z' like before.
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for JSONRenderer.
+    Indented output (browsable API, '; indent=') and non-default UNICODE_JSON /
+    COMPACT_JSON settings are delegated to JSONRenderer.
+    """
+    use_orjson = orjson is not None
+
+    def __init__(self):
+        self.encoder = FastJSONEncoder(
+            ensure_ascii=False, allow_nan=not self.strict, separators=(',', ':')
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with serializer_timer():
+            return self.render_json(data, accepted_media_type, renderer_context)
+
+    def render_json(self, data, accepted_media_type, renderer_context):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.use_orjson:
+            try:
+                ret = orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                # E.g. integers beyond 64 bit; the stdlib encoder handles those.
+                return self.render_stdlib(data)
+            # Escape U+2028/U+2029 like JSONRenderer so the output stays valid
+            # JavaScript. Both start with the byte 0xE2; a single-byte scan is cheap.
+            if b'\xe2' in ret:
+                ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+            return ret
+        return self.render_stdlib(data)
+
+    def render_stdlib(self, data):
+        ret = self.encoder.encode(data)
+        if '\u2028' in ret or '\u2029' in ret:
+            ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+        return ret.encode()
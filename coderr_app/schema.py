@@ -0,0 +1,119 @@
+"""
+Precomputed OpenAPI schema.
+
+SpectacularAPIView introspects every view and serializer on each request.
+Here the schema is built once per process, from SCHEMA_SOURCE:
+
+- 'file': the committed SCHEMA_FILE (schema.yaml), kept in sync with
+  `python manage.py check_schema --write`.
+- 'generate': generated from the code on first use.
+
+The YAML and JSON renderings are kept in memory together with their
+compressed bodies (gzip, and brotli when available) and ETags; clients
+revalidate with If-None-Match.
+"""
+import hashlib
+import threading
+
+import yaml
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_safe
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+from coderr_app.compression import MAX_LEVELS, available_encodings, choose_encoding, compress
+
+YAML_CONTENT_TYPE = 'application/vnd.oai.openapi; charset=utf-8'
+JSON_CONTENT_TYPE = 'application/vnd.oai.openapi+json; charset=utf-8'
+
+
+def generate_schema():
+    """
+    Returns the schema generated from the code, as a dict.
+    """
+    return SchemaGenerator().get_schema(request=None, public=True)
+
+
+def render_yaml(schema):
+    return OpenApiYamlRenderer().render(schema, renderer_context={})
+
+
+class Representation:
+    """
+    One rendering of the schema with its compressed bodies and ETag.
+    """
+    def __init__(self, body, content_type):
+        self.body = body
+        self.compressed = {
+            encoding: compress(body, encoding, MAX_LEVELS[encoding]) for encoding in available_encodings()
+        }
+        self.content_type = content_type
+        self.etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+class PrecomputedSchema:
+    def __init__(self, schema):
+        self.yaml = Representation(render_yaml(schema), YAML_CONTENT_TYPE)
+        json_body = OpenApiJsonRenderer().render(schema, renderer_context={})
+        self.json = Representation(json_body, JSON_CONTENT_TYPE)
+
+    @classmethod
+    def load(cls):
+        source = getattr(settings, 'SCHEMA_SOURCE', 'file')
+        if source == 'generate':
+            return cls(generate_schema())
+        with open(settings.SCHEMA_FILE, encoding='utf-8') as schema_file:
+            return cls(yaml.safe_load(schema_file))
+
+
+_schema = None
+_lock = threading.Lock()
+
+
+def get_schema():
+    global _schema
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                _schema = PrecomputedSchema.load()
+    return _schema
+
+
+def reset_schema():
+    global _schema
+    with _lock:
+        _schema = None
+
+
+def wants_json(request):
+    requested = request.GET.get('format')
+    if requested:
+        return requested == 'json'
+    accept = request.headers.get('Accept', '')
+    return 'json' in accept and 'yaml' not in accept
+
+
+@require_safe
+def schema_view(request):
+    """
+    Serves the precomputed schema as YAML (default) or JSON (?format=json or
+    an Accept header asking for JSON), compressed when the client accepts it.
+    """
+    schema = get_schema()
+    representation = schema.json if wants_json(request) else schema.yaml
+    encoding = choose_encoding(request)
+
+    if_none_match = request.headers.get('If-None-Match', '')
+    if representation.etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponseNotModified()
+    elif encoding is not None:
+        response = HttpResponse(representation.compressed[encoding], content_type=representation.content_type)
+        response['Content-Encoding'] = encoding
+    else:
+        response = HttpResponse(representation.body, content_type=representation.content_type)
+    response['ETag'] = representation.etag
+    response['Cache-Control'] = f'public, max-age={getattr(settings, "SCHEMA_CACHE_MAX_AGE", 300)}'
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
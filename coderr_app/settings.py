@@ -12,12 +12,37 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Upload normalization: images are rejected above these limits (checked from the
+# header, before decoding), downsized to IMAGE_UPLOAD_MAX_SIDE, stripped of EXIF
+# and re-encoded on a pool of IMAGE_NORMALIZE_WORKERS threads.
+IMAGE_UPLOAD_MAX_BYTES = 10 * 1024 * 1024
+IMAGE_UPLOAD_MAX_PIXELS = 40_000_000
+IMAGE_UPLOAD_MAX_SIDE = 2048
+IMAGE_NORMALIZE_WORKERS = 2
+
+# Uploads above this size are spooled to a temporary file instead of memory.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
+# Downsized variants rendered by a background task for offer and profile images.
+IMAGE_VARIANT_SIZES = {
+    'thumbnail': 300,
+    'medium': 800,
+}
+IMAGE_VARIANT_FORMATS = ['webp', 'jpeg']
+
+# How /media/ files are delivered: 'django' (FileResponse/sendfile with Range
+# support), 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache/lighttpd).
+MEDIA_SERVE_MODE = os.environ.get('CODERR_MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -44,16 +69,22 @@ INSTALLED_APPS = [
     'drf_spectacular',
     'rest_framework',
     'rest_framework.authtoken',
+    'coderr_app',
     'user_auth_app',
     'offers_app',
     'orders_app',
+    'tasks_app',
 ]
 
 MIDDLEWARE = [
+    'coderr_app.metrics.MetricsMiddleware',
+    'coderr_app.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'coderr_app.middleware.ReplicaRoutingMiddleware',
+    'coderr_app.middleware.RateLimitHeadersMiddleware',
     #'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -98,13 +129,152 @@ WSGI_APPLICATION = 'coderr_app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# coderr_app.sqlite_backend applies the pragmas below on every new connection
+# (WAL, synchronous=NORMAL, busy_timeout, mmap, page cache, in-memory temp store).
+# CONN_MAX_AGE keeps connections open between requests.
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'coderr_app.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'busy_timeout': 5000,
+                'mmap_size': 256 * 1024 * 1024,
+                'cache_size': -20000,
+                'temp_store': 'MEMORY',
+            },
+        },
+    }
+}
+
+# Read replicas
+# Set CODERR_REPLICA_DB to the path of a read-only SQLite copy of the database,
+# kept in sync by `python manage.py sync_replica --interval` (every
+# DATABASE_REPLICA_SYNC_INTERVAL seconds). Safe-method reads of the models below
+# are then served from it; clients that just wrote read from the primary until
+# the next sync has started, and at most for DATABASE_REPLICA_PIN_SECONDS, which
+# must be longer than the sync interval.
+# Pins and sync times are kept in DATABASE_REPLICA_CACHE_ALIAS; it has to be a
+# cache shared by all workers and sync_replica (set CODERR_CACHE_BACKEND), as
+# locmem is per process.
+
+REPLICA_DATABASE = os.environ.get('CODERR_REPLICA_DB')
+if REPLICA_DATABASE:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': REPLICA_DATABASE,
+        'OPTIONS': {
+            'pragmas': {**DATABASES['default']['OPTIONS']['pragmas'], 'query_only': 1},
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['coderr_app.db_router.ReplicaRouter']
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_REPLICA_SYNC_INTERVAL = 5
+DATABASE_REPLICA_PIN_SECONDS = 60
+DATABASE_REPLICA_CACHE_ALIAS = 'default'
+DATABASE_REPLICA_MODELS = [
+    'offers_app.offer',
+    'offers_app.offerdetail',
+    'orders_app.review',
+    'user_auth_app.userprofile',
+]
+
+# Cache
+# Local memory by default. Point CODERR_CACHE_BACKEND/CODERR_CACHE_LOCATION at a
+# file or shared (Redis/Memcached) cache to share entries between workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CODERR_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CODERR_CACHE_LOCATION', 'coderr'),
     }
 }
 
+# Tag-based response cache for offer, review and profile reads (coderr_app.cache).
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60
+
+# Response compression (coderr_app.compression): JSON responses of at least
+# COMPRESSION_MIN_SIZE bytes are sent with brotli (if installed) or gzip.
+# Compressed bodies of cacheable responses are kept for COMPRESSION_CACHE_TIMEOUT
+# seconds under their ETag. `python manage.py bench_compression` compares levels.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_TIMEOUT = 300
+
+# Per-endpoint metrics (coderr_app.metrics), served in Prometheus format on
+# /metrics to these client addresses (None allows every client).
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# Facet buckets of /api/offers/?facets=price,delivery,creator (offers_app.api.facets):
+# min_price ranges between these edges, offers deliverable within N days and the
+# creators with the most offers. Facets are cached per normalized filter set.
+OFFER_FACET_PRICE_EDGES = [50, 100, 250, 500, 1000]
+OFFER_FACET_DELIVERY_DAYS = [1, 3, 7, 14]
+OFFER_FACET_CREATOR_LIMIT = 20
+OFFER_FACET_CACHE_TIMEOUT = 300
+
+# Offer popularity (offers_app.popularity): ?ordering=-popularity sorts offers by
+# their orders of the last OFFER_POPULARITY_WINDOW_DAYS days, then by all orders.
+# Order signals keep the counters current; the reconcile_popularity task
+# (`python manage.py recompute_offer_popularity --schedule`, run by `run_tasks`)
+# recomputes them every OFFER_POPULARITY_RECONCILE_INTERVAL seconds.
+OFFER_POPULARITY_WINDOW_DAYS = 30
+OFFER_POPULARITY_RECONCILE_INTERVAL = 60 * 60
+
+# /api/business-dashboard/<id>/ figures are cached per business user for at most
+# this many seconds; order, review, offer and profile changes drop them earlier.
+BUSINESS_DASHBOARD_CACHE_TIMEOUT = 30
+
+# List endpoints build their output from values() rows through a compiled plan
+# of the serializer (coderr_app.compiled); False serves them through the serializers.
+COMPILED_READ_SERIALIZERS = os.environ.get('CODERR_COMPILED_READ_SERIALIZERS', '1') != '0'
+
+# Idempotency-Key handling of POST /api/offers/ and /api/orders/ (coderr_app.idempotency):
+# stored responses are replayed for IDEMPOTENCY_KEY_TTL seconds, duplicates of a
+# running request wait up to IDEMPOTENCY_WAIT_TIMEOUT seconds, and a request that
+# holds its key longer than IDEMPOTENCY_LOCK_TIMEOUT seconds is presumed dead.
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+IDEMPOTENCY_WAIT_TIMEOUT = 10
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# POST /api/batch/ (coderr_app.batch) runs up to BATCH_MAX_REQUESTS GET requests
+# in one round trip; concurrent batches share a pool of BATCH_MAX_WORKERS threads.
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Throttling
+# Token buckets of coderr_app.throttling live in a local SQLite file shared by
+# all worker processes ('sqlite'), or in THROTTLE_CACHE_ALIAS ('cache') when a
+# shared cache is configured.
+
+THROTTLE_STORE = os.environ.get('CODERR_THROTTLE_STORE', 'sqlite')
+THROTTLE_SQLITE_PATH = os.environ.get('CODERR_THROTTLE_DB', BASE_DIR / 'throttle.sqlite3')
+THROTTLE_CACHE_ALIAS = 'default'
+# `manage.py test` keeps its buckets in the process-local cache, so test runs
+# never share bucket state through the SQLite file.
+if sys.argv[1:2] == ['test']:
+    THROTTLE_STORE = 'cache'
+
+# Background tasks (tasks_app), run by `python manage.py run_tasks`. Failed runs
+# are retried after TASKS_RETRY_BASE_DELAY * 2**(attempt - 1) seconds (capped);
+# a task whose worker died is claimable again after TASKS_LEASE_SECONDS.
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_BASE_DELAY = 10
+TASKS_RETRY_MAX_DELAY = 60 * 60
+TASKS_LEASE_SECONDS = 5 * 60
+TASKS_POLL_INTERVAL = 1.0
+TASKS_PURGE_INTERVAL = 5 * 60
+TASKS_KEEP_FINISHED = 7 * 24 * 60 * 60
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -124,6 +294,39 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# The first hasher of the selected profile hashes new passwords, the others are
+# only used to verify existing hashes, which are upgraded on the next login.
+
+PASSWORD_HASHER_PROFILES = {
+    'scrypt': [
+        'user_auth_app.hashers.ConfigurableScryptPasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ],
+    'pbkdf2': [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'user_auth_app.hashers.ConfigurableScryptPasswordHasher',
+    ],
+}
+PASSWORD_HASHER_PROFILE = os.environ.get('CODERR_PASSWORD_HASHER_PROFILE', 'scrypt')
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+# n=2**14, r=8 needs 16 MiB per hash; parallelism comes from the worker pool.
+PASSWORD_SCRYPT_PARAMS = {
+    'work_factor': 2 ** 14,
+    'block_size': 8,
+    'parallelism': 1,
+}
+
+# Size of the bounded password hashing pool (defaults to the number of cores).
+PASSWORD_HASHING_WORKERS = int(os.environ.get('CODERR_PASSWORD_HASHING_WORKERS', 0)) or os.cpu_count()
+
+AUTHENTICATION_BACKENDS = [
+    'user_auth_app.backends.PooledModelBackend',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -157,10 +360,15 @@ REST_FRAMEWORK = {
     ],
     
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'coderr_app.throttling.AnonTokenBucketThrottle',
+        'coderr_app.throttling.UserTokenBucketThrottle',
+        'coderr_app.throttling.ScopedTokenBucketThrottle',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    'DEFAULT_RENDERER_CLASSES': [
+        'coderr_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     
     'DEFAULT_THROTTLE_RATES': {
         'anon': '5/second',
@@ -173,6 +381,13 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# OpenAPI schema served on /api/schema/ (coderr_app.schema): 'file' serves the
+# committed SCHEMA_FILE, 'generate' builds it from the code once per process and
+# 'runtime' regenerates it on every request (drf-spectacular's SpectacularAPIView).
+SCHEMA_SOURCE = os.environ.get('CODERR_SCHEMA_SOURCE', 'file')
+SCHEMA_FILE = BASE_DIR / 'schema.yaml'
+SCHEMA_CACHE_MAX_AGE = 300
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Coderr API',
     'DESCRIPTION': 'A simple API for the WebApp Coderr',
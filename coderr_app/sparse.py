@@ -0,0 +1,158 @@
+"""
+Sparse fieldsets for GET responses.
+
+?fields=id,title,min_price keeps only the given fields, ?omit=user_details
+drops fields; both take comma-separated names of the serializer's readable
+fields. SparseFieldsMixin serializers remove the other fields when they are
+created, so they are never read or converted, and the compiled list plan is
+restricted the same way (see coderr_app.compiled).
+
+SparseFieldsetMixin views also trim the queryset: select_related and
+prefetch_related lookups that no selected field needs are dropped, and lists
+load only the selected columns with only(). Single objects keep all columns
+because object permission checks may read fields the client did not select.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Prefetch
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from coderr_app.compiled import CompiledSerializer, plan_columns
+
+SPARSE_PARAMETERS = [
+    OpenApiParameter('fields', str, description='Comma-separated fields to return; all fields if omitted.'),
+    OpenApiParameter('omit', str, description='Comma-separated fields to leave out of the response.'),
+]
+
+
+class SparseFieldsMixin:
+    """
+    Serializer accepting fields=[names]: all other fields are removed.
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """
+    Returns {name: field} of the serializer class's readable fields, in output order.
+    """
+    return {field.field_name: field for field in serializer_class()._readable_fields}
+
+
+def _names(raw):
+    return list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+
+
+def selected_fields(request, available):
+    """
+    Returns the field names selected by ?fields= and ?omit= in output order,
+    or None if neither parameter is given.
+    """
+    params = request.query_params
+    if 'fields' not in params and 'omit' not in params:
+        return None
+    requested = _names(params['fields']) if 'fields' in params else list(available)
+    omitted = _names(params.get('omit', ''))
+    for param, names in (('fields', requested), ('omit', omitted)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({param: f"Unbekannte Felder: {', '.join(unknown)}. Erlaubt: {', '.join(available)}."})
+    selected = [name for name in available if name in requested and name not in omitted]
+    if not selected:
+        raise ValidationError({'fields': 'Es muss mindestens ein Feld ausgewählt werden.'})
+    return selected
+
+
+def _select_related_paths(tree, prefix=''):
+    for name, subtree in tree.items():
+        yield prefix + name
+        yield from _select_related_paths(subtree, f'{prefix}{name}__')
+
+
+def _lookup_path(lookup):
+    return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+
+def sparse_queryset(queryset, serializer_class, fields, extra_columns=(), project=True):
+    """
+    Drops the related lookups the selected fields do not need and, with
+    project, restricts the loaded columns to theirs (plus extra_columns).
+    """
+    available = readable_fields(serializer_class)
+    roots = set()
+    for name in fields:
+        field = available[name]
+        if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            roots.add(field.source_attrs[0])
+    try:
+        plan = CompiledSerializer.for_class(serializer_class).plan
+    except ImproperlyConfigured:
+        plan, project = None, False
+    if plan is not None:
+        columns = plan_columns([entry for entry in plan if entry.name in fields])
+        roots.update(column.split('__')[0] for column in columns if '__' in column)
+
+    prefetches = [lookup for lookup in queryset._prefetch_related_lookups if _lookup_path(lookup).split('__')[0] in roots]
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+    if isinstance(queryset.query.select_related, dict):
+        paths = [path for path in _select_related_paths(queryset.query.select_related) if path.split('__')[0] in roots]
+        queryset = queryset.select_related(None)
+        if paths:
+            queryset = queryset.select_related(*paths)
+    if project:
+        model = queryset.model
+        forward = {field.name for field in model._meta.concrete_fields if field.is_relation}
+        queryset = queryset.only(
+            model._meta.pk.name, *(roots & forward), *columns, *extra_columns
+        )
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """
+    Applies ?fields= / ?omit= to GET requests of a generic view: the selection
+    is passed to the serializer and the compiled plan, and the filtered
+    queryset is trimmed by sparse_queryset().
+    """
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            request = getattr(self, 'request', None)
+            self._sparse_fields = None
+            if request is not None and request.method in ('GET', 'HEAD'):
+                self._sparse_fields = selected_fields(request, self.get_sparse_available_fields())
+        return self._sparse_fields
+
+    def get_sparse_available_fields(self):
+        """
+        Fields ?fields= / ?omit= may name; views drop fields their serializer hides.
+        """
+        return readable_fields(self.get_serializer_class())
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_compiled_serializer(self):
+        compiled = super().get_compiled_serializer()
+        fields = self.get_sparse_fields()
+        return compiled if fields is None else compiled.restrict(fields)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        is_list = (self.lookup_url_kwarg or self.lookup_field) not in self.kwargs
+        extra_columns = self.get_compiled_columns() if hasattr(self, 'get_compiled_columns') else ()
+        return sparse_queryset(queryset, self.get_serializer_class(), fields, extra_columns, project=is_list)
@@ -0,0 +1,51 @@
+"""
+SQLite backend with tuned connection pragmas.
+
+Use it as ENGINE 'coderr_app.sqlite_backend'. Pragmas are read from
+DATABASES[alias]['OPTIONS']['pragmas'] and applied to every new connection;
+keys that are not given fall back to DEFAULT_PRAGMAS. Combined with
+CONN_MAX_AGE the connection (and its page cache and mmap) is reused across
+requests instead of reopening the file every time.
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+# WAL lets readers continue while a writer commits; synchronous=NORMAL is
+# durable across application crashes in WAL mode and skips most fsyncs.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+ALLOWED_PRAGMAS = set(DEFAULT_PRAGMAS) | {'wal_autocheckpoint', 'journal_size_limit', 'query_only'}
+PRAGMA_VALUE_RE = re.compile(r'^(-?\d+|[A-Za-z_]+)$')
+
+
+def apply_pragmas(connection, pragmas):
+    """
+    Executes the given pragmas on a DB-API sqlite3 connection.
+    """
+    for name, value in pragmas.items():
+        if name not in ALLOWED_PRAGMAS or not PRAGMA_VALUE_RE.match(str(value)):
+            raise ImproperlyConfigured(f'Unsupported SQLite pragma: {name}={value!r}')
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        options = self.settings_dict['OPTIONS']
+        self.pragmas = {**DEFAULT_PRAGMAS, **options.get('pragmas', {})}
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, self.pragmas)
+        return connection
@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from offers_app.models import Offer
+from orders_app.models import Order
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+
+def create_client(username, profile_type):
+    user = User.objects.create_user(username=username, password='werte12345')
+    UserProfile.objects.create(user=user, type=profile_type)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=user).key)
+    return user, client
+
+
+class BatchEndpointTest(APITestCase):
+    """
+    Test cases for POST /api/batch/.
+    """
+    def setUp(self):
+        self.business_user, self.client = create_client('testbusinessuser', 'business')
+        self.offer = Offer.objects.create(user=self.business_user, title='Angebot', description='Test')
+
+    def batch(self, *paths, **data):
+        return self.client.post(
+            '/api/batch/', {'requests': [{'path': path} for path in paths], **data}, format='json'
+        )
+
+    def test_responses_in_request_order(self):
+        """Each sub-request returns the body its endpoint returns on its own."""
+        paths = ['/api/base-info/', f'/api/offers/{self.offer.pk}/', '/api/offers/?search=Angebot']
+        response = self.batch(*paths)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entries = response.data['responses']
+        self.assertEqual([entry['path'] for entry in entries], paths)
+        self.assertEqual([entry['status'] for entry in entries], [200, 200, 200])
+        for entry in entries:
+            self.assertEqual(entry['body'], self.client.get(entry['path']).data)
+
+    def test_authenticates_once(self):
+        """The token is checked for the batch only; sub-requests reuse its user."""
+        with mock.patch.object(
+            TokenAuthentication, 'authenticate_credentials', wraps=TokenAuthentication().authenticate_credentials
+        ) as authenticate:
+            response = self.batch('/api/base-info/', '/api/offers/', f'/api/offers/{self.offer.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(authenticate.call_count, 1)
+
+    def test_errors_are_reported_per_entry(self):
+        """Unknown paths and objects return 404 entries without failing the batch."""
+        response = self.batch('/api/unknown/', '/api/offers/999999/', '/api/base-info/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([entry['status'] for entry in response.data['responses']], [404, 404, 200])
+
+    def test_sub_requests_run_permission_checks(self):
+        """An order is only readable by its business user, also through the batch."""
+        customer, customer_client = create_client('testcustomeruser', 'customer')
+        order = Order.objects.create(customer_user=customer, business_user=self.business_user.pk, title='Auftrag')
+        self.assertEqual(customer_client.get(f'/api/orders/{order.pk}/').status_code, status.HTTP_403_FORBIDDEN)
+
+        response = customer_client.post(
+            '/api/batch/', {'requests': [{'path': f'/api/orders/{order.pk}/'}]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['responses'][0]['status'], status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.batch(f'/api/orders/{order.pk}/').data['responses'][0]['status'], status.HTTP_200_OK)
+
+    def test_invalid_batches(self):
+        """Only relative GET paths under /api/, no nesting, at most BATCH_MAX_REQUESTS."""
+        self.assertEqual(self.batch('https://example.com/api/offers/').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch('/admin/').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch('/api/batch/').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch().status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            '/api/batch/', {'requests': [{'method': 'DELETE', 'path': '/api/offers/'}]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(BATCH_MAX_REQUESTS=2):
+            response = self.batch('/api/offers/', '/api/offers/', '/api/offers/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        response = APIClient().post('/api/batch/', {'requests': [{'path': '/api/base-info/'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_throttled_once(self):
+        """The batch consumes one token of the user bucket, not one per sub-request."""
+        with override_settings(THROTTLE_ENABLED=True, THROTTLE_STORE='cache'):
+            with mock.patch('coderr_app.throttling.CacheBucketStore.consume', return_value=(True, 10)) as consume:
+                response = self.batch('/api/base-info/', '/api/offers/', '/api/orders/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(consume.call_count, 1)
+
+
+class ConcurrentBatchTest(TransactionTestCase):
+    """
+    Sub-requests of a concurrent batch run on the batch thread pool.
+    """
+    def test_concurrent_batch(self):
+        business_user, client = create_client('testbusinessuser', 'business')
+        offer = Offer.objects.create(user=business_user, title='Angebot', description='Test')
+        paths = ['/api/base-info/', f'/api/offers/{offer.pk}/', '/api/offers/', '/api/unknown/']
+
+        sequential = client.post('/api/batch/', {'requests': [{'path': path} for path in paths]}, format='json')
+        concurrent = client.post(
+            '/api/batch/', {'requests': [{'path': path} for path in paths], 'concurrent': True}, format='json'
+        )
+        self.assertEqual(concurrent.status_code, status.HTTP_200_OK)
+        self.assertEqual(concurrent.data, sequential.data)
@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Review
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+CACHE_BACKENDS = {
+    'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'response-cache-test'},
+    'file': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/coderr-response-cache-test'},
+}
+
+
+class ResponseCacheTest(APITestCase):
+    """
+    Test cases for the tag-based response cache.
+    """
+    def setUp(self):
+        cache.clear()
+        self.business = User.objects.create_user(username='business', password='werte12345', first_name='Anna')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='customer', password='werte12345')
+        UserProfile.objects.create(user=self.customer, type='customer')
+        self.offer = Offer.objects.create(user=self.business, title='Webdesign', description='Test', min_price=100)
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title='Basic', delivery_time_in_days=5, price=100, features=[], offer_type='basic'
+        )
+        self.client.force_authenticate(user=self.customer)
+
+    def test_offer_list_is_cached_until_an_offer_changes(self):
+        """A repeated list request hits the cache until an offer is saved."""
+        url = reverse('offers-list')
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(first.data, second.data)
+
+        self.offer.title = 'Webdesign Pro'
+        self.offer.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['results'][0]['title'], 'Webdesign Pro')
+
+    def test_query_params_are_normalized(self):
+        """Parameter order does not create separate cache entries."""
+        url = reverse('offers-list')
+        self.client.get(url + '?search=web&ordering=min_price')
+        with self.assertNumQueries(0):
+            self.client.get(url + '?ordering=min_price&search=web')
+
+    def test_offer_detail_change_invalidates_offer(self):
+        """Saving an OfferDetail invalidates the cached parent offer."""
+        url = reverse('offers-detail', kwargs={'pk': self.offer.pk})
+        self.client.get(url)
+        self.detail.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.data['details'], [])
+
+    def test_profile_change_invalidates_profile_and_offer_lists(self):
+        """Updating a user invalidates the cached profile and the offer lists embedding it."""
+        profile_url = reverse('userprofile-detail', kwargs={'pk': self.business.pk})
+        offers_url = reverse('offers-list')
+        self.client.get(profile_url)
+        self.client.get(offers_url)
+        self.business.first_name = 'Berta'
+        self.business.save()
+        self.assertEqual(self.client.get(profile_url).data['first_name'], 'Berta')
+        self.assertEqual(self.client.get(offers_url).data['results'][0]['user_details']['first_name'], 'Berta')
+
+    def test_review_list_invalidated_on_create(self):
+        """Creating a review invalidates the cached review list."""
+        url = reverse('reviews-list')
+        self.assertEqual(len(self.client.get(url).data), 0)
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4)
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+    def test_errors_are_not_cached(self):
+        """Missing objects are not cached."""
+        url = reverse('offers-detail', kwargs={'pk': 9999})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_backends(self):
+        """Invalidation works on the locmem and file backends."""
+        url = reverse('offers-list')
+        for name, config in CACHE_BACKENDS.items():
+            with self.subTest(backend=name), override_settings(CACHES={'default': config}):
+                cache.clear()
+                self.client.get(url)
+                with self.assertNumQueries(0):
+                    self.client.get(url)
+                Offer.objects.create(user=self.business, title='Neu', description='Test')
+                self.assertEqual(self.client.get(url).data['count'], 2)
+                cache.clear()
+                Offer.objects.filter(title='Neu').delete()
@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from coderr_app.compiled import CompiledSerializer
+from offers_app.api.serializers import OfferSerializer
+from offers_app.models import Offer
+from orders_app.models import Order
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+
+class CompiledListTest(APITestCase):
+    """
+    The compiled list path must render byte-identical responses to the serializers.
+    """
+    def setUp(self):
+        call_command(
+            'generate_data', business=4, customers=6, offers_per_business=3, orders=30, reviews=10,
+            stdout=StringIO()
+        )
+        offer = Offer.objects.order_by('pk').first()
+        Offer.objects.filter(pk=offer.pk).update(
+            image='offers/images/photo.jpg',
+            image_variants={'source': 'offers/images/photo.jpg', 'thumbnail': {'webp': 'offers/images/variants/photo_thumbnail.webp'}}
+        )
+        UserProfile.objects.filter(user_id=offer.user_id).update(file='profile_pics/avatar.png')
+        customer = UserProfile.objects.filter(type='customer').order_by('pk').first()
+        UserProfile.objects.filter(pk=customer.pk).update(file='profile_pics/customer.png')
+        self.business = User.objects.get(pk=Order.objects.order_by('pk').first().business_user)
+        self.client.force_authenticate(user=self.business)
+
+    def fetch(self, url, compiled):
+        cache.clear()
+        with override_settings(COMPILED_READ_SERIALIZERS=compiled):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.content
+
+    def test_byte_identical_responses(self):
+        """Every list endpoint and query variant renders the same bytes on both paths."""
+        urls = [
+            reverse('offers-list'),
+            reverse('offers-list') + '?page=2',
+            reverse('offers-list') + '?ordering=min_price&search=Design',
+            reverse('offers-list') + f'?creator_id={self.business.pk}&max_delivery_time=5',
+            reverse('orders-list'),
+            reverse('reviews-list'),
+            reverse('reviews-list') + f'?business_user_id={self.business.pk}&ordering=-rating',
+            reverse('userprofile-business-list'),
+            reverse('userprofile-business-list') + '?page_size=2',
+            reverse('userprofile-business-list') + '?page_size=2&ordering=location',
+            reverse('userprofile-customer-list'),
+            reverse('userprofile-customer-list') + '?location=Berlin',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.fetch(url, compiled=True), self.fetch(url, compiled=False))
+
+    def test_cursor_pages_match(self):
+        """Following the cursor gives the same pages on both paths."""
+        url = reverse('userprofile-business-list') + '?page_size=3'
+        compiled = self.client.get(url).json()
+        with override_settings(COMPILED_READ_SERIALIZERS=False):
+            cache.clear()
+            reference = self.client.get(url).json()
+        self.assertEqual(compiled, reference)
+        self.assertEqual(self.fetch(compiled['next'], True), self.fetch(reference['next'], False))
+
+    def test_plan_is_built_once(self):
+        """The plan is derived once per serializer class and flattens nested serializers."""
+        compiled = CompiledSerializer.for_class(OfferSerializer)
+        self.assertIs(CompiledSerializer.for_class(OfferSerializer), compiled)
+        self.assertIn('user__username', compiled.columns)
+        self.assertEqual(compiled.relations, ['details'])
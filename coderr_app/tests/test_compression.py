@@ -0,0 +1,132 @@
+import gzip
+import json
+import unittest
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.module_loading import import_string
+from rest_framework.test import APITestCase
+
+from coderr_app import compression
+from coderr_app.compression import choose_encoding
+from offers_app.models import Offer
+from orders_app.models import Order
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+
+class ChooseEncodingTest(SimpleTestCase):
+    def choose(self, header):
+        return choose_encoding(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header))
+
+    def test_accept_encoding(self):
+        self.assertEqual(self.choose('gzip, deflate'), 'gzip')
+        self.assertIsNone(self.choose(''))
+        self.assertIsNone(self.choose('identity'))
+        self.assertIsNone(self.choose('gzip;q=0'))
+        self.assertEqual(self.choose('*'), compression.available_encodings()[0])
+        with mock.patch.object(compression, 'available_encodings', return_value=('br', 'gzip')):
+            self.assertEqual(self.choose('gzip, br'), 'br')
+            self.assertEqual(self.choose('gzip;q=1.0, br;q=0.5'), 'gzip')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTest(APITestCase):
+    """
+    Test cases for CompressionMiddleware on the API.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testbusinessuser', password='werte12345')
+        UserProfile.objects.create(user=self.user, type='business')
+        for number in range(5):
+            Offer.objects.create(user=self.user, title=f'Webdesign Paket {number}', description='Webdesign ' * 20)
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url, encoding='gzip, deflate', **headers):
+        return self.client.get(url, headers={'Accept-Encoding': encoding, **headers})
+
+    def test_gzip(self):
+        plain = self.get('/api/offers/', encoding='identity')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+
+        response = self.get('/api/offers/')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.get('/api/base-info/')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(response.content)['offer_count'], 5)
+
+    def test_cached_responses_reuse_compressed_body(self):
+        """Repeated hits on a cacheable response do not compress again."""
+        with mock.patch.object(compression, 'compress', wraps=compression.compress) as compress:
+            first = self.get('/api/offers/')
+            second = self.get('/api/offers/')
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertTrue(first['ETag'].startswith('W/"'))
+
+    def test_etag_revalidation(self):
+        etag = self.get('/api/offers/')['ETag']
+        response = self.get('/api/offers/', **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        Offer.objects.create(user=self.user, title='Neues Angebot', description='Test')
+        response = self.get('/api/offers/', **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_per_user_responses_are_compressed_without_etag(self):
+        """Order lists are not shared between clients: no ETag, no cached body."""
+        for number in range(10):
+            Order.objects.create(customer_user=self.user, business_user=self.user.pk, title=f'Auftrag {number}')
+        with mock.patch.object(compression, 'cached_compress') as cached_compress:
+            response = self.get('/api/orders/')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('ETag'))
+        cached_compress.assert_not_called()
+
+    @unittest.skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_brotli(self):
+        response = self.get('/api/offers/', encoding='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(
+            compression.brotli.decompress(response.content), self.get('/api/offers/', encoding='identity').content
+        )
+
+
+class CompressionMiddlewareAsyncTest(SimpleTestCase):
+    @override_settings(COMPRESSION_MIN_SIZE=10)
+    async def test_async_view(self):
+        """Under ASGI the middleware awaits the view and compresses its response."""
+        body = json.dumps({'title': 'Webdesign ' * 20}).encode()
+
+        async def view(request):
+            return HttpResponse(body, content_type='application/json')
+
+        middleware = compression.CompressionMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+
+    def test_project_middleware_is_async_capable(self):
+        """No repo middleware makes Django adapt async views back to sync."""
+        for path in settings.MIDDLEWARE:
+            if path.startswith('coderr_app.'):
+                with self.subTest(middleware=path):
+                    middleware = import_string(path)
+                    self.assertTrue(middleware.sync_capable and middleware.async_capable)
@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from coderr_app.db_router import ReplicaRouter, record_sync, replicas_synced_at, use_replica, _use_replica
+from coderr_app.management.commands.sync_replica import Command as SyncReplicaCommand, copy_database
+from coderr_app.middleware import ReplicaRoutingMiddleware
+from offers_app.models import Offer
+from orders_app.models import Order
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(SimpleTestCase):
+    """
+    Test cases for the replica router and its middleware.
+    """
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        cache.clear()
+
+    def test_reads_go_to_replica_only_when_allowed(self):
+        """Replica-eligible models are read from the replica inside use_replica()."""
+        self.assertEqual(self.router.db_for_read(Offer), 'default')
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Offer), 'replica')
+            self.assertEqual(self.router.db_for_read(Order), 'default')
+            self.assertEqual(self.router.db_for_write(Offer), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_falls_back_without_replicas(self):
+        """Without configured replicas every read uses the primary."""
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Offer), 'default')
+
+    def test_middleware_pins_client_after_write(self):
+        """A successful write pins the client to the primary for its next reads."""
+        seen = []
+
+        def get_response(request):
+            seen.append(_use_replica.get())
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        auth = {'HTTP_AUTHORIZATION': 'Token abc'}
+        middleware(self.factory.get('/api/offers/', **auth))
+        middleware(self.factory.post('/api/offers/', **auth))
+        middleware(self.factory.get('/api/offers/', **auth))
+        middleware(self.factory.get('/api/offers/', HTTP_AUTHORIZATION='Token other'))
+        self.assertEqual(seen, [True, False, False, True])
+        self.assertFalse(_use_replica.get())
+
+        # A sync that started before the write does not lift the pin, the next one does.
+        record_sync('replica', time.time() - 60)
+        middleware(self.factory.get('/api/offers/', **auth))
+        record_sync('replica', time.time() + 1)
+        middleware(self.factory.get('/api/offers/', **auth))
+        self.assertEqual(seen[4:], [False, True])
+
+    async def test_middleware_runs_async(self):
+        """Under ASGI the middleware awaits the view without a sync adapter."""
+        seen = []
+
+        async def get_response(request):
+            seen.append(_use_replica.get())
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        auth = {'HTTP_AUTHORIZATION': 'Token abc'}
+        await middleware(self.factory.get('/api/offers/', **auth))
+        await middleware(self.factory.post('/api/offers/', **auth))
+        await middleware(self.factory.get('/api/offers/', **auth))
+        self.assertEqual(seen, [True, False, False])
+
+    def test_sync_replica_interval(self):
+        """sync_replica --interval copies repeatedly and records every sync until stopped."""
+        command = SyncReplicaCommand(stdout=StringIO(), stderr=StringIO())
+        calls = []
+
+        def copy(source, target):
+            calls.append(target)
+            if len(calls) == 3:
+                command.stop()
+
+        replica = {**connections['default'].settings_dict, 'NAME': 'replica.sqlite3'}
+        with mock.patch.dict(connections.settings, {'replica': replica}), \
+                mock.patch('coderr_app.management.commands.sync_replica.copy_database', side_effect=copy), \
+                mock.patch('coderr_app.management.commands.sync_replica.signal.signal'):
+            before = time.time()
+            call_command(command, interval=0.001)
+            del connections['replica']
+        self.assertEqual(calls, ['replica.sqlite3'] * 3)
+        self.assertGreaterEqual(replicas_synced_at(), before)
+
+
+class CopyDatabaseTest(SimpleTestCase):
+    def test_copy_database(self):
+        """The replica receives a consistent copy of the primary."""
+        with tempfile.TemporaryDirectory() as directory:
+            primary = os.path.join(directory, 'primary.sqlite3')
+            replica = os.path.join(directory, 'replica.sqlite3')
+            conn = sqlite3.connect(primary)
+            conn.execute('CREATE TABLE offers (id INTEGER PRIMARY KEY, title TEXT)')
+            conn.execute("INSERT INTO offers (title) VALUES ('Webdesign')")
+            conn.commit()
+            conn.close()
+            copy_database(primary, replica)
+            conn = sqlite3.connect(replica)
+            self.assertEqual(conn.execute('SELECT title FROM offers').fetchall(), [('Webdesign',)])
+            conn.close()
@@ -0,0 +1,46 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, Min
+from django.test import TestCase
+
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order, Review
+from user_auth_app.models import UserProfile
+
+
+class GenerateDataTest(TestCase):
+    """
+    Test cases for the synthetic data generator.
+    """
+    def generate(self, **options):
+        call_command(
+            'generate_data', business=3, customers=5, offers_per_business=2, orders=20, reviews=7,
+            batch_size=4, stdout=StringIO(), **options
+        )
+
+    def test_creates_consistent_rows(self):
+        """Rows are created in the requested volumes with consistent relations and aggregates."""
+        self.generate()
+        self.assertEqual(UserProfile.objects.filter(type='business').count(), 3)
+        self.assertEqual(UserProfile.objects.filter(type='customer').count(), 5)
+        self.assertEqual(Offer.objects.count(), 6)
+        self.assertEqual(OfferDetail.objects.count(), 18)
+        self.assertEqual(Order.objects.count(), 20)
+        self.assertEqual(Review.objects.count(), 7)
+
+        counts = Offer.objects.annotate(detail_count=Count('details')).values_list('detail_count', flat=True)
+        self.assertEqual(set(counts), {3})
+        for offer in Offer.objects.annotate(price=Min('details__price'), delivery=Min('details__delivery_time_in_days')):
+            self.assertEqual(offer.min_price, offer.price)
+            self.assertEqual(offer.min_delivery_time, offer.delivery)
+        for order in Order.objects.select_related('offer_detail_id__offer'):
+            self.assertEqual(order.business_user, order.offer_detail_id.offer.user_id)
+            self.assertEqual(order.price, order.offer_detail_id.price)
+
+    def test_repeated_runs_add_users(self):
+        """A second run continues the username sequence instead of colliding."""
+        self.generate()
+        self.generate(seed=7)
+        self.assertEqual(UserProfile.objects.filter(type='business').count(), 6)
+        self.assertEqual(Review.objects.count(), 14)
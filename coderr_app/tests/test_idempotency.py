@@ -0,0 +1,137 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from coderr_app import idempotency
+from coderr_app.models import IdempotencyKey
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+OFFER_DATA = {
+    'title': 'Webdesign Paket',
+    'description': 'Professionelle Webentwicklung',
+    'details': [
+        {'title': 'Basic', 'revisions': 2, 'delivery_time_in_days': 5, 'price': 100, 'features': ['A'], 'offer_type': 'basic'},
+        {'title': 'Standard', 'revisions': 5, 'delivery_time_in_days': 7, 'price': 200, 'features': ['B'], 'offer_type': 'standard'},
+        {'title': 'Premium', 'revisions': -1, 'delivery_time_in_days': 3, 'price': 500, 'features': ['C'], 'offer_type': 'premium'},
+    ],
+}
+
+
+class IdempotencyKeyTest(APITestCase):
+    """
+    Test cases for the Idempotency-Key header on POST /api/offers/ and /api/orders/.
+    """
+    def setUp(self):
+        self.business = User.objects.create_user(username='testbusinessuser', password='werte12345')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='testcustomeruser', password='werte12345')
+        UserProfile.objects.create(user=self.customer, type='customer')
+        self.client.force_authenticate(user=self.business)
+
+    def post_offer(self, key, data=OFFER_DATA):
+        return self.client.post(reverse('offers-list'), data, format='json', headers={'Idempotency-Key': key})
+
+    def test_retry_replays_stored_response(self):
+        first = self.post_offer('offer-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(first.has_header('Idempotent-Replayed'))
+
+        with mock.patch('offers_app.api.serializers.OfferSerializer.create') as create:
+            with self.assertNumQueries(1):
+                retry = self.post_offer('offer-1')
+        create.assert_not_called()
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(Offer.objects.count(), 1)
+        self.assertEqual(OfferDetail.objects.count(), 3)
+
+    def test_keys_are_per_user_and_request(self):
+        self.post_offer('same-key')
+        changed = dict(OFFER_DATA, title='Anderes Paket')
+        response = self.post_offer('same-key', changed)
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        other = User.objects.create_user(username='otherbusiness', password='werte12345')
+        UserProfile.objects.create(user=other, type='business')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.post_offer('same-key').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Offer.objects.count(), 2)
+
+    def test_order_create(self):
+        offer_id = self.post_offer('offer').data['id']
+        detail = OfferDetail.objects.get(offer_id=offer_id, offer_type='basic')
+        self.client.force_authenticate(user=self.customer)
+        responses = [
+            self.client.post(
+                reverse('orders-list'), {'offer_detail_id': detail.pk}, format='json', headers={'Idempotency-Key': 'o-1'}
+            )
+            for _ in range(3)
+        ]
+        self.assertEqual([response.status_code for response in responses], [201, 201, 201])
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(Order.objects.count(), 1)
+        self.client.post(reverse('orders-list'), {'offer_detail_id': detail.pk}, format='json')
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_failed_requests_release_the_key(self):
+        response = self.post_offer('retry-me', dict(OFFER_DATA, details=[]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post_offer('retry-me').status_code, status.HTTP_201_CREATED)
+
+    def test_duplicate_waits_for_running_request(self):
+        """A duplicate of a running request waits and replays its result."""
+        row = IdempotencyKey.objects.create(
+            user=self.business, key='running', fingerprint='', locked_until=timezone.now() + datetime.timedelta(minutes=1),
+            expires_at=timezone.now() + datetime.timedelta(days=1),
+        )
+        request = mock.Mock(data=OFFER_DATA, method='POST', path=reverse('offers-list'))
+        IdempotencyKey.objects.filter(pk=row.pk).update(fingerprint=idempotency.request_fingerprint(request))
+
+        def finish(delay):
+            IdempotencyKey.objects.filter(pk=row.pk).update(
+                status_code=201, response_data={'id': 42, 'title': 'Webdesign Paket'}, locked_until=None
+            )
+
+        with mock.patch.object(idempotency.time, 'sleep', side_effect=finish) as sleep:
+            response = self.post_offer('running')
+        sleep.assert_called_once()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), {'id': 42, 'title': 'Webdesign Paket'})
+        self.assertEqual(Offer.objects.count(), 0)
+
+        IdempotencyKey.objects.filter(pk=row.pk).update(status_code=None, locked_until=timezone.now() + datetime.timedelta(minutes=1))
+        with override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0), mock.patch.object(idempotency.time, 'sleep'):
+            self.assertEqual(self.post_offer('running').status_code, status.HTTP_409_CONFLICT)
+
+        # The first request died: after its lock expires a retry takes over.
+        IdempotencyKey.objects.filter(pk=row.pk).update(locked_until=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertEqual(self.post_offer('running').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Offer.objects.count(), 1)
+
+    def test_expired_keys(self):
+        self.post_offer('old')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        response = self.post_offer('old')
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+        self.assertEqual(Offer.objects.count(), 2)
+
+        IdempotencyKey.objects.update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        self.post_offer('new')
+        out = StringIO()
+        call_command('purge_idempotency_keys', batch_size=1, stdout=out)
+        self.assertIn('Deleted 1 expired', out.getvalue())
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['new'])
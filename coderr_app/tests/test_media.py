@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_SERVE_MODE='django')
+class ServeMediaTest(SimpleTestCase):
+    """
+    Test cases for the media serving view.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(MEDIA_ROOT, 'offers'), exist_ok=True)
+        with open(os.path.join(MEDIA_ROOT, 'offers', 'photo.jpg'), 'wb') as fh:
+            fh.write(bytes(range(256)) * 4)
+        with open(os.path.join(MEDIA_ROOT, 'offers', 'export.csv.gz'), 'wb') as fh:
+            fh.write(b'\x1f\x8b compressed')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_full_file_with_cache_headers(self):
+        """GET returns the whole file with ETag, Last-Modified and a revalidating Cache-Control."""
+        response = self.client.get('/media/offers/photo.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(256)) * 4)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+    def test_compressed_file_is_not_content_encoded(self):
+        """A .gz upload is served as application/gzip, not as a gzip-encoded CSV."""
+        for byte_range in (None, 'bytes=0-1'):
+            with self.subTest(byte_range=byte_range):
+                headers = {'HTTP_RANGE': byte_range} if byte_range else {}
+                response = self.client.get('/media/offers/export.csv.gz', **headers)
+                self.assertEqual(response['Content-Type'], 'application/gzip')
+                self.assertNotIn('Content-Encoding', response)
+
+    def test_if_none_match_returns_304(self):
+        """A matching If-None-Match returns 304 without a body."""
+        etag = self.client.get('/media/offers/photo.jpg')['ETag']
+        response = self.client.get('/media/offers/photo.jpg', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_range_requests(self):
+        """Single byte ranges return 206 with the matching slice."""
+        response = self.client.get('/media/offers/photo.jpg', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(10, 20)))
+
+        response = self.client.get('/media/offers/photo.jpg', HTTP_RANGE='bytes=-4')
+        self.assertEqual(response['Content-Range'], 'bytes 1020-1023/1024')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(252, 256)))
+
+        response = self.client.get('/media/offers/photo.jpg', HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_stale_if_range_serves_full_file(self):
+        """A Range with a stale If-Range validator is answered with the full file."""
+        response = self.client.get('/media/offers/photo.jpg', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_and_traversal_return_404(self):
+        """Unknown files and paths outside MEDIA_ROOT are not found."""
+        self.assertEqual(self.client.get('/media/offers/missing.jpg').status_code, 404)
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/media/offers/').status_code, 404)
+
+    @override_settings(MEDIA_SERVE_MODE='x-accel-redirect', MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_x_accel_redirect_mode(self):
+        """In x-accel-redirect mode the body is left to nginx."""
+        response = self.client.get('/media/offers/photo.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/offers/photo.jpg')
+        self.assertEqual(response.content, b'')
+        self.assertIn('ETag', response)
+
+    @override_settings(MEDIA_SERVE_MODE='x-sendfile')
+    def test_x_sendfile_mode(self):
+        """In x-sendfile mode the absolute path is handed to the front server."""
+        response = self.client.get('/media/offers/photo.jpg')
+        self.assertEqual(response['X-Sendfile'], os.path.join(MEDIA_ROOT, 'offers', 'photo.jpg'))
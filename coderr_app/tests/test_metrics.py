@@ -0,0 +1,79 @@
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APITestCase
+
+from coderr_app.metrics import MetricsMiddleware, registry
+from offers_app.models import Offer
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+DRF_DATA = BaseSerializer.__dict__['data']
+
+
+class MetricsTest(APITestCase):
+    """
+    Test cases for the per-endpoint metrics middleware and /metrics.
+    """
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.user = User.objects.create_user(username='business', password='werte12345')
+        UserProfile.objects.create(user=self.user, type='business')
+        Offer.objects.create(user=self.user, title='Webdesign', description='Test')
+        self.client.force_authenticate(user=self.user)
+
+    def test_records_requests_per_url_name(self):
+        """Requests, SQL queries, serializer time and bytes are recorded per URL name."""
+        response = self.client.get(reverse('offers-list'))
+        self.client.get(reverse('base-info'))
+
+        entry = registry.endpoints['offers-list']
+        self.assertEqual(entry.requests, {('GET', 200): 1})
+        self.assertGreater(entry.queries, 0)
+        self.assertGreater(entry.query_time, 0)
+        self.assertGreater(entry.serializer_time, 0)
+        self.assertEqual(entry.response_bytes, len(response.content))
+        self.assertEqual(sum(entry.buckets), 1)
+        self.assertIn('base-info', registry.endpoints)
+
+    def test_serializers_are_not_patched(self):
+        """Serializer time comes from explicit timers; serializer classes stay untouched."""
+        self.assertIs(BaseSerializer.__dict__['data'], DRF_DATA)
+        offer = Offer.objects.get()
+        self.client.get(reverse('offers-detail', kwargs={'pk': offer.pk}))
+        self.assertGreater(registry.endpoints['offers-detail'].serializer_time, 0)
+
+    def test_metrics_endpoint_prometheus_format(self):
+        """/metrics serves the text exposition format with cumulative histogram buckets."""
+        self.client.get(reverse('offers-list'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE coderr_http_request_duration_seconds histogram', body)
+        self.assertIn('coderr_http_requests_total{endpoint="offers-list",method="GET",status="200"} 1', body)
+        self.assertIn('coderr_http_request_duration_seconds_bucket{endpoint="offers-list",le="+Inf"} 1', body)
+        self.assertIn('coderr_http_request_duration_seconds_count{endpoint="offers-list"} 1', body)
+        self.assertIn('coderr_db_queries_total{endpoint="offers-list"}', body)
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.1'])
+    def test_metrics_endpoint_restricted(self):
+        """Clients outside METRICS_ALLOWED_IPS are refused."""
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    async def test_records_async_requests(self):
+        """Under ASGI the middleware awaits the view and records it like a sync request."""
+        async def view(request):
+            request.resolver_match = resolve(reverse('base-info'))
+            return HttpResponse(b'{}', content_type='application/json')
+
+        middleware = MetricsMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(RequestFactory().get('/api/base-info/'))
+        self.assertEqual(registry.endpoints['base-info'].requests, {('GET', 200): 1})
+        self.assertEqual(registry.endpoints['base-info'].response_bytes, 2)
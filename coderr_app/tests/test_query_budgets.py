@@ -0,0 +1,133 @@
+import os
+import traceback
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order, Review
+
+User = get_user_model()
+
+N = 4
+
+# Maximum queries per request, independent of the number of rows.
+BUDGETS = {
+    'offers-list': 3,
+    'offers-detail': 2,
+    'offerdetails-detail': 1,
+    'orders-list': 1,
+    'orders-detail': 1,
+    'reviews-list': 1,
+    'reviews-detail': 1,
+    'userprofile-detail': 1,
+    'userprofile-business-list': 1,
+    'userprofile-customer-list': 1,
+    'order-count': 2,
+    'completed-order-count': 2,
+    'base-info': 3,
+}
+
+
+class QueryRecorder:
+    """
+    Records executed SQL together with the project frames that issued it.
+    """
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        origin = [
+            frame for frame in traceback.extract_stack()[:-1]
+            if frame.filename.startswith(str(settings.BASE_DIR))
+            and 'site-packages' not in frame.filename
+            and frame.filename != __file__
+        ]
+        self.queries.append((sql, origin))
+        return execute(sql, params, many, context)
+
+    def report(self):
+        lines = []
+        for number, (sql, origin) in enumerate(self.queries, 1):
+            lines.append(f'{number}. {sql}')
+            for frame in origin[-3:]:
+                lines.append(f'     {os.path.relpath(frame.filename, settings.BASE_DIR)}:{frame.lineno} in {frame.name}')
+        return '\n'.join(lines)
+
+
+class QueryBudgetTest(APITestCase):
+    """
+    Every endpoint must issue a constant number of queries, within its budget,
+    whether the database holds N or 10N rows, on the compiled and the
+    DRF serializer path.
+    """
+    def seed(self, count):
+        call_command(
+            'generate_data', business=count, customers=count, offers_per_business=1,
+            orders=count * 3, reviews=count * 2, stdout=StringIO()
+        )
+
+    def setUp(self):
+        self.seed(N)
+        order = Order.objects.order_by('pk').first()
+        self.business = User.objects.get(pk=order.business_user)
+        self.client.force_authenticate(user=self.business)
+        self.urls = {
+            'offers-list': reverse('offers-list'),
+            'offers-detail': reverse('offers-detail', kwargs={'pk': Offer.objects.values_list('pk', flat=True).first()}),
+            'offerdetails-detail': reverse(
+                'offerdetails-detail', kwargs={'pk': OfferDetail.objects.values_list('pk', flat=True).first()}
+            ),
+            'orders-list': reverse('orders-list'),
+            'orders-detail': reverse('orders-detail', kwargs={'pk': order.pk}),
+            'reviews-list': reverse('reviews-list'),
+            'reviews-detail': reverse('reviews-detail', kwargs={'pk': Review.objects.values_list('pk', flat=True).first()}),
+            'userprofile-detail': reverse('userprofile-detail', kwargs={'pk': self.business.pk}),
+            'userprofile-business-list': reverse('userprofile-business-list'),
+            'userprofile-customer-list': reverse('userprofile-customer-list'),
+            'order-count': reverse('order-count', args=[self.business.pk]),
+            'completed-order-count': reverse('completed-order-count', args=[self.business.pk]),
+            'base-info': reverse('base-info'),
+        }
+
+    def measure(self, name, compiled):
+        cache.clear()
+        recorder = QueryRecorder()
+        with override_settings(COMPILED_READ_SERIALIZERS=compiled), connection.execute_wrapper(recorder):
+            response = self.client.get(self.urls[name])
+        self.assertEqual(response.status_code, 200, f'{name}: {response.status_code}')
+        return recorder
+
+    def measure_all(self):
+        return {(name, compiled): self.measure(name, compiled) for name in BUDGETS for compiled in (True, False)}
+
+    def test_every_endpoint_is_covered(self):
+        """The budget table lists every endpoint measured here."""
+        self.assertEqual(set(BUDGETS), set(self.urls))
+
+    def test_query_counts_are_constant_and_within_budget(self):
+        """Query counts do not grow from N to 10N rows and stay within the budget."""
+        small = self.measure_all()
+        self.seed(N * 9)
+        large = self.measure_all()
+
+        for (name, compiled), recorder in large.items():
+            budget = BUDGETS[name]
+            with self.subTest(endpoint=name, compiled=compiled):
+                count_small, count_large = len(small[name, compiled].queries), len(recorder.queries)
+                self.assertEqual(
+                    count_small, count_large,
+                    f'{name} issues {count_small} queries for N={N} but {count_large} for 10N:\n'
+                    f'{recorder.report()}'
+                )
+                self.assertLessEqual(
+                    count_large, budget,
+                    f'{name} exceeds its budget of {budget} queries:\n{recorder.report()}'
+                )
@@ -0,0 +1,71 @@
+import datetime
+import uuid
+from decimal import Decimal
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from coderr_app.renderers import FastJSONRenderer, orjson
+
+DATA = {
+    'count': 2,
+    'results': [
+        {
+            'id': 1,
+            'title': 'Webdesign für Bäckereien',
+            'price': Decimal('150.00'),
+            'rating': Decimal('4.5'),
+            'features': ['Logo', 'Visitenkarte'],
+            'created_at': datetime.datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2025, 1, 2),
+            'naive': datetime.datetime(2025, 1, 2, 3, 4, 5),
+            'detail': gettext_lazy('Not found.'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'separator': 'Zeile\u2028Absatz\u2029',
+            'empty': None,
+            'flag': True,
+            'ratio': 0.1,
+        },
+        {'id': 2, 'price': Decimal('99999999.99'), 'big': 2 ** 70, 'local': timezone.now().astimezone(
+            datetime.timezone(datetime.timedelta(hours=2)))},
+    ],
+    5: 'non-string key',
+}
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """
+    FastJSONRenderer must produce the same bytes as DRF's JSONRenderer.
+    """
+    def render_both(self, data, use_orjson, media_type=None, context=None):
+        renderer = FastJSONRenderer()
+        renderer.use_orjson = use_orjson
+        return (
+            renderer.render(data, media_type, context),
+            JSONRenderer().render(data, media_type, context),
+        )
+
+    def test_stdlib_output_matches_json_renderer(self):
+        """The stdlib fallback renders byte-identical JSON."""
+        fast, reference = self.render_both(DATA, use_orjson=False)
+        self.assertEqual(fast, reference)
+
+    @skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_output_matches_json_renderer(self):
+        """The orjson path renders byte-identical JSON, including Decimal, datetime and lazy strings."""
+        fast, reference = self.render_both(DATA, use_orjson=True)
+        self.assertEqual(fast, reference)
+
+    def test_indent_is_delegated(self):
+        """Indented rendering falls back to JSONRenderer."""
+        for use_orjson in (False, orjson is not None):
+            fast, reference = self.render_both(DATA, use_orjson, 'application/json; indent=2')
+            self.assertEqual(fast, reference)
+            self.assertIn(b'\n  ', fast)
+
+    def test_none_renders_empty(self):
+        """None renders as an empty body like JSONRenderer."""
+        self.assertEqual(FastJSONRenderer().render(None), b'')
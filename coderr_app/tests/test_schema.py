@@ -0,0 +1,76 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+import yaml
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from coderr_app.schema import reset_schema
+
+
+class SchemaDriftTest(APITestCase):
+    def test_committed_schema_matches_code(self):
+        """schema.yaml is regenerated whenever the API changes."""
+        call_command('check_schema', stdout=StringIO(), stderr=StringIO())
+
+    def test_drift_is_reported(self):
+        """A stale schema file makes the check fail."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'schema.yaml')
+        with open(path, 'w', encoding='utf-8') as schema_file:
+            schema_file.write('openapi: 3.0.3\ninfo:\n  title: Coderr API\npaths: {}\n')
+        with self.assertRaises(CommandError):
+            call_command('check_schema', file=path, stdout=StringIO(), stderr=StringIO())
+
+
+class SchemaViewTest(APITestCase):
+    def setUp(self):
+        reset_schema()
+        self.addCleanup(reset_schema)
+        self.url = reverse('schema')
+
+    def test_serves_committed_yaml(self):
+        """The schema is served from schema.yaml without introspecting views."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/vnd.oai.openapi'))
+        schema = yaml.safe_load(response.content)
+        self.assertIn('/api/offers/', schema['paths'])
+        self.assertIn('ETag', response)
+
+    def test_json_format(self):
+        """?format=json returns the same document as JSON."""
+        yaml_schema = yaml.safe_load(self.client.get(self.url).content)
+        response = self.client.get(self.url, {'format': 'json'})
+        self.assertEqual(json.loads(response.content), yaml_schema)
+        self.assertNotEqual(response['ETag'], self.client.get(self.url)['ETag'])
+
+    def test_not_modified(self):
+        """A matching If-None-Match is answered with 304."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_gzip(self):
+        """Clients accepting gzip get the precompressed body."""
+        plain = self.client.get(self.url).content
+        response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain)
+
+    @override_settings(SCHEMA_SOURCE='generate')
+    def test_generate_matches_file(self):
+        """Generating at startup yields the committed document."""
+        generated = yaml.safe_load(self.client.get(self.url).content)
+        with override_settings(SCHEMA_SOURCE='file'):
+            reset_schema()
+            committed = yaml.safe_load(self.client.get(self.url).content)
+        self.assertEqual(generated, committed)
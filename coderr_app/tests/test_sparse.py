@@ -0,0 +1,128 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order, Review
+
+User = get_user_model()
+
+
+class SparseFieldsetTest(APITestCase):
+    """
+    Test cases for ?fields= and ?omit= on the list and detail endpoints.
+    """
+    def setUp(self):
+        call_command(
+            'generate_data', business=3, customers=4, offers_per_business=3, orders=20, reviews=6,
+            stdout=StringIO()
+        )
+        self.business = User.objects.get(pk=Order.objects.order_by('pk').first().business_user)
+        self.client.force_authenticate(user=self.business)
+        cache.clear()
+
+    def fetch(self, url, compiled=True):
+        cache.clear()
+        with override_settings(COMPILED_READ_SERIALIZERS=compiled):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.json(), [query['sql'] for query in queries.captured_queries]
+
+    def results(self, data):
+        return data['results'] if isinstance(data, dict) and 'results' in data else data
+
+    def test_fields_match_full_response(self):
+        """Selected fields carry the same values as the full response, on both list paths."""
+        cases = [
+            (reverse('offers-list'), ['id', 'title', 'min_price', 'image']),
+            (reverse('offers-list') + '?ordering=min_price', ['title', 'details']),
+            (reverse('orders-list'), ['id', 'status', 'price']),
+            (reverse('reviews-list'), ['rating', 'business_user']),
+            (reverse('userprofile-business-list'), ['user', 'username', 'location']),
+            (reverse('userprofile-customer-list') + '?page_size=2', ['username', 'file']),
+        ]
+        for url, fields in cases:
+            full = self.results(self.fetch(url)[0])
+            separator = '&' if '?' in url else '?'
+            for compiled in (True, False):
+                with self.subTest(url=url, compiled=compiled):
+                    sparse = self.results(self.fetch(f"{url}{separator}fields={','.join(fields)}", compiled)[0])
+                    self.assertEqual(sparse, [{name: item[name] for name in fields} for item in full])
+
+    def test_omit(self):
+        full = self.results(self.fetch(reverse('offers-list'))[0])
+        sparse = self.results(self.fetch(reverse('offers-list') + '?omit=user_details,details,description')[0])
+        self.assertEqual(sparse, [
+            {name: value for name, value in item.items() if name not in ('user_details', 'details', 'description')}
+            for item in full
+        ])
+
+    def test_unneeded_relations_are_skipped(self):
+        """Without details/user_details neither the details nor the user table are queried."""
+        url = reverse('offers-list') + '?fields=id,title,min_price,image'
+        for compiled in (True, False):
+            with self.subTest(compiled=compiled):
+                data, queries = self.fetch(url, compiled)
+                detail_table = OfferDetail._meta.db_table
+                self.assertFalse([sql for sql in queries if f'"{detail_table}"' in sql])
+                offer_queries = [sql for sql in queries if sql.startswith('SELECT') and '"offers_app_offer"."title"' in sql]
+                self.assertTrue(offer_queries)
+                for sql in offer_queries:
+                    self.assertNotIn('"description"', sql)
+                    self.assertNotIn('"auth_user"', sql)
+
+    def test_details_without_id(self):
+        """The primary key used to attach the detail links is not returned unless selected."""
+        data, _ = self.fetch(reverse('offers-list') + '?fields=details')
+        self.assertEqual(set(data['results'][0]), {'details'})
+        self.assertTrue(data['results'][0]['details'])
+
+    def test_retrieve(self):
+        offer = Offer.objects.order_by('pk').first()
+        url = reverse('offers-detail', kwargs={'pk': offer.pk})
+        full, _ = self.fetch(url)
+        sparse, queries = self.fetch(url + '?fields=id,title,min_price')
+        self.assertEqual(sparse, {'id': full['id'], 'title': full['title'], 'min_price': full['min_price']})
+        self.assertFalse([sql for sql in queries if f'"{OfferDetail._meta.db_table}"' in sql])
+        response = self.client.get(url + '?fields=user_details')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('user_details', response.json()['fields'])
+
+        profile_url = reverse('userprofile-detail', kwargs={'pk': self.business.pk})
+        full, _ = self.fetch(profile_url)
+        sparse, _ = self.fetch(profile_url + '?omit=file,file_variants,description')
+        self.assertEqual(sparse, {
+            name: value for name, value in full.items() if name not in ('file', 'file_variants', 'description')
+        })
+
+    def test_invalid_fields(self):
+        for query in ('?fields=id,password', '?omit=secret', '?fields=', '?fields=id&omit=id'):
+            with self.subTest(query=query):
+                response = self.client.get(reverse('reviews-list') + query)
+                self.assertEqual(response.status_code, 400)
+        self.assertIn('password', self.client.get(reverse('offers-list') + '?fields=password').json()['fields'])
+
+    def test_writes_ignore_fields(self):
+        """POST responses are not affected by the query parameters."""
+        review = Review.objects.filter(reviewer__profile__type='customer').first()
+        self.client.force_authenticate(user=review.reviewer)
+        response = self.client.patch(
+            reverse('reviews-detail', kwargs={'pk': review.pk}) + '?fields=id',
+            {'rating': 4, 'description': 'Gut'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('rating', response.json())
+
+    def test_cached_responses_vary_by_fields(self):
+        url = reverse('offers-list')
+        self.assertIn('description', self.results(self.client.get(url).json())[0])
+        self.assertEqual(set(self.results(self.client.get(url + '?fields=title').json())[0]), {'title'})
+        self.assertIn('description', self.results(self.client.get(url).json())[0])
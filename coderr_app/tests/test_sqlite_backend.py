@@ -0,0 +1,46 @@
+import os
+import sqlite3
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from coderr_app.sqlite_backend.base import apply_pragmas
+
+
+class SqliteBackendTest(TestCase):
+    """
+    Test cases for the tuned SQLite backend.
+    """
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_to_connection(self):
+        """New connections get the configured pragmas."""
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('cache_size'), -20000)
+        self.assertEqual(self.pragma('temp_store'), 2)
+
+
+class ApplyPragmasTest(SimpleTestCase):
+    def test_wal_on_file_database(self):
+        """A file database switches to WAL."""
+        with tempfile.TemporaryDirectory() as directory:
+            conn = sqlite3.connect(os.path.join(directory, 'bench.sqlite3'))
+            apply_pragmas(conn, {'journal_mode': 'WAL', 'mmap_size': 1048576})
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(conn.execute('PRAGMA mmap_size').fetchone()[0], 1048576)
+            conn.close()
+
+    def test_rejects_unknown_pragmas_and_values(self):
+        """Only known pragmas with plain values are executed."""
+        conn = sqlite3.connect(':memory:')
+        with self.assertRaises(ImproperlyConfigured):
+            apply_pragmas(conn, {'writable_schema': 'ON'})
+        with self.assertRaises(ImproperlyConfigured):
+            apply_pragmas(conn, {'synchronous': 'OFF; DROP TABLE x'})
+        conn.close()
@@ -0,0 +1,131 @@
+import os
+import tempfile
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from coderr_app.middleware import RateLimitHeadersMiddleware
+from coderr_app.throttling import AnonTokenBucketThrottle, ScopedTokenBucketThrottle, consume
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+clock = Clock()
+
+
+class TestAnonThrottle(AnonTokenBucketThrottle):
+    THROTTLE_RATES = {'anon': '3/minute'}
+    timer = clock
+
+
+class TestScopedThrottle(ScopedTokenBucketThrottle):
+    THROTTLE_RATES = {'contact': '2/second'}
+    timer = clock
+
+
+class AnonView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = [TestAnonThrottle, TestScopedThrottle]
+
+    def get(self, request):
+        return Response({'ok': True})
+
+
+class ContactView(AnonView):
+    throttle_scope = 'contact'
+
+
+class TokenBucketThrottleTest(SimpleTestCase):
+    """
+    Test cases for the token-bucket throttles on both stores.
+    """
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        cache.clear()
+        clock.now = 1000.0
+
+    def stores(self):
+        yield 'cache', override_settings(THROTTLE_STORE='cache')
+        yield 'sqlite', override_settings(
+            THROTTLE_STORE='sqlite', THROTTLE_SQLITE_PATH=os.path.join(self.tmpdir.name, 'throttle.sqlite3')
+        )
+
+    def request(self, view, ip='10.0.0.1'):
+        middleware = RateLimitHeadersMiddleware(view.as_view())
+        return middleware(self.factory.get('/', REMOTE_ADDR=ip))
+
+    def test_consume_refills_linearly(self):
+        """A drained bucket regains tokens in proportion to the elapsed time."""
+        self.assertEqual(consume(None, 0, 3, 1), (True, 2))
+        self.assertEqual(consume((0.5, 0), 0, 3, 1), (False, 0.5))
+        self.assertEqual(consume((0, 0), 2, 3, 1), (True, 1))
+        self.assertEqual(consume((0, 0), 100, 3, 1), (True, 2))
+
+    def test_bucket_limits_and_refills(self):
+        """The anon rate allows a burst of num_requests, then one per refill interval."""
+        for name, settings in self.stores():
+            with self.subTest(store=name), settings:
+                clock.now += 3600
+                statuses = [self.request(AnonView).status_code for _ in range(4)]
+                self.assertEqual(statuses, [200, 200, 200, 429])
+
+                clock.now += 20
+                self.assertEqual(self.request(AnonView).status_code, 200)
+                self.assertEqual(self.request(AnonView).status_code, 429)
+                self.assertEqual(self.request(AnonView, ip='10.0.0.2').status_code, 200)
+
+    def test_remaining_budget_headers(self):
+        """Responses carry the budget of the most restrictive scope."""
+        for name, settings in self.stores():
+            with self.subTest(store=name), settings:
+                clock.now += 3600
+                response = self.request(AnonView)
+                self.assertEqual(response['X-RateLimit-Limit'], '3')
+                self.assertEqual(response['X-RateLimit-Remaining'], '2')
+                self.assertEqual(response['X-RateLimit-Reset'], '20')
+
+                response = self.request(ContactView)
+                self.assertEqual(response['X-RateLimit-Limit'], '3')
+                self.assertEqual(response['X-RateLimit-Remaining'], '1')
+
+                self.assertEqual(self.request(AnonView)['X-RateLimit-Remaining'], '0')
+                response = self.request(AnonView)
+                self.assertEqual(response.status_code, 429)
+                self.assertEqual(response['X-RateLimit-Remaining'], '0')
+                self.assertEqual(response['Retry-After'], '20')
+
+    def test_scoped_rate(self):
+        """Views with a throttle_scope use the matching DEFAULT_THROTTLE_RATES entry."""
+        with override_settings(THROTTLE_STORE='cache'):
+            statuses = []
+            for ip in ('10.0.1.1', '10.0.1.2', '10.0.1.3'):
+                statuses.append(self.request(ContactView, ip=ip).status_code)
+            self.assertEqual(statuses, [200, 200, 200])
+            clock.now += 3600
+            statuses = [self.request(ContactView, ip='10.0.1.4').status_code for _ in range(3)]
+            self.assertEqual(statuses, [200, 200, 429])
+
+    async def test_headers_under_asgi(self):
+        """With an async view the middleware awaits it and still adds the headers."""
+        async def view(request):
+            request.rate_limit = {'limit': 3, 'remaining': 1, 'reset': 20}
+            return HttpResponse()
+
+        middleware = RateLimitHeadersMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(self.factory.get('/'))
+        self.assertEqual(response['X-RateLimit-Remaining'], '1')
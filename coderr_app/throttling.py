@@ -0,0 +1,233 @@
+"""
+Token-bucket throttles.
+
+Each client has one bucket per scope holding (tokens, updated). A bucket holds
+at most `num_requests` tokens and refills at num_requests / duration tokens per
+second, so the DEFAULT_THROTTLE_RATES strings keep their meaning while the
+state per client stays constant in size.
+
+THROTTLE_STORE selects where buckets live:
+
+- 'sqlite': a local SQLite file (THROTTLE_SQLITE_PATH) shared by all worker
+  processes on the host; every check is one short IMMEDIATE transaction.
+- 'cache': the cache alias THROTTLE_CACHE_ALIAS; only shared between workers
+  when that cache is (Redis/Memcached/file).
+
+A full bucket is the same as no bucket, so entries expire once refilled.
+THROTTLE_ENABLED = False switches throttling off (e.g. for benchmarks).
+"""
+import math
+import sqlite3
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def refill(tokens, updated, now, capacity, rate):
+    return min(capacity, tokens + max(now - updated, 0) * rate)
+
+
+def consume(state, now, capacity, rate):
+    """
+    Takes one token from the bucket state (tokens, updated) or None for a full bucket.
+    Returns (allowed, tokens_left).
+    """
+    tokens = capacity if state is None else refill(state[0], state[1], now, capacity, rate)
+    if tokens >= 1:
+        return True, tokens - 1
+    return False, tokens
+
+
+class CacheBucketStore:
+    """
+    Buckets in a Django cache. Concurrent requests of one client may race on
+    the read-modify-write, which can let a request through early but never
+    grows the state.
+    """
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+    def consume(self, key, now, capacity, rate):
+        allowed, tokens = consume(self.cache.get(key), now, capacity, rate)
+        self.cache.set(key, (tokens, now), math.ceil((capacity - tokens) / rate) or 1)
+        return allowed, tokens
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in a local SQLite file. BEGIN IMMEDIATE serializes the
+    read-modify-write across threads and processes.
+    """
+    purge_interval = 1000
+
+    def __init__(self, path=None):
+        self.path = str(path or getattr(settings, 'THROTTLE_SQLITE_PATH'))
+        self.local = threading.local()
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_bucket ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS throttle_bucket_full_at ON throttle_bucket (full_at)')
+            self.local.conn = conn
+            self.local.calls = 0
+        return conn
+
+    def consume(self, key, now, capacity, rate):
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM throttle_bucket WHERE key = ?', (key,)).fetchone()
+            allowed, tokens = consume(row, now, capacity, rate)
+            conn.execute(
+                'INSERT INTO throttle_bucket (key, tokens, updated, full_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, '
+                'updated = excluded.updated, full_at = excluded.full_at',
+                (key, tokens, now, now + (capacity - tokens) / rate)
+            )
+            self.local.calls += 1
+            if self.local.calls % self.purge_interval == 0:
+                conn.execute('DELETE FROM throttle_bucket WHERE full_at < ?', (now,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, tokens
+
+
+STORES = {
+    'cache': CacheBucketStore,
+    'sqlite': SQLiteBucketStore,
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Returns the shared bucket store selected by THROTTLE_STORE.
+    """
+    name = getattr(settings, 'THROTTLE_STORE', 'sqlite')
+    store = _stores.get(name)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(name)
+            if store is None:
+                store_class = STORES[name] if name in STORES else import_string(name)
+                store = _stores[name] = store_class()
+    return store
+
+
+@receiver(setting_changed)
+def reset_stores(setting, **kwargs):
+    if setting.startswith('THROTTLE_') or setting == 'CACHES':
+        _stores.clear()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with a token bucket instead of a request history.
+    Records the remaining budget on the request for RateLimitHeadersMiddleware.
+    """
+    def allow_request(self, request, view):
+        if self.rate is None or not getattr(settings, 'THROTTLE_ENABLED', True):
+            return True
+        if getattr(request, 'batch_parent', None) is not None:
+            # Sub-requests of /api/batch/ were throttled with the batch request.
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        capacity = self.num_requests
+        rate = self.num_requests / self.duration
+        allowed, self.tokens = get_store().consume(self.key, self.now, capacity, rate)
+        self.record_budget(request, capacity, rate)
+        return allowed
+
+    def record_budget(self, request, capacity, rate):
+        budget = {
+            'limit': capacity,
+            'remaining': math.floor(self.tokens),
+            'reset': math.ceil((capacity - self.tokens) / rate),
+        }
+        http_request = getattr(request, '_request', request)
+        current = getattr(http_request, 'rate_limit', None)
+        if current is None or budget['remaining'] < current['remaining']:
+            http_request.rate_limit = budget
+
+    def wait(self):
+        return max((1 - self.tokens) * self.duration / self.num_requests, 0)
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Limits anonymous clients by IP address ('anon' rate).
+    """
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Limits authenticated users by id and anonymous clients by IP address ('user' rate).
+    """
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': ident
+        }
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Limits requests per view.throttle_scope, e.g. 'contact'.
+    """
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': ident
+        }
@@ -15,9 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+from coderr_app.batch import BatchView
+from coderr_app.media import serve_media
+from coderr_app.metrics import metrics_view
+from coderr_app.schema import schema_view
 from user_auth_app.views import redirect_to_schema
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
@@ -25,14 +28,22 @@ urlpatterns = [
     path('', redirect_to_schema, name='root'),
     path('admin/', admin.site.urls),
     path('api/', redirect_to_schema, name='root'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
     path('api/', include('user_auth_app.api.urls')),
     path('api/', include('offers_app.api.urls')),
     path('api/', include('orders_app.api.urls')),
     path('api-auth', include('rest_framework.urls')),
+    path('metrics', metrics_view, name='metrics'),
     
     ## API Schema & Doku
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path(
+        'api/schema/',
+        SpectacularAPIView.as_view() if settings.SCHEMA_SOURCE == 'runtime' else schema_view,
+        name='schema'
+    ),
     path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+urlpatterns += [
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+]
\ No newline at end of file
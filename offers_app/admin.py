@@ -18,6 +18,7 @@ class OfferAdmin(admin.ModelAdmin):
     search_fields = ('title', 'description')
     list_filter = ('created_at', 'updated_at', 'user')
     ordering = ('-updated_at',)
+    readonly_fields = ('min_price', 'min_delivery_time')  # Derived from the details
     inlines = [OfferDetailInline]  # Include details inline
 
 class OfferDetailAdmin(admin.ModelAdmin):
@@ -0,0 +1,136 @@
+"""
+Maintenance of the denormalized Offer.min_price / Offer.min_delivery_time.
+
+Both are the minimum over the offer's details. They are recomputed in the
+database with one set-based UPDATE ... FROM (SELECT ... GROUP BY offer_id)
+per id range, instead of loading offers and details into Python. OfferDetail
+save/delete signals call recompute_offers() for the parent offer; inside
+deferred_aggregates() the offers are collected and recomputed once at the end.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.db import connections, router
+from django.db.models import Max, Min
+
+from coderr_app.cache import collection_tag, instance_tag, invalidate_tags
+from offers_app.models import Offer, OfferDetail
+
+_deferred = ContextVar('offer_aggregates_deferred', default=None)
+
+
+def _tables(connection):
+    quote = connection.ops.quote_name
+    return quote(Offer._meta.db_table), quote(OfferDetail._meta.db_table)
+
+
+def _distinct(connection):
+    # NULL-safe inequality.
+    return 'IS NOT' if connection.vendor == 'sqlite' else 'IS DISTINCT FROM'
+
+
+def id_bounds(using=None):
+    bounds = Offer.objects.using(using).aggregate(low=Min('pk'), high=Max('pk'))
+    return bounds['low'], bounds['high']
+
+
+def find_drift(low, high, using=None):
+    """
+    Returns (offer_id, stored, expected) for every offer in [low, high] whose
+    stored aggregates differ from its details; the values are
+    (min_price, min_delivery_time) tuples.
+    """
+    stored = Offer.objects.using(using).filter(pk__range=(low, high)).order_by('pk').values_list(
+        'pk', 'min_price', 'min_delivery_time'
+    )
+    exponent = Decimal(10) ** -Offer._meta.get_field('min_price').decimal_places
+    expected = {
+        offer_id: (price if price is None else price.quantize(exponent), delivery)
+        for offer_id, price, delivery in OfferDetail.objects.using(using)
+        .filter(offer_id__gte=low, offer_id__lte=high)
+        .order_by()
+        .values('offer_id')
+        .annotate(price=Min('price'), delivery=Min('delivery_time_in_days'))
+        .values_list('offer_id', 'price', 'delivery')
+    }
+    drift = []
+    for pk, price, delivery in stored.iterator():
+        target = expected.get(pk, (None, None))
+        if (price, delivery) != target:
+            drift.append((pk, (price, delivery), target))
+    return drift
+
+
+def recompute_range(low, high, using=None):
+    """
+    Recomputes the aggregates of all offers with ids in [low, high] using two
+    set-based UPDATEs, touching only rows whose values change.
+    Returns the number of updated rows.
+    """
+    using = using or router.db_for_write(Offer)
+    connection = connections[using]
+    offer_table, detail_table = _tables(connection)
+    distinct = _distinct(connection)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {offer_table} SET min_price = agg.min_price, min_delivery_time = agg.min_delivery_time '
+            f'FROM (SELECT offer_id, MIN(price) AS min_price, MIN(delivery_time_in_days) AS min_delivery_time '
+            f'FROM {detail_table} WHERE offer_id BETWEEN %s AND %s GROUP BY offer_id) AS agg '
+            f'WHERE {offer_table}.id = agg.offer_id '
+            f'AND ({offer_table}.min_price {distinct} agg.min_price '
+            f'OR {offer_table}.min_delivery_time {distinct} agg.min_delivery_time)',
+            [low, high],
+        )
+        updated = cursor.rowcount
+        cursor.execute(
+            f'UPDATE {offer_table} SET min_price = NULL, min_delivery_time = NULL '
+            f'WHERE id BETWEEN %s AND %s '
+            f'AND (min_price IS NOT NULL OR min_delivery_time IS NOT NULL) '
+            f'AND NOT EXISTS (SELECT 1 FROM {detail_table} WHERE offer_id = {offer_table}.id)',
+            [low, high],
+        )
+        updated += cursor.rowcount
+    return updated
+
+
+def invalidate_offers(offer_ids):
+    """
+    Raw UPDATEs bypass the model signals, so the response cache is invalidated here.
+    """
+    if offer_ids:
+        invalidate_tags(collection_tag(Offer), *(instance_tag(Offer, pk) for pk in offer_ids))
+
+
+def recompute_offers(offer_ids):
+    """
+    Recomputes the aggregates of the given offers, or records them for the
+    enclosing deferred_aggregates() block.
+    """
+    pending = _deferred.get()
+    if pending is not None:
+        pending.update(offer_ids)
+        return
+    updated = 0
+    for pk in set(offer_ids):
+        updated += recompute_range(pk, pk)
+    if updated:
+        invalidate_offers(offer_ids)
+
+
+@contextmanager
+def deferred_aggregates():
+    """
+    Collects the offers touched by detail saves/deletes in the block and
+    recomputes each of them once on exit.
+    """
+    if _deferred.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _deferred.set(pending)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+    recompute_offers(pending)
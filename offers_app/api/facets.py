@@ -0,0 +1,123 @@
+"""
+Facet counts for the offer list (?facets=price,delivery,creator).
+
+Price and delivery buckets are conditional COUNTs in one aggregate over the
+filtered queryset. The creator facet is a second query that groups by user
+and leaves ordering and the limit to the database.
+
+- price: offers per min_price range, lower bound inclusive, upper exclusive.
+- delivery: offers deliverable within N days (like ?max_delivery_time=N).
+- creator: the OFFER_FACET_CREATOR_LIMIT business users with the most offers.
+"""
+import hashlib
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, Q
+from rest_framework.exceptions import ValidationError
+
+from coderr_app.cache import collection_tag, get_entry, set_entry, tag_versions
+from offers_app.models import Offer
+
+FACETS = ('price', 'delivery', 'creator')
+
+
+def requested_facets(request):
+    """
+    Returns the facet names of ?facets=, in order and without duplicates.
+    """
+    raw = request.query_params.get('facets', '')
+    names = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise ValidationError({'facets': f"Unbekannte Facetten: {', '.join(unknown)}. Erlaubt: {', '.join(FACETS)}."})
+    return names
+
+
+def price_ranges():
+    edges = getattr(settings, 'OFFER_FACET_PRICE_EDGES', [50, 100, 250, 500, 1000])
+    return list(zip([None, *edges], [*edges, None]))
+
+
+def delivery_days():
+    return getattr(settings, 'OFFER_FACET_DELIVERY_DAYS', [1, 3, 7, 14])
+
+
+def range_filter(field, low, high):
+    condition = Q(**{f'{field}__isnull': False})
+    if low is not None:
+        condition &= Q(**{f'{field}__gte': low})
+    if high is not None:
+        condition &= Q(**{f'{field}__lt': high})
+    return condition
+
+
+def compute_facets(queryset, names):
+    """
+    Returns {facet name: buckets} for the queryset.
+    """
+    queryset = queryset.order_by().prefetch_related(None)
+    counts = {}
+    if 'price' in names:
+        for index, (low, high) in enumerate(price_ranges()):
+            counts[f'price_{index}'] = Count('pk', filter=range_filter('min_price', low, high))
+    if 'delivery' in names:
+        for index, days in enumerate(delivery_days()):
+            counts[f'delivery_{index}'] = Count('pk', filter=Q(min_delivery_time__lte=days))
+
+    totals = queryset.aggregate(**counts) if counts else {}
+    creators = []
+    if 'creator' in names:
+        rows = (
+            queryset.values('user_id', 'user__username')
+            .annotate(facet_total=Count('pk'))
+            .order_by('-facet_total', 'user_id')[:getattr(settings, 'OFFER_FACET_CREATOR_LIMIT', 20)]
+        )
+        creators = [
+            {'id': row['user_id'], 'username': row['user__username'], 'count': row['facet_total']}
+            for row in rows
+        ]
+
+    facets = {}
+    for name in names:
+        if name == 'price':
+            facets[name] = [
+                {'min': low, 'max': high, 'count': totals[f'price_{index}']}
+                for index, (low, high) in enumerate(price_ranges())
+            ]
+        elif name == 'delivery':
+            facets[name] = [
+                {'max_days': days, 'count': totals[f'delivery_{index}']}
+                for index, days in enumerate(delivery_days())
+            ]
+        else:
+            facets[name] = creators
+    return facets
+
+
+def facets_cache_key(filterset, search, names):
+    """
+    Normalized filter values (as cleaned by the FilterSet), the search terms
+    and the facet names; page, page_size and ordering do not matter.
+    """
+    filterset.is_valid()
+    params = sorted(
+        (name, format(value.normalize(), 'f') if isinstance(value, Decimal) else str(value))
+        for name, value in filterset.form.cleaned_data.items()
+        if value is not None
+    )
+    parts = [repr(params), ' '.join(search.split()), ','.join(sorted(names))]
+    return 'offer-facets:' + hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def cached_facets(filterset, search, queryset, names):
+    """
+    Returns the facets from the response cache, computing them on a miss.
+    """
+    key = facets_cache_key(filterset, search, names)
+    facets = get_entry(key)
+    if facets is None:
+        versions = tag_versions([collection_tag(Offer)])
+        facets = compute_facets(queryset, names)
+        set_entry(key, facets, versions, getattr(settings, 'OFFER_FACET_CACHE_TIMEOUT', 300))
+    return facets
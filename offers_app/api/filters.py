@@ -1,13 +1,34 @@
 import django_filters
+from rest_framework.filters import OrderingFilter
 from offers_app.models import Offer
 
 class OfferFilter(django_filters.FilterSet):
     """
-    FilterSet for filtering offers based on creator, price, and delivery time.
+    FilterSet for filtering offers based on creator, price range, and delivery time range.
     """
     creator_id = django_filters.NumberFilter(field_name='user__id', lookup_expr='exact')
     min_price = django_filters.NumberFilter(field_name='min_price', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='min_price', lookup_expr='lte')
+    min_delivery_time = django_filters.NumberFilter(field_name='min_delivery_time', lookup_expr='gte')
     max_delivery_time = django_filters.NumberFilter(field_name='min_delivery_time', lookup_expr='lte')
     class Meta:
         model = Offer
-        fields = ['creator_id', 'min_price', 'max_delivery_time']
\ No newline at end of file
+        fields = ['creator_id', 'min_price', 'max_price', 'min_delivery_time', 'max_delivery_time']
+
+class OfferOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that also accepts ?ordering=popularity / -popularity: offers
+    by orders within the recent window, ties broken by all orders
+    (see offers_app.popularity).
+    """
+    aliases = {'popularity': ['recent_order_count', 'order_count']}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        expanded = []
+        for term in ordering:
+            prefix = '-' if term.startswith('-') else ''
+            expanded.extend(prefix + field for field in self.aliases.get(term.lstrip('-'), [term.lstrip('-')]))
+        return expanded
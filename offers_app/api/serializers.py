@@ -1,8 +1,11 @@
-from django.db import transaction, models
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.reverse import reverse
+from offers_app.aggregates import deferred_aggregates
 from offers_app.models import Offer, OfferDetail
 from user_auth_app.api.serializers import UserSerializer
+from coderr_app.images import ImageVariantsField, NormalizedImageField
+from coderr_app.sparse import SparseFieldsMixin
 
 
 class OfferDetailSerializer(serializers.ModelSerializer):
@@ -14,7 +17,7 @@ class OfferDetailSerializer(serializers.ModelSerializer):
         model = OfferDetail
         fields = ['id', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type']
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Offer model.
     The field 'details' is used for both input and output.
@@ -24,11 +27,13 @@ class OfferSerializer(serializers.ModelSerializer):
     details = OfferDetailSerializer(many=True)
     user_details = UserSerializer(source='user', read_only=True)
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    image = NormalizedImageField(required=False, allow_null=True)
+    image_variants = ImageVariantsField()
     min_price = serializers.DecimalField(read_only=True, max_digits=10, decimal_places=2, coerce_to_string=False)
     min_delivery_time = serializers.IntegerField(read_only=True)
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
         
     def to_representation(self, instance):
         """
@@ -41,33 +46,16 @@ class OfferSerializer(serializers.ModelSerializer):
         view = self.context.get('view')
         if request:
             if request.method == 'GET':
-                if view and getattr(view, 'action', None) == 'retrieve':
-                    representation = {
-                        'id': representation.get('id'),
-                        'user': representation.get('user'),
-                        'title': representation.get('title'),
-                        'image': representation.get('image'),
-                        'description': representation.get('description'),
-                        'created_at': representation.get('created_at'),
-                        'updated_at': representation.get('updated_at'),
-                        'details': [
-                            {
-                                'id': detail.id,
-                                'url': reverse('offerdetails-detail', kwargs={'pk': detail.id}, request=request)
-                            }
-                            for detail in instance.details.all()
-                        ],
-                        'min_price': representation.get('min_price'),
-                        'min_delivery_time': representation.get('min_delivery_time')
-                    }
-                else:
+                if 'details' in representation:
                     representation['details'] = [
-                    {
-                        'id': detail.id,
-                        'url': reverse('offerdetails-detail', kwargs={'pk': detail.id}, request=request)
-                    }
-                    for detail in instance.details.all()
-                ]
+                        {
+                            'id': detail.id,
+                            'url': reverse('offerdetails-detail', kwargs={'pk': detail.id}, request=request)
+                        }
+                        for detail in instance.details.all()
+                    ]
+                if view and getattr(view, 'action', None) == 'retrieve':
+                    representation.pop('user_details', None)
             elif request.method == 'POST' or request.method == 'PATCH':
                 representation = {
                     'id': representation.get('id'),
@@ -106,16 +94,11 @@ class OfferSerializer(serializers.ModelSerializer):
         """
         details_data = validated_data.pop('details')
         with transaction.atomic():
-            offer = Offer.objects.create(**validated_data)
-            for detail_data in details_data:
-                OfferDetail.objects.create(offer=offer, **detail_data)
-            agg = offer.details.aggregate(
-                min_price=models.Min('price'),
-                min_delivery_time=models.Min('delivery_time_in_days')
-            )
-            offer.min_price = agg['min_price']
-            offer.min_delivery_time = agg['min_delivery_time']
-            offer.save(update_fields=['min_price', 'min_delivery_time'])
+            with deferred_aggregates():
+                offer = Offer.objects.create(**validated_data)
+                for detail_data in details_data:
+                    OfferDetail.objects.create(offer=offer, **detail_data)
+            offer.refresh_from_db(fields=['min_price', 'min_delivery_time'])
             return offer
     
     def update(self, instance, validated_data):
@@ -128,25 +111,20 @@ class OfferSerializer(serializers.ModelSerializer):
         
         details_data = validated_data.pop('details', None)
         with transaction.atomic():
-            instance = super().update(instance, validated_data)
-            if details_data is not None:
-                for detail_data in details_data:
-                    offer_type = detail_data['offer_type']
-                    try:
-                        detail = instance.details.get(offer_type=offer_type)
-                        for key, value in detail_data.items():
-                            setattr(detail, key, value)
-                        detail.save()
-                    except OfferDetail.DoesNotExist:
-                        raise serializers.ValidationError(
-                            f"Detail mit Typ {offer_type} existiert nicht"
-                        )
-            agg = instance.details.aggregate(
-                min_price=models.Min('price'),
-                min_delivery_time=models.Min('delivery_time_in_days')
-            )
-            instance.min_price = agg['min_price']
-            instance.min_delivery_time = agg['min_delivery_time']
-            instance.save(update_fields=['min_price', 'min_delivery_time'])
+            with deferred_aggregates():
+                instance = super().update(instance, validated_data)
+                if details_data is not None:
+                    for detail_data in details_data:
+                        offer_type = detail_data['offer_type']
+                        try:
+                            detail = instance.details.get(offer_type=offer_type)
+                            for key, value in detail_data.items():
+                                setattr(detail, key, value)
+                            detail.save()
+                        except OfferDetail.DoesNotExist:
+                            raise serializers.ValidationError(
+                                f"Detail mit Typ {offer_type} existiert nicht"
+                            )
+            instance.refresh_from_db(fields=['min_price', 'min_delivery_time'])
             return instance
    
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.urls import path, include
-from .views import OfferViewSet, OfferDetailRetrieveView
+from .views import OFFER_DETAIL_ROUTE, OfferViewSet, OfferDetailRetrieveView
 from rest_framework import routers
 
 """
@@ -11,6 +11,6 @@ router.register(r'offers', OfferViewSet, basename='offers')
 
 urlpatterns = [
     path('', include(router.urls)),
-    path('offerdetails/<int:pk>/', OfferDetailRetrieveView.as_view(), name='offerdetails-detail'),
+    path(f'{OFFER_DETAIL_ROUTE}<int:pk>/', OfferDetailRetrieveView.as_view(), name='offerdetails-detail'),
 ]
 
@@ -1,37 +1,112 @@
 from rest_framework import viewsets, generics
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework.filters import SearchFilter
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from coderr_app.async_views import AsyncGenericAPIView
+from coderr_app.cache import CachedResponseMixin
+from coderr_app.compiled import CompiledListMixin
+from coderr_app.idempotency import IDEMPOTENCY_PARAMETER, IdempotentCreateMixin
+from coderr_app.sparse import SPARSE_PARAMETERS, SparseFieldsetMixin
 
 from .serializers import OfferSerializer, OfferDetailSerializer
 from .permissions import OfferDetailPermission, OfferPermission
 from .pagination import OffersSetPagination
-from .filters import OfferFilter
+from .filters import OfferFilter, OfferOrderingFilter
+from .facets import FACETS, cached_facets, requested_facets
 from offers_app.models import Offer, OfferDetail
 
+# Path of OfferDetailRetrieveView below the API root (see urls.py).
+OFFER_DETAIL_ROUTE = 'offerdetails/'
+
 
-class OfferViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[
+        OpenApiParameter(
+            'facets', str, description=f"Comma-separated facet counts to add to the response: {', '.join(FACETS)}."
+        ),
+        *SPARSE_PARAMETERS,
+    ]),
+    retrieve=extend_schema(parameters=SPARSE_PARAMETERS),
+    create=extend_schema(parameters=[IDEMPOTENCY_PARAMETER]),
+)
+class OfferViewSet(CachedResponseMixin, SparseFieldsetMixin, IdempotentCreateMixin, CompiledListMixin, viewsets.ModelViewSet):
     """
     ViewSet for handling offers.
+    List and retrieve responses are cached and invalidated by model signals.
+    Lists are built from values() rows (see coderr_app.compiled).
+    ?ordering=-popularity sorts by the precomputed order counts (see offers_app.popularity).
+    ?facets= adds bucket counts for the filtered result (see facets.py).
+    ?fields= / ?omit= select the returned fields (see coderr_app.sparse).
+    POST honours the Idempotency-Key header (see coderr_app.idempotency).
     """
-    queryset = Offer.objects.all().prefetch_related('details')
+    queryset = Offer.objects.select_related('user').prefetch_related('details')
     serializer_class = OfferSerializer
     permission_classes = [OfferPermission]
     pagination_class = OffersSetPagination
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OfferOrderingFilter, SearchFilter]
     filterset_class = OfferFilter
-    ordering_fields = ['updated_at', 'min_price']
+    ordering_fields = ['updated_at', 'min_price', 'popularity']
     search_fields = ['title', 'description']
-    
+    compiled_relations = {'details': 'add_detail_links'}
+
+    def get_sparse_available_fields(self):
+        available = super().get_sparse_available_fields()
+        if self.action == 'retrieve':
+            # OfferSerializer drops user_details from single offers.
+            available = {name: field for name, field in available.items() if name != 'user_details'}
+        return available
+
+    def list(self, request, *args, **kwargs):
+        self.facets = requested_facets(request)
+        return super().list(request, *args, **kwargs)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if getattr(self, 'facets', None):
+            response.data['facets'] = self.get_facets()
+        return response
+
+    def get_facets(self):
+        """
+        Facet counts for the current filters and search, cached per normalized filter set.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        filterset = DjangoFilterBackend().get_filterset(self.request, self.get_queryset(), self)
+        search = self.request.query_params.get(SearchFilter.search_param, '')
+        return cached_facets(filterset, search, queryset, self.facets)
+
+    def add_detail_links(self, offers, name):
+        """
+        Fills in the detail links like OfferSerializer.to_representation does for lists.
+        """
+        links = {offer['id']: [] for offer in offers}
+        if links:
+            # One reverse per page: the detail route sits next to the router root.
+            prefix = reverse('api-root', request=self.request) + OFFER_DETAIL_ROUTE
+            details = OfferDetail.objects.filter(offer_id__in=links).values_list('offer_id', 'id')
+            for offer_id, detail_id in details:
+                links[offer_id].append({'id': detail_id, 'url': f'{prefix}{detail_id}/'})
+        for offer in offers:
+            offer[name] = links[offer['id']]
+
     def perform_create(self, serializer):
         """
         Associates the offer with the currently authenticated user on creation.
         """
         serializer.save(user=self.request.user)
 
-class OfferDetailRetrieveView(generics.RetrieveAPIView):
+class OfferDetailRetrieveView(AsyncGenericAPIView, generics.RetrieveAPIView):
     """
-    RetrieveAPIView for fetching offer detail.
+    RetrieveAPIView for fetching offer detail, served by the async ORM.
     """
-    queryset = OfferDetail.objects.all()
+    queryset = OfferDetail.objects.select_related('offer')
     serializer_class = OfferDetailSerializer
-    permission_classes = [OfferDetailPermission]
\ No newline at end of file
+    permission_classes = [OfferDetailPermission]
+
+    async def get(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,70 @@
+import multiprocessing
+import resource
+import time
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from coderr_app.images import normalize_image
+
+
+def _current_rss_kb():
+    with open('/proc/self/statm') as fh:
+        return int(fh.read().split()[1]) * resource.getpagesize() // 1024
+
+
+def _measure(payload, name, queue):
+    """
+    Runs one normalization in a fresh process and reports its RSS growth.
+    """
+    upload = SimpleUploadedFile(name, payload, content_type='image/jpeg')
+    baseline = _current_rss_kb()
+    started = time.perf_counter()
+    result = normalize_image(upload)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((peak - baseline, elapsed, result.size))
+
+
+class Command(BaseCommand):
+    """
+    Measures peak RSS and time per upload of the image normalization step.
+    Every upload runs in its own forked process so ru_maxrss reflects one upload.
+
+    Example:
+        python manage.py bench_upload --size 4000x3000 --size 8000x6000
+    """
+    help = 'Reports peak RSS per image upload normalization (Linux only).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            action='append',
+            dest='sizes',
+            help='Source image size WIDTHxHEIGHT (repeatable). Defaults to 1200x900, 4000x3000 and 6000x4000.'
+        )
+        parser.add_argument('--format', default='JPEG', choices=['JPEG', 'PNG'], help='Source image format.')
+
+    def handle(self, *args, **options):
+        sizes = options['sizes'] or ['1200x900', '4000x3000', '6000x4000']
+        fmt = options['format']
+        context = multiprocessing.get_context('fork')
+        self.stdout.write(f'{"source":>12} {"upload":>10} {"stored":>10} {"peak rss":>12} {"time":>9}')
+        for size in sizes:
+            width, height = (int(value) for value in size.lower().split('x'))
+            buffer = BytesIO()
+            Image.effect_noise((width, height), 64).convert('RGB').save(buffer, format=fmt)
+            payload = buffer.getvalue()
+            del buffer
+
+            queue = context.Queue()
+            process = context.Process(target=_measure, args=(payload, f'bench.{fmt.lower()}', queue))
+            process.start()
+            rss_kb, elapsed, stored = queue.get()
+            process.join()
+            self.stdout.write(
+                f'{size:>12} {len(payload) // 1024:>8}KB {stored // 1024:>8}KB '
+                f'{rss_kb / 1024:>10.1f}MB {elapsed * 1000:>7.0f}ms'
+            )
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from offers_app.aggregates import find_drift, id_bounds, invalidate_offers, recompute_range
+
+
+class Command(BaseCommand):
+    """
+    Recomputes Offer.min_price and Offer.min_delivery_time from the offer
+    details with set-based UPDATEs, one transaction per id range.
+    --verify only reports offers whose stored values are wrong and exits with
+    an error if there are any.
+
+    Example:
+        python manage.py recompute_offer_aggregates --verify
+        python manage.py recompute_offer_aggregates --batch-size 20000
+    """
+    help = 'Recomputes or verifies the denormalized offer aggregates.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Report drift without writing.')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Offer ids per range.')
+        parser.add_argument('--show', type=int, default=20, help='Drifted offers to list with --verify.')
+
+    def handle(self, *args, **options):
+        low, high = id_bounds()
+        if low is None:
+            self.stdout.write('No offers.')
+            return
+        started = time.perf_counter()
+        batch_size = options['batch_size']
+        drifted = updated = 0
+        for start in range(low, high + 1, batch_size):
+            end = min(start + batch_size - 1, high)
+            with transaction.atomic():
+                drift = find_drift(start, end)
+                drifted += len(drift)
+                if options['verify']:
+                    self.report(drift, options['show'] - (drifted - len(drift)))
+                elif drift:
+                    updated += recompute_range(start, end)
+            if drift and not options['verify']:
+                invalidate_offers([pk for pk, stored, expected in drift])
+
+        elapsed = time.perf_counter() - started
+        if options['verify']:
+            if drifted:
+                raise CommandError(f'{drifted} offers have stale aggregates ({elapsed:.1f}s).')
+            self.stdout.write(f'All offer aggregates are up to date ({elapsed:.1f}s).')
+        else:
+            self.stdout.write(f'Updated {updated} offers ({elapsed:.1f}s).')
+
+    def report(self, drift, limit):
+        for pk, stored, expected in drift[:max(limit, 0)]:
+            self.stdout.write(
+                f'Offer {pk}: min_price {stored[0]} -> {expected[0]}, '
+                f'min_delivery_time {stored[1]} -> {expected[1]}'
+            )
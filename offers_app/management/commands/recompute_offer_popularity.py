@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from offers_app.aggregates import id_bounds
+from offers_app.popularity import find_drift, reconcile, schedule_reconciliation, window_start
+
+
+class Command(BaseCommand):
+    """
+    Recomputes Offer.order_count and Offer.recent_order_count from the orders
+    with set-based UPDATEs, one transaction per id range.
+    --verify only reports offers whose stored counters are wrong and exits
+    with an error if there are any. --schedule queues the periodic
+    reconcile_popularity task for `run_tasks` instead.
+
+    Example:
+        python manage.py recompute_offer_popularity --verify
+        python manage.py recompute_offer_popularity --schedule
+    """
+    help = 'Recomputes, verifies or schedules the denormalized offer order counts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Report drift without writing.')
+        parser.add_argument('--schedule', action='store_true', help='Queue the periodic reconciliation task.')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Offer ids per range.')
+        parser.add_argument('--show', type=int, default=20, help='Drifted offers to list with --verify.')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            schedule_reconciliation()
+            self.stdout.write('Queued the popularity reconciliation task.')
+            return
+        started = time.perf_counter()
+        if not options['verify']:
+            updated = reconcile(options['batch_size'])
+            self.stdout.write(f'Updated {updated} offers ({time.perf_counter() - started:.1f}s).')
+            return
+
+        low, high = id_bounds()
+        if low is None:
+            self.stdout.write('No offers.')
+            return
+        since = window_start()
+        drifted = 0
+        for start in range(low, high + 1, options['batch_size']):
+            drift = find_drift(start, min(start + options['batch_size'] - 1, high), since)
+            for pk, stored, expected in drift[:max(options['show'] - drifted, 0)]:
+                self.stdout.write(
+                    f'Offer {pk}: order_count {stored[0]} -> {expected[0]}, '
+                    f'recent_order_count {stored[1]} -> {expected[1]}'
+                )
+            drifted += len(drift)
+        elapsed = time.perf_counter() - started
+        if drifted:
+            raise CommandError(f'{drifted} offers have stale order counts ({elapsed:.1f}s).')
+        self.stdout.write(f'All offer order counts are up to date ({elapsed:.1f}s).')
@@ -9,14 +9,18 @@ class Offer(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE,related_name="offers")
     title = models.CharField(max_length=255)
     image = models.ImageField(upload_to='offers/images/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     min_delivery_time = models.PositiveIntegerField(validators=[MinValueValidator(1)],null=True, blank=True)
+    order_count = models.PositiveIntegerField(default=0, editable=False)
+    recent_order_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['-updated_at']
+        indexes = [models.Index(fields=['-recent_order_count', '-order_count'], name='offer_popularity_idx')]
     
     def __str__(self):
         return self.title
@@ -0,0 +1,152 @@
+"""
+Maintenance of the denormalized Offer.order_count / Offer.recent_order_count.
+
+order_count is the number of orders of the offer's details that are not
+cancelled, recent_order_count the number of those created within the last
+OFFER_POPULARITY_WINDOW_DAYS days; ?ordering=-popularity sorts by them.
+Order signals adjust both counters in place with one UPDATE and drop the
+cached offer lists once the transaction commits. Orders leaving
+the window and writes that bypass the signals (bulk_create, update()) are
+caught by reconciliation: the reconcile_popularity task recomputes the
+counters with set-based UPDATEs every OFFER_POPULARITY_RECONCILE_INTERVAL
+seconds and queues its next run.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from coderr_app.cache import collection_tag, invalidate_tags
+from offers_app.aggregates import id_bounds
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from tasks_app.models import Task
+from tasks_app.queue import enqueue, task
+
+CANCELLED = 'cancelled'
+
+
+def window_start():
+    return timezone.now() - datetime.timedelta(days=getattr(settings, 'OFFER_POPULARITY_WINDOW_DAYS', 30))
+
+
+def counts_towards_popularity(order):
+    return order.offer_detail_id_id is not None and order.status != CANCELLED
+
+
+def adjust(offer_detail_id, delta, recent):
+    """
+    Adds delta to the counters of the detail's offer; recent_order_count only
+    if the order lies within the window.
+    """
+    counters = ['order_count', 'recent_order_count'] if recent else ['order_count']
+    updated = Offer.objects.filter(details__pk=offer_detail_id).update(
+        **{name: Greatest(F(name) + delta, Value(0)) for name in counters}
+    )
+    if updated:
+        # update() sends no signals; cached lists sorted by popularity are stale.
+        transaction.on_commit(lambda: invalidate_tags(collection_tag(Offer)), using=router.db_for_write(Offer))
+
+
+def find_drift(low, high, since, using=None):
+    """
+    Returns (offer_id, stored, expected) for every offer in [low, high] whose
+    stored counters differ from its orders; the values are
+    (order_count, recent_order_count) tuples.
+    """
+    stored = Offer.objects.using(using).filter(pk__range=(low, high)).order_by('pk').values_list(
+        'pk', 'order_count', 'recent_order_count'
+    )
+    expected = {
+        offer_id: (total, recent)
+        for offer_id, total, recent in Order.objects.using(using)
+        .filter(offer_detail_id__offer__pk__range=(low, high))
+        .exclude(status=CANCELLED)
+        .order_by()
+        .values('offer_detail_id__offer')
+        .annotate(total=Count('pk'), recent=Count('pk', filter=Q(created_at__gte=since)))
+        .values_list('offer_detail_id__offer', 'total', 'recent')
+    }
+    drift = []
+    for pk, total, recent in stored.iterator():
+        target = expected.get(pk, (0, 0))
+        if (total, recent) != target:
+            drift.append((pk, (total, recent), target))
+    return drift
+
+
+def recompute_range(low, high, since, using=None):
+    """
+    Recomputes the counters of all offers with ids in [low, high] using two
+    set-based UPDATEs, touching only rows whose values change.
+    Returns the number of updated rows.
+    """
+    using = using or router.db_for_write(Offer)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    offer_table = quote(Offer._meta.db_table)
+    detail_table = quote(OfferDetail._meta.db_table)
+    order_table = quote(Order._meta.db_table)
+    since = connection.ops.adapt_datetimefield_value(since)
+    counted = (
+        f'FROM {order_table} AS o JOIN {detail_table} AS d ON o.offer_detail_id_id = d.id '
+        f"WHERE COALESCE(o.status, '') <> %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {offer_table} SET order_count = agg.total, recent_order_count = agg.recent '
+            f'FROM (SELECT d.offer_id, COUNT(*) AS total, '
+            f'SUM(CASE WHEN o.created_at >= %s THEN 1 ELSE 0 END) AS recent '
+            f'{counted} AND d.offer_id BETWEEN %s AND %s GROUP BY d.offer_id) AS agg '
+            f'WHERE {offer_table}.id = agg.offer_id '
+            f'AND ({offer_table}.order_count <> agg.total OR {offer_table}.recent_order_count <> agg.recent)',
+            [since, CANCELLED, low, high],
+        )
+        updated = cursor.rowcount
+        cursor.execute(
+            f'UPDATE {offer_table} SET order_count = 0, recent_order_count = 0 '
+            f'WHERE id BETWEEN %s AND %s AND (order_count <> 0 OR recent_order_count <> 0) '
+            f'AND NOT EXISTS (SELECT 1 {counted} AND d.offer_id = {offer_table}.id)',
+            [low, high, CANCELLED],
+        )
+        updated += cursor.rowcount
+    return updated
+
+
+def reconcile(batch_size=10000):
+    """
+    Recomputes the counters of all offers, one transaction per id range.
+    Returns the number of updated offers.
+    """
+    low, high = id_bounds()
+    if low is None:
+        return 0
+    since = window_start()
+    updated = 0
+    for start in range(low, high + 1, batch_size):
+        with transaction.atomic():
+            updated += recompute_range(start, min(start + batch_size - 1, high), since)
+    if updated:
+        # Only the order of offer lists changes; raw UPDATEs bypass the signals.
+        invalidate_tags(collection_tag(Offer))
+    return updated
+
+
+def schedule_reconciliation(delay=None):
+    """
+    Queues reconcile_popularity unless a run is already queued.
+    """
+    if not Task.objects.filter(name=reconcile_popularity.task_name, status=Task.Status.QUEUED).exists():
+        enqueue(reconcile_popularity, delay=delay)
+
+
+@task
+def reconcile_popularity():
+    """
+    Periodic reconciliation; queues the next run before recomputing.
+    """
+    schedule_reconciliation(delay=getattr(settings, 'OFFER_POPULARITY_RECONCILE_INTERVAL', 60 * 60))
+    reconcile()
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coderr_app.cache import invalidate_instance
+from coderr_app.images import schedule_variants, variants_outdated
+from offers_app.aggregates import recompute_offers
+from offers_app.models import Offer, OfferDetail
+
+
+@receiver(post_save, sender=Offer)
+def render_offer_image_variants(sender, instance, **kwargs):
+    """
+    Queues thumbnail rendering whenever the offer image changed.
+    """
+    if variants_outdated(instance, 'image', 'image_variants'):
+        schedule_variants(instance, 'image', 'image_variants')
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_offer_cache(sender, instance, **kwargs):
+    """
+    Drops cached offer responses that contain the offer.
+    """
+    invalidate_instance(Offer, instance.pk)
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_detail_cache(sender, instance, **kwargs):
+    """
+    Drops cached responses of the detail and of its parent offer.
+    """
+    invalidate_instance(OfferDetail, instance.pk)
+    invalidate_instance(Offer, instance.offer_id)
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def update_offer_aggregates(sender, instance, **kwargs):
+    """
+    Keeps min_price and min_delivery_time of the parent offer in sync, also
+    for changes made outside the API (admin, shell, imports).
+    Skipped when the details are deleted together with their offer.
+    """
+    if isinstance(kwargs.get('origin'), Offer):
+        return
+    recompute_offers([instance.offer_id])
@@ -0,0 +1,82 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from offers_app.aggregates import deferred_aggregates
+from offers_app.models import Offer, OfferDetail
+
+User = get_user_model()
+
+
+class OfferAggregatesTest(TestCase):
+    """
+    Test cases for the min_price / min_delivery_time maintenance.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='testbusinessuser', password='werte12345')
+        self.offers = []
+        for number in range(3):
+            offer = Offer.objects.create(user=self.user, title=f'Angebot {number}', description='Test')
+            for offer_type, price, days in (('basic', 100, 7), ('standard', 200, 5), ('premium', 500, 3)):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, delivery_time_in_days=days + number,
+                    price=Decimal(price + number), features=[], offer_type=offer_type
+                )
+            self.offers.append(offer)
+
+    def values(self, offer):
+        offer.refresh_from_db()
+        return offer.min_price, offer.min_delivery_time
+
+    def test_detail_hooks_keep_aggregates_in_sync(self):
+        """Saving or deleting a detail outside the API updates the offer."""
+        offer = self.offers[0]
+        self.assertEqual(self.values(offer), (Decimal('100.00'), 3))
+
+        detail = offer.details.get(offer_type='standard')
+        detail.price = Decimal('49.99')
+        detail.delivery_time_in_days = 1
+        detail.save()
+        self.assertEqual(self.values(offer), (Decimal('49.99'), 1))
+
+        detail.delete()
+        self.assertEqual(self.values(offer), (Decimal('100.00'), 3))
+
+        offer.details.all().delete()
+        self.assertEqual(self.values(offer), (None, None))
+
+    def test_deferred_aggregates_recompute_once(self):
+        """Inside deferred_aggregates() the offer is recomputed once at the end."""
+        offer = self.offers[1]
+        details = list(offer.details.all())
+        # One UPDATE per detail, then the two recompute statements.
+        with self.assertNumQueries(len(details) + 2):
+            with deferred_aggregates():
+                for detail in details:
+                    detail.price -= 100
+                    detail.save()
+        self.assertEqual(self.values(offer)[0], Decimal('1.00'))
+
+    def test_verify_reports_drift_and_recompute_fixes_it(self):
+        """--verify lists stale offers without writing; the recompute fixes them."""
+        stale, other = self.offers[0], self.offers[2]
+        Offer.objects.filter(pk=stale.pk).update(min_price=Decimal('1.00'))
+        Offer.objects.filter(pk=other.pk).update(min_delivery_time=None)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('recompute_offer_aggregates', verify=True, batch_size=2, stdout=out)
+        self.assertIn(f'Offer {stale.pk}: min_price 1.00 -> 100.00', out.getvalue())
+        self.assertIn(f'Offer {other.pk}: min_price 102.00 -> 102.00, min_delivery_time None -> 5', out.getvalue())
+        self.assertEqual(self.values(stale)[0], Decimal('1.00'))
+
+        out = StringIO()
+        call_command('recompute_offer_aggregates', batch_size=2, stdout=out)
+        self.assertIn('Updated 2 offers', out.getvalue())
+        self.assertEqual(self.values(stale), (Decimal('100.00'), 3))
+        self.assertEqual(self.values(other), (Decimal('102.00'), 5))
+
+        call_command('recompute_offer_aggregates', verify=True, stdout=StringIO())
@@ -0,0 +1,87 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework.authtoken.models import Token
+from django.contrib.auth import get_user_model
+
+from coderr_app.images import update_variants
+from offers_app.models import Offer
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_SIZES={'thumbnail': 300, 'medium': 800})
+class OfferImageVariantsTest(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testbusinessuser', password='werte12345')
+        UserProfile.objects.create(user=self.user, type='business')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def upload(self, size=(2000, 1500), mode='RGB', fmt='JPEG', name='photo.jpg'):
+        buffer = BytesIO()
+        Image.new(mode, size, color=(200, 100, 50) if mode == 'RGB' else (200, 100, 50, 128)).save(buffer, format=fmt)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{fmt.lower()}')
+
+    def test_variants_rendered_after_commit(self):
+        """Variants are rendered on commit and exposed as absolute URLs."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            offer = Offer.objects.create(user=self.user, title='Foto', description='Test', image=self.upload())
+        self.assertEqual(len(callbacks), 1)
+        update_variants('offers_app.Offer', offer.pk, 'image', 'image_variants')
+
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants['source'], offer.image.name)
+        with default_storage.open(offer.image_variants['thumbnail']['webp']) as fh, Image.open(fh) as thumb:
+            self.assertEqual(thumb.format, 'WEBP')
+            self.assertEqual(max(thumb.size), 300)
+        with default_storage.open(offer.image_variants['medium']['jpeg']) as fh, Image.open(fh) as medium:
+            self.assertEqual(medium.format, 'JPEG')
+            self.assertEqual(medium.size, (800, 600))
+
+        response = self.client.get(reverse('offers-detail', kwargs={'pk': offer.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        urls = response.data['image_variants']
+        self.assertEqual(set(urls), {'thumbnail', 'medium'})
+        self.assertTrue(urls['thumbnail']['jpeg'].startswith('http://testserver/media/offers/images/variants/'))
+
+    def test_transparent_image_jpeg_variant(self):
+        """PNG uploads with alpha still get a JPEG variant."""
+        offer = Offer.objects.create(
+            user=self.user, title='Logo', description='Test',
+            image=self.upload(size=(400, 400), mode='RGBA', fmt='PNG', name='logo.png')
+        )
+        update_variants('offers_app.Offer', offer.pk, 'image', 'image_variants')
+        offer.refresh_from_db()
+        with default_storage.open(offer.image_variants['thumbnail']['jpeg']) as fh, Image.open(fh) as thumb:
+            self.assertEqual(thumb.mode, 'RGB')
+
+    def test_replacing_image_removes_old_variants(self):
+        """Replacing the image re-renders the variants and deletes the old files."""
+        offer = Offer.objects.create(user=self.user, title='Foto', description='Test', image=self.upload())
+        update_variants('offers_app.Offer', offer.pk, 'image', 'image_variants')
+        offer.refresh_from_db()
+        old_thumbnail = offer.image_variants['thumbnail']['webp']
+
+        offer.image = self.upload(name='neu.jpg')
+        offer.save()
+        update_variants('offers_app.Offer', offer.pk, 'image', 'image_variants')
+        offer.refresh_from_db()
+        self.assertFalse(default_storage.exists(old_thumbnail))
+        self.assertIn('neu', offer.image_variants['thumbnail']['webp'])
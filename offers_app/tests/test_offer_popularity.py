@@ -0,0 +1,128 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+from offers_app.popularity import reconcile_popularity
+from orders_app.models import Order
+from tasks_app.models import Task
+from tasks_app.queue import claim, run_task
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+
+class OfferPopularityTest(APITestCase):
+    """
+    Test cases for Offer.order_count / recent_order_count and ?ordering=-popularity.
+    """
+    def setUp(self):
+        cache.clear()
+        self.business = User.objects.create_user(username='testbusinessuser', password='werte12345')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='testcustomeruser', password='werte12345')
+        UserProfile.objects.create(user=self.customer, type='customer')
+        self.details = []
+        for number in range(3):
+            offer = Offer.objects.create(user=self.business, title=f'Angebot {number}', description='Test')
+            self.details.append(OfferDetail.objects.create(
+                offer=offer, title='Basic', delivery_time_in_days=5, price=100, features=[], offer_type='basic'
+            ))
+
+    def order(self, detail, **fields):
+        return Order.objects.create(
+            customer_user=self.customer, business_user=self.business.id, offer_detail_id=detail, **fields
+        )
+
+    def counts(self, detail):
+        return tuple(Offer.objects.filter(pk=detail.offer_id).values_list('order_count', 'recent_order_count').get())
+
+    def test_orders_update_counters(self):
+        detail = self.details[0]
+        order = self.order(detail)
+        self.order(detail)
+        self.assertEqual(self.counts(detail), (2, 2))
+
+        order.status = 'cancelled'
+        order.save()
+        self.assertEqual(self.counts(detail), (1, 1))
+        order.title = 'Geändert'
+        order.save()
+        self.assertEqual(self.counts(detail), (1, 1))
+        order.status = 'in_progress'
+        order.save()
+        self.assertEqual(self.counts(detail), (2, 2))
+
+        order.delete()
+        self.order(detail, status='cancelled').delete()
+        self.assertEqual(self.counts(detail), (1, 1))
+
+    def test_api_orders_count(self):
+        detail = self.details[0]
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.post(reverse('orders-list'), {'offer_detail_id': detail.pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.counts(detail), (1, 1))
+
+    def test_ordering_by_popularity(self):
+        old = timezone.now() - datetime.timedelta(days=60)
+        for _ in range(3):
+            Order.objects.filter(pk=self.order(self.details[0]).pk).update(created_at=old)
+        for _ in range(2):
+            self.order(self.details[1])
+        self.order(self.details[2])
+        call_command('recompute_offer_popularity', stdout=StringIO())
+        self.assertEqual(self.counts(self.details[0]), (3, 0))
+
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(reverse('offers-list'), {'ordering': '-popularity'})
+        ids = [offer['id'] for offer in response.data['results']]
+        self.assertEqual(ids, [self.details[1].offer_id, self.details[2].offer_id, self.details[0].offer_id])
+        response = self.client.get(reverse('offers-list'), {'ordering': 'popularity'})
+        self.assertEqual([offer['id'] for offer in response.data['results']], ids[::-1])
+
+    def test_order_refreshes_cached_popular_list(self):
+        self.order(self.details[0])
+        url = reverse('offers-list')
+        self.client.force_authenticate(user=self.customer)
+        first = [offer['id'] for offer in self.client.get(url, {'ordering': '-popularity'}).data['results']]
+        self.assertEqual(first[0], self.details[0].offer_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(2):
+                self.order(self.details[1])
+        response = self.client.get(url, {'ordering': '-popularity'})
+        self.assertEqual(response.data['results'][0]['id'], self.details[1].offer_id)
+
+    def test_reconciliation(self):
+        """Writes that bypass the signals are repaired by the reconciliation."""
+        detail = self.details[0]
+        self.order(detail)
+        Order.objects.bulk_create([
+            Order(customer_user=self.customer, business_user=self.business.id, offer_detail_id=detail),
+            Order(customer_user=self.customer, business_user=self.business.id, offer_detail_id=detail, status='cancelled'),
+        ])
+        Offer.objects.filter(pk=self.details[1].offer_id).update(order_count=4, recent_order_count=2)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('recompute_offer_popularity', verify=True, stdout=out)
+        self.assertIn(f'Offer {detail.offer_id}: order_count 1 -> 2, recent_order_count 1 -> 2', out.getvalue())
+
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('recompute_offer_popularity', schedule=True, stdout=StringIO())
+        self.assertEqual(Task.objects.filter(name=reconcile_popularity.task_name).count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(run_task(claim(1)[0]))
+        self.assertEqual(self.counts(detail), (2, 2))
+        self.assertEqual(self.counts(self.details[1]), (0, 0))
+        # The run queued the next one.
+        self.assertTrue(Task.objects.filter(name=reconcile_popularity.task_name, status=Task.Status.QUEUED).exists())
+        call_command('recompute_offer_popularity', verify=True, stdout=StringIO())
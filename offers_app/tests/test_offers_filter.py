@@ -1,3 +1,7 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
@@ -101,3 +105,87 @@ class OffersAppFilterTest(APITestCase):
         results = response.data['results']
         prices = [result['min_price'] for result in results]
         self.assertEqual(prices, sorted(prices, reverse=True))
+
+    def test_max_price_filter(self):
+        """Test filtering offers by maximum price"""
+        response = self.client.get(reverse('offers-list'), {'max_price': 255})
+        results = response.data['results']
+        self.assertEqual([result['title'] for result in results], ['Webdesign Paket'])
+
+    def test_min_delivery_time_filter(self):
+        """Test filtering offers by minimum delivery time"""
+        response = self.client.get(reverse('offers-list'), {'min_delivery_time': 3})
+        results = response.data['results']
+        self.assertEqual([result['title'] for result in results], ['Webdesign Paket'])
+
+    def test_facets(self):
+        """Test facet counts for the filtered result"""
+        response = self.client.get(reverse('offers-list'), {'facets': 'price,delivery,creator', 'max_price': 1000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        facets = response.data['facets']
+        self.assertEqual(list(facets), ['price', 'delivery', 'creator'])
+        self.assertEqual(
+            [(bucket['min'], bucket['max'], bucket['count']) for bucket in facets['price']],
+            [(None, 50, 0), (50, 100, 0), (100, 250, 0), (250, 500, 2), (500, 1000, 0), (1000, None, 0)]
+        )
+        self.assertEqual([bucket['count'] for bucket in facets['delivery']], [0, 2, 2, 2])
+        self.assertEqual(
+            sorted((creator['username'], creator['count']) for creator in facets['creator']),
+            [('otheruser', 1), ('testbusinessuser', 1)]
+        )
+
+        response = self.client.get(reverse('offers-list'), {'facets': 'delivery', 'search': 'UI'})
+        self.assertEqual(list(response.data['facets']), ['delivery'])
+        self.assertEqual([bucket['count'] for bucket in response.data['facets']['delivery']], [0, 1, 1, 1])
+
+    def test_facets_use_two_queries_and_are_cached(self):
+        """Test that facets take one bucket and one creator query and are reused across pages until offers change"""
+        url = reverse('offers-list')
+        cache.clear()
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as plain:
+            self.client.get(url, {'ordering': 'min_price'})
+        with CaptureQueriesContext(connection) as faceted:
+            response = self.client.get(url, {'facets': 'price,delivery,creator', 'min_price': '100'})
+        self.assertEqual(len(faceted) - len(plain), 2)
+        self.assertIn('LIMIT', faceted.captured_queries[-1]['sql'])
+
+        with CaptureQueriesContext(connection) as cached:
+            self.client.get(url, {'facets': 'creator,delivery,price', 'min_price': '100.0', 'ordering': 'min_price'})
+        self.assertEqual(len(cached), len(plain))
+
+        self.create_offer(
+            user=self.user, title="Logo Paket", description="Logos",
+            details=[
+                {'price': 120, 'delivery': 1, 'type': 'basic'},
+                {'price': 200, 'delivery': 2, 'type': 'standard'},
+                {'price': 400, 'delivery': 3, 'type': 'premium'}
+            ]
+        )
+        response = self.client.get(url, {'facets': 'delivery', 'min_price': '100'})
+        self.assertEqual(response.data['facets']['delivery'][0]['count'], 1)
+
+    @override_settings(OFFER_FACET_CREATOR_LIMIT=1)
+    def test_creator_facet_limit(self):
+        """Test that only the creators with the most offers are listed"""
+        cache.clear()
+        self.create_offer(
+            user=self.user, title="Logo Paket", description="Logos",
+            details=[
+                {'price': 120, 'delivery': 1, 'type': 'basic'},
+                {'price': 200, 'delivery': 2, 'type': 'standard'},
+                {'price': 400, 'delivery': 3, 'type': 'premium'}
+            ]
+        )
+        response = self.client.get(reverse('offers-list'), {'facets': 'creator'})
+        self.assertEqual(
+            [(creator['username'], creator['count']) for creator in response.data['facets']['creator']],
+            [('testbusinessuser', 2)]
+        )
+
+    def test_facets_absent_by_default_and_validated(self):
+        """Test that facets are opt-in and unknown names are rejected"""
+        response = self.client.get(reverse('offers-list'))
+        self.assertNotIn('facets', response.data)
+        response = self.client.get(reverse('offers-list'), {'facets': 'price,rating'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
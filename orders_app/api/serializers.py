@@ -4,12 +4,13 @@ from django.contrib.auth import get_user_model
 
 from orders_app.models import Order, Review
 from offers_app.models import OfferDetail
+from coderr_app.sparse import SparseFieldsMixin
 
 User = get_user_model()
 
 ALLOWED_STATUS = ['in_progress', 'completed', 'cancelled']
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Order model.
     """
@@ -44,7 +45,7 @@ class OrderSerializer(serializers.ModelSerializer):
         """
         Create a new order by populating fields from the offer details.
         """
-        offer = validated_data.pop('offer_detail_id')
+        offer = validated_data['offer_detail_id']
         validated_data.update({
             'title': offer.title,
             'revisions': offer.revisions,
@@ -56,7 +57,7 @@ class OrderSerializer(serializers.ModelSerializer):
         })
         return super().create(validated_data)
     
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Review model.
     """
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework import routers
-from .views import OrderViewSet, OrderCountView, CompletedOrderCountView, ReviewViewSet, BaseInfoView
+from .views import OrderViewSet, OrderCountView, CompletedOrderCountView, ReviewViewSet, BaseInfoView, BusinessDashboardView
 
 """
 URL routing for orders_app API endpoints.
@@ -14,6 +14,7 @@ urlpatterns = [
     path('', include(router.urls)),
     path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'),
     path('completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('business-dashboard/<int:business_user_id>/', BusinessDashboardView.as_view(), name='business-dashboard'),
     path('base-info/', BaseInfoView.as_view(), name='base-info'),
 ]
 
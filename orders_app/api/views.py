@@ -1,15 +1,23 @@
 from rest_framework import viewsets, status
-from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.filters import OrderingFilter, SearchFilter
 
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Q
+from django.conf import settings
+from django.db.models import Avg, Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 from django.shortcuts import get_object_or_404 
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from asgiref.sync import sync_to_async
 
+from coderr_app.async_views import AsyncAPIView
+from coderr_app.cache import CachedResponseMixin, cacheable_response, collection_tag, get_entry, set_entry, tag_versions
+from coderr_app.compiled import CompiledListMixin
+from coderr_app.idempotency import IDEMPOTENCY_PARAMETER, IdempotentCreateMixin
+from coderr_app.sparse import SPARSE_PARAMETERS, SparseFieldsetMixin
 from offers_app.models import Offer
 from user_auth_app.models import UserProfile
 from orders_app.models import Order, Review
@@ -19,6 +27,12 @@ from .filters import ReviewFilter
 
 User = get_user_model()
 
+async def is_business_user(user_id):
+    """
+    Returns True if a user with the given ID exists and has a business profile.
+    """
+    return await UserProfile.objects.filter(user_id=user_id, type=UserProfile.UserType.BUSINESS).aexists()
+
 class OrderCountSerializer(serializers.Serializer):
     """Serializer for OrderCountView."""
     order_count = serializers.IntegerField()
@@ -34,11 +48,32 @@ class BaseInfoSerializer(serializers.Serializer):
     business_profile_count = serializers.IntegerField()
     offer_count = serializers.IntegerField()
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderStatusCountSerializer(serializers.Serializer):
+    in_progress = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    cancelled = serializers.IntegerField()
+    total = serializers.IntegerField()
+
+class BusinessDashboardSerializer(serializers.Serializer):
+    """Serializer for BusinessDashboardView."""
+    business_user_id = serializers.IntegerField()
+    order_counts = OrderStatusCountSerializer()
+    total_revenue = serializers.DecimalField(max_digits=12, decimal_places=2, coerce_to_string=False)
+    review_count = serializers.IntegerField()
+    average_rating = serializers.FloatField()
+    offer_count = serializers.IntegerField()
+
+@extend_schema_view(
+    list=extend_schema(parameters=SPARSE_PARAMETERS),
+    retrieve=extend_schema(parameters=SPARSE_PARAMETERS),
+    create=extend_schema(parameters=[IDEMPOTENCY_PARAMETER]),
+)
+class OrderViewSet(SparseFieldsetMixin, IdempotentCreateMixin, CompiledListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing orders.
     Provides standard CRUD operations on Order objects filtered by the current authenticated customer.
     Automatically assigns the current user as the customer when creating new orders.
+    POST honours the Idempotency-Key header (see coderr_app.idempotency).
     """
     http_method_names = ['get', 'post', 'patch', 'delete']
     serializer_class = OrderSerializer
@@ -72,7 +107,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         return obj
 
 
-class OrderCountView(APIView):
+class OrderCountView(AsyncAPIView):
     """
     Retrieve the count of in-progress orders for a business user.
 
@@ -85,21 +120,17 @@ class OrderCountView(APIView):
     permission_classes = [IsAuthenticated]
     serializer_class = OrderCountSerializer
 
-    def get(self, request, business_user_id):
+    async def get(self, request, business_user_id):
         """
         Handles GET requests to count in-progress orders for a business user.
         """
-        try:
-            business_user = User.objects.get(pk=business_user_id)
-            if not hasattr(business_user, 'profile') or business_user.profile.type != 'business':
-                raise User.DoesNotExist
-        except User.DoesNotExist:
+        if not await is_business_user(business_user_id):
             return Response({'error': 'Kein Geschäftsnutzer mit der angegebenen ID gefunden.'}, status=status.HTTP_404_NOT_FOUND)
-        order_count = Order.objects.filter(business_user=business_user_id, status='in_progress').count()
+        order_count = await Order.objects.filter(business_user=business_user_id, status='in_progress').acount()
         serializer = self.serializer_class({'order_count': order_count})
         return Response(serializer.data)
 
-class CompletedOrderCountView(APIView):
+class CompletedOrderCountView(AsyncAPIView):
     """
     Retrieve the count of completed orders for a business user.
 
@@ -111,22 +142,86 @@ class CompletedOrderCountView(APIView):
     """
     permission_classes = [IsAuthenticated]
     serializer_class = CompletedOrderCountSerializer
-    def get(self, request, business_user_id):
+    async def get(self, request, business_user_id):
         """
         Handles GET requests to count completed orders for a business user.
         """
-        try:
-            business_user = User.objects.get(pk=business_user_id)
-            if not hasattr(business_user, 'profile') or business_user.profile.type != 'business':
-                raise User.DoesNotExist
-        except User.DoesNotExist:
+        if not await is_business_user(business_user_id):
             return Response({'error': 'Kein Geschäftsnutzer mit der angegebenen ID gefunden.'}, status=status.HTTP_404_NOT_FOUND)
         
-        completed_order_count = Order.objects.filter(business_user=business_user_id, status='completed').count()
+        completed_order_count = await Order.objects.filter(business_user=business_user_id, status='completed').acount()
         serializer = self.serializer_class({'completed_order_count': completed_order_count})
         return Response(serializer.data)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class BusinessDashboardView(AsyncAPIView):
+    """
+    Retrieve the dashboard figures of a business user: order counts per status,
+    revenue of completed orders, review count and average rating, offer count.
+
+    Args:
+        business_user_id (int): ID of the business user.
+
+    Returns:
+        JSON response with the figures, or an error message. Results are cached
+        per business user for BUSINESS_DASHBOARD_CACHE_TIMEOUT seconds and
+        dropped when orders, reviews, offers or profiles change.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = BusinessDashboardSerializer
+    cache_models = (Order, Review, Offer, UserProfile)
+
+    async def get(self, request, business_user_id):
+        """
+        Handles GET requests with two queries on a cache miss.
+        """
+        key = f'business-dashboard:{business_user_id}'
+        data = await sync_to_async(get_entry)(key)
+        if data is None:
+            versions = await sync_to_async(tag_versions)([collection_tag(model) for model in self.cache_models])
+            data = await self.dashboard(business_user_id)
+            if data is None:
+                return Response({'error': 'Kein Geschäftsnutzer mit der angegebenen ID gefunden.'}, status=status.HTTP_404_NOT_FOUND)
+            data = self.serializer_class(data).data
+            await sync_to_async(set_entry)(key, data, versions, getattr(settings, 'BUSINESS_DASHBOARD_CACHE_TIMEOUT', 30))
+        return Response(data)
+
+    @staticmethod
+    async def dashboard(business_user_id):
+        """
+        Review and offer figures come with the business profile row, the order
+        figures from one conditional aggregation over the user's orders.
+        Returns None if the user has no business profile.
+        """
+        reviews = Review.objects.filter(business_user_id=OuterRef('user_id')).order_by().values('business_user_id')
+        offers = Offer.objects.filter(user_id=OuterRef('user_id')).order_by().values('user_id')
+        profile = await UserProfile.objects.filter(
+            user_id=business_user_id, type=UserProfile.UserType.BUSINESS
+        ).annotate(
+            review_count=Coalesce(Subquery(reviews.annotate(count=Count('pk')).values('count')), 0),
+            average_rating=Subquery(reviews.annotate(avg=Avg('rating')).values('avg')),
+            offer_count=Coalesce(Subquery(offers.annotate(count=Count('pk')).values('count'), output_field=IntegerField()), 0),
+        ).values('review_count', 'average_rating', 'offer_count').afirst()
+        if profile is None:
+            return None
+        orders = await Order.objects.filter(business_user=business_user_id).aaggregate(
+            in_progress=Count('pk', filter=Q(status='in_progress')),
+            completed=Count('pk', filter=Q(status='completed')),
+            cancelled=Count('pk', filter=Q(status='cancelled')),
+            total=Count('pk'),
+            revenue=Coalesce(Sum('price', filter=Q(status='completed')), Value(0), output_field=DecimalField()),
+        )
+        average_rating = profile['average_rating']
+        return {
+            'business_user_id': business_user_id,
+            'order_counts': {name: orders[name] for name in ('in_progress', 'completed', 'cancelled', 'total')},
+            'total_revenue': orders['revenue'],
+            'review_count': profile['review_count'],
+            'average_rating': round(average_rating, 1) if average_rating is not None else 0.0,
+            'offer_count': profile['offer_count'],
+        }
+
+@extend_schema_view(list=extend_schema(parameters=SPARSE_PARAMETERS), retrieve=extend_schema(parameters=SPARSE_PARAMETERS))
+class ReviewViewSet(CachedResponseMixin, SparseFieldsetMixin, CompiledListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing reviews.
     
@@ -135,6 +230,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     GET: Accessible to everyone.
     POST: Only authenticated users with a customer profile can create reviews. A user may only submit one review per business user.
     PATCH, DELETE: Only the review's creator (reviewer) or an admin may modify or delete a review.
+    List and retrieve responses are cached and invalidated by model signals.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
@@ -154,7 +250,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsReviewerOrAdmin()]
         return [IsAuthenticated()]
 
-class BaseInfoView(APIView):
+class BaseInfoView(AsyncAPIView):
     """
     Retrieve general platform statistics.
     
@@ -169,12 +265,12 @@ class BaseInfoView(APIView):
     """
     permission_classes = []
     serializer_class = BaseInfoSerializer
-    def get(self, request):
-        review_count = Review.objects.count()
-        avg_rating = Review.objects.aggregate(avg=Avg('rating'))['avg']
-        avg_rating = round(avg_rating, 1) if avg_rating is not None else 0.0
-        business_profile_count = UserProfile.objects.filter(type='business').count()
-        offer_count = Offer.objects.count()
+    async def get(self, request):
+        reviews = await Review.objects.aaggregate(count=Count('id'), avg=Avg('rating'))
+        review_count = reviews['count']
+        avg_rating = round(reviews['avg'], 1) if reviews['avg'] is not None else 0.0
+        business_profile_count = await UserProfile.objects.filter(type='business').acount()
+        offer_count = await Offer.objects.acount()
 
         data = {
             'review_count': review_count,
@@ -183,4 +279,4 @@ class BaseInfoView(APIView):
             'offer_count': offer_count
         }
         serializer = self.serializer_class(data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return cacheable_response(Response(serializer.data, status=status.HTTP_200_OK))
\ No newline at end of file
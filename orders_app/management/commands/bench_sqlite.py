@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from coderr_app.sqlite_backend.base import DEFAULT_PRAGMAS, apply_pragmas
+
+SCHEMA = """
+CREATE TABLE orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    business_user INTEGER NOT NULL,
+    customer_user INTEGER NOT NULL,
+    title TEXT,
+    price DECIMAL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX orders_business_status ON orders (business_user, status);
+"""
+COUNT_SQL = "SELECT COUNT(*) FROM orders WHERE business_user = ? AND status = 'in_progress'"
+INSERT_SQL = (
+    "INSERT INTO orders (business_user, customer_user, title, price, status, created_at) "
+    "VALUES (?, ?, 'Bench', 100.00, 'in_progress', datetime('now'))"
+)
+
+
+class Command(BaseCommand):
+    """
+    Measures order-count read throughput while orders are being written,
+    once with SQLite defaults (rollback journal, one connection per query)
+    and once with the pragmas of the tuned backend and persistent connections.
+
+    Example:
+        python manage.py bench_sqlite --readers 8 --duration 5
+    """
+    help = 'Compares SQLite read throughput under concurrent order writes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile.')
+        parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads.')
+        parser.add_argument('--seed', type=int, default=50000, help='Orders inserted before measuring.')
+        parser.add_argument('--batch', type=int, default=1, help='Orders per write transaction.')
+
+    def handle(self, *args, **options):
+        configured = connections['default'].settings_dict['OPTIONS'].get('pragmas', {})
+        profiles = [
+            ('default', {}, False),
+            ('tuned', {**DEFAULT_PRAGMAS, **configured}, True),
+        ]
+        self.stdout.write(f'{"profile":<9} {"reads/s":>10} {"writes/s":>10} {"busy":>6} {"p99 read":>10}')
+        for name, pragmas, persistent in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'bench.sqlite3')
+                self._prepare(path, pragmas, options['seed'])
+                result = self._run(path, pragmas, persistent, options)
+            self.stdout.write(
+                f'{name:<9} {result["reads"] / options["duration"]:>10.0f} '
+                f'{result["writes"] / options["duration"]:>10.0f} {result["busy"]:>6} '
+                f'{result["p99"] * 1000:>8.2f}ms'
+            )
+
+    def _connect(self, path, pragmas):
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        apply_pragmas(conn, pragmas)
+        return conn
+
+    def _prepare(self, path, pragmas, seed):
+        conn = self._connect(path, pragmas)
+        conn.executescript(SCHEMA)
+        conn.execute('BEGIN')
+        conn.executemany(INSERT_SQL, ((i % 100 + 1, i % 500 + 1) for i in range(seed)))
+        conn.execute('COMMIT')
+        conn.close()
+
+    def _run(self, path, pragmas, persistent, options):
+        deadline = time.perf_counter() + options['duration']
+        lock = threading.Lock()
+        result = {'reads': 0, 'writes': 0, 'busy': 0, 'latencies': []}
+
+        def writer():
+            conn = self._connect(path, pragmas)
+            writes = busy = 0
+            while time.perf_counter() < deadline:
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    for i in range(options['batch']):
+                        conn.execute(INSERT_SQL, (writes % 100 + 1, writes % 500 + 1))
+                    conn.execute('COMMIT')
+                    writes += options['batch']
+                except sqlite3.OperationalError:
+                    busy += 1
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+            conn.close()
+            with lock:
+                result['writes'] += writes
+                result['busy'] += busy
+
+        def reader():
+            conn = self._connect(path, pragmas) if persistent else None
+            reads = busy = 0
+            latencies = []
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    current = conn or self._connect(path, pragmas)
+                    current.execute(COUNT_SQL, (reads % 100 + 1,)).fetchone()
+                    if conn is None:
+                        current.close()
+                    reads += 1
+                    latencies.append(time.perf_counter() - started)
+                except sqlite3.OperationalError:
+                    busy += 1
+            if conn is not None:
+                conn.close()
+            with lock:
+                result['reads'] += reads
+                result['busy'] += busy
+                result['latencies'].extend(latencies)
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies = sorted(result['latencies']) or [0.0]
+        result['p99'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        return result
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from coderr_app.cache import invalidate_instance
+from offers_app.popularity import adjust, counts_towards_popularity, window_start
+from orders_app.models import Order, Review
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review_cache(sender, instance, **kwargs):
+    """
+    Drops cached review responses that contain the review.
+    """
+    invalidate_instance(Review, instance.pk)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_order_cache(sender, instance, **kwargs):
+    """
+    Drops cached figures that count the order, e.g. the business dashboard.
+    """
+    invalidate_instance(Order, instance.pk)
+
+
+@receiver(pre_save, sender=Order)
+def remember_counted_order(sender, instance, update_fields=None, **kwargs):
+    """
+    Records whether the stored order counted towards its offer's popularity,
+    for saves that may change the status.
+    """
+    instance._counted_before = None
+    if instance._state.adding or (update_fields is not None and 'status' not in update_fields):
+        return
+    stored = Order.objects.filter(pk=instance.pk).values_list('offer_detail_id', 'status').first()
+    if stored is not None:
+        instance._counted_before = stored[0] is not None and stored[1] != 'cancelled'
+
+
+@receiver(post_save, sender=Order)
+def update_offer_popularity(sender, instance, created, **kwargs):
+    """
+    Keeps the order counters of the offer in sync when an order is created,
+    cancelled or reopened (see offers_app.popularity).
+    """
+    counted = counts_towards_popularity(instance)
+    before = False if created else getattr(instance, '_counted_before', None)
+    if before is None or counted == before:
+        return
+    adjust(instance.offer_detail_id_id, 1 if counted else -1, instance.created_at >= window_start())
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_popularity(sender, instance, **kwargs):
+    """
+    Deleted orders no longer count for their offer.
+    """
+    if counts_towards_popularity(instance):
+        adjust(instance.offer_detail_id_id, -1, instance.created_at >= window_start())
@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer
+from orders_app.models import Order, Review
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+
+class BusinessDashboardViewTest(APITestCase):
+    """
+    Test cases for GET /api/business-dashboard/<business_user_id>/.
+    """
+    def setUp(self):
+        cache.clear()
+        self.business = User.objects.create_user(username='testbusinessuser', password='werte12345')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='testcustomeruser', password='werte12345')
+        UserProfile.objects.create(user=self.customer, type='customer')
+        self.url = reverse('business-dashboard', args=[self.business.id])
+        self.client.force_authenticate(user=self.business)
+
+    def create_order(self, status_, price):
+        return Order.objects.create(
+            customer_user=self.customer, business_user=self.business.id, title='Auftrag', price=price, status=status_
+        )
+
+    def test_dashboard_figures(self):
+        for status_, price in [('in_progress', 50), ('completed', 100), ('completed', 149.5), ('cancelled', 300)]:
+            self.create_order(status_, price)
+        Order.objects.create(customer_user=self.customer, business_user=self.customer.id, status='completed', price=999)
+        Offer.objects.create(user=self.business, title='Webdesign', description='Test')
+        Offer.objects.create(user=self.business, title='Logo', description='Test')
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4)
+        other = User.objects.create_user(username='othercustomer', password='werte12345')
+        Review.objects.create(business_user=self.business, reviewer=other, rating=5)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'business_user_id': self.business.id,
+            'order_counts': {'in_progress': 1, 'completed': 2, 'cancelled': 1, 'total': 4},
+            'total_revenue': 249.5,
+            'review_count': 2,
+            'average_rating': 4.5,
+            'offer_count': 2,
+        })
+
+    def test_empty_dashboard(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['order_counts']['total'], 0)
+        self.assertEqual(response.json()['total_revenue'], 0)
+        self.assertEqual(response.json()['average_rating'], 0.0)
+        self.assertEqual(response.json()['offer_count'], 0)
+
+    def test_figures_are_cached_until_data_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+        order = self.create_order('completed', 100)
+        self.assertEqual(self.client.get(self.url).json()['order_counts']['completed'], 1)
+        order.status = 'cancelled'
+        order.save()
+        self.assertEqual(self.client.get(self.url).json()['order_counts']['cancelled'], 1)
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=3)
+        self.assertEqual(self.client.get(self.url).json()['review_count'], 1)
+        Offer.objects.create(user=self.business, title='Logo', description='Test')
+        self.assertEqual(self.client.get(self.url).json()['offer_count'], 1)
+
+    def test_access(self):
+        """Like the other count endpoints, any authenticated user may read the figures."""
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        own = self.client.get(reverse('business-dashboard', args=[self.customer.id]))
+        self.assertEqual(own.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,8 +1,10 @@
+from django.test import AsyncClient
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
-from orders_app.models import Order
+from orders_app.models import Order, Review
 from offers_app.models import Offer, OfferDetail
 from user_auth_app.models import UserProfile
 
@@ -93,3 +95,37 @@ class OrderCountViewsTest(APITestCase):
         url = reverse('order-count', args=[9999])
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_base_info_view(self):
+        """
+        Test that BaseInfoView aggregates reviews, business profiles and offers.
+        """
+        provider = User.objects.create_user(username='provider3', email='provider3@example.com', password='password123')
+        UserProfile.objects.create(user=provider, type='business')
+        customer = User.objects.create_user(username='customer3', email='customer3@example.com', password='password123')
+        UserProfile.objects.create(user=customer, type='customer')
+        Offer.objects.create(user=provider, title="Provider Offer 3", description="Test Angebot 3")
+        Review.objects.create(business_user=provider, reviewer=customer, rating=4.5, description="Gut")
+
+        response = self.client.get(reverse('base-info'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'review_count': 1,
+            'average_rating': 4.5,
+            'business_profile_count': 1,
+            'offer_count': 1
+        })
+
+    async def test_order_count_view_async_client(self):
+        """
+        Test that the order count endpoint is served natively by an async client.
+        """
+        provider = await User.objects.acreate(username='provider4', email='provider4@example.com')
+        await UserProfile.objects.acreate(user=provider, type='business')
+        token = await Token.objects.acreate(user=provider)
+        await Order.objects.acreate(customer_user=provider, business_user=provider.id, status='in_progress')
+
+        client = AsyncClient()
+        response = await client.get(reverse('order-count', args=[provider.id]), headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'order_count': 1})
@@ -79,6 +79,14 @@ class OrderAppTest(APITestCase):
         self.assertEqual(Order.objects.count(), 2)
         new_order = Order.objects.get(title='Standard')
         self.assertEqual(new_order.revisions, 5)
+        self.assertEqual(new_order.offer_detail_id_id, detail_id)
+
+    def test_order_survives_offer_deletion(self):
+        """Orders keep their copied data and lose only the link when the offer is deleted."""
+        self.offer.delete()
+        self.order.refresh_from_db()
+        self.assertIsNone(self.order.offer_detail_id)
+        self.assertEqual(self.order.title, 'Basic')
     
     def test_get_order_list(self):
         """GET /orders/ should return all orders"""
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from django.utils import timezone
+from tasks_app.models import Task
+
+
+@admin.action(description='Erneut einreihen')
+def requeue(modeladmin, request, queryset):
+    """
+    Queues the selected tasks again with a fresh attempt budget.
+    """
+    queryset.update(status=Task.Status.QUEUED, attempts=0, run_at=timezone.now(), claim='', locked_until=None)
+
+
+class TaskAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for Task model.
+    """
+    list_display = ('id', 'name', 'queue', 'status', 'attempts', 'max_attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'queue', 'name')
+    search_fields = ('name', 'last_error')
+    ordering = ('-id',)
+    actions = [requeue]
+
+admin.site.register(Task, TaskAdmin)
@@ -0,0 +1,63 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tasks_app.worker import Worker
+
+
+def run_worker(options):
+    worker = Worker(threads=options['threads'], queues=options['queues'], poll_interval=options['poll_interval'])
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    return worker.run(once=options['once'])
+
+
+class Command(BaseCommand):
+    """
+    Runs background tasks from the task table.
+
+    Every process runs a pool of --threads threads. Use several processes for
+    CPU-bound tasks such as image rendering. SIGTERM/SIGINT stop claiming new
+    tasks and wait for running ones.
+
+    Example:
+        python manage.py run_tasks --processes 2 --threads 4
+        python manage.py run_tasks --once   # drain due tasks and exit
+    """
+    help = 'Runs queued background tasks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Worker processes.')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per process.')
+        parser.add_argument('--queue', action='append', dest='queues', help='Only run tasks of this queue (repeatable).')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds between polls when idle.')
+        parser.add_argument('--once', action='store_true', help='Exit once no task is due.')
+
+    def handle(self, *args, **options):
+        if options['processes'] <= 1:
+            processed = run_worker(options)
+            self.stdout.write(f'Processed {processed} tasks.')
+            return
+
+        # Child processes must open their own database connections.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=run_worker, args=(options,), name=f'run_tasks-{number}')
+            for number in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+
+        def forward(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for process in processes:
+            process.join()
+        self.stdout.write(f'{len(processes)} worker processes stopped.')
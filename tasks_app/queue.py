@@ -0,0 +1,171 @@
+"""
+Database-backed task queue.
+
+Functions decorated with @task are queued with enqueue(); the task row is
+written once the current transaction commits, so a task never refers to data
+that was rolled back. Workers (`python manage.py run_tasks`) claim rows with
+claim():
+
+- On databases with SKIP LOCKED (PostgreSQL, MySQL 8) candidate rows are
+  locked with SELECT ... FOR UPDATE SKIP LOCKED, so workers never wait on
+  each other.
+- On SQLite the claiming transaction is a writer transaction (BEGIN
+  IMMEDIATE), which serializes claims across processes.
+
+In both cases the UPDATE re-checks that a row is still claimable and stamps
+it with a per-claim token, and only rows carrying that token are returned.
+A claim is a lease: a task whose worker died becomes claimable again once
+TASKS_LEASE_SECONDS have passed. Failed runs are retried with exponential
+backoff until the task's max_attempts is used up.
+"""
+import datetime
+import importlib
+import logging
+import random
+import traceback
+import uuid
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from tasks_app.models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class UnknownTask(Exception):
+    pass
+
+
+def task(func=None, *, name=None, queue='default', max_attempts=None):
+    """
+    Registers a function as a task. Arguments must be JSON-serializable.
+    """
+    def register(func):
+        func.task_name = name or f'{func.__module__}.{func.__qualname__}'
+        func.task_queue = queue
+        func.task_max_attempts = max_attempts
+        _registry[func.task_name] = func
+        return func
+    return register(func) if func is not None else register
+
+
+def get_task(name):
+    """
+    Returns the registered function, importing its module on first use.
+    """
+    if name not in _registry:
+        module = name.rpartition('.')[0]
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTask(name)
+
+
+def enqueue(func, args=(), kwargs=None, queue=None, delay=None, max_attempts=None):
+    """
+    Queues func(*args, **kwargs) once the current transaction commits
+    (immediately outside of transactions). `delay` is in seconds.
+    """
+    if getattr(func, 'task_name', None) not in _registry:
+        raise UnknownTask(f'{func!r} is not registered with @task.')
+    fields = {
+        'name': func.task_name,
+        'args': list(args),
+        'kwargs': kwargs or {},
+        'queue': queue or func.task_queue,
+        'max_attempts': max_attempts or func.task_max_attempts or getattr(settings, 'TASKS_MAX_ATTEMPTS', 5),
+    }
+    using = router.db_for_write(Task)
+
+    def insert():
+        run_at = timezone.now()
+        if delay:
+            run_at += datetime.timedelta(seconds=delay)
+        Task.objects.using(using).create(run_at=run_at, **fields)
+
+    transaction.on_commit(insert, using=using)
+
+
+def claimable(now):
+    return Q(status=Task.Status.QUEUED, run_at__lte=now) | Q(
+        status=Task.Status.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts')
+    )
+
+
+def claim(limit, queues=None):
+    """
+    Claims up to `limit` due tasks for this worker and returns them.
+    """
+    using = router.db_for_write(Task)
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    lease = datetime.timedelta(seconds=getattr(settings, 'TASKS_LEASE_SECONDS', 300))
+    with transaction.atomic(using=using):
+        candidates = Task.objects.using(using).filter(claimable(now))
+        if queues:
+            candidates = candidates.filter(queue__in=queues)
+        if connections[using].features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.order_by('run_at', 'id').values_list('pk', flat=True)[:limit])
+        if not ids:
+            return []
+        Task.objects.using(using).filter(claimable(now), pk__in=ids).update(
+            status=Task.Status.RUNNING, claim=token, locked_until=now + lease, attempts=F('attempts') + 1
+        )
+        return list(Task.objects.using(using).filter(claim=token))
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff with jitter: base * 2**(attempts - 1), capped.
+    """
+    base = getattr(settings, 'TASKS_RETRY_BASE_DELAY', 10)
+    cap = getattr(settings, 'TASKS_RETRY_MAX_DELAY', 3600)
+    return min(cap, base * 2 ** (attempts - 1)) * random.uniform(0.75, 1.0)
+
+
+def run_task(task_row):
+    """
+    Runs one claimed task and records the outcome. Returns True on success.
+    Outcomes are only written while the claim is still ours.
+    """
+    current = Task.objects.filter(pk=task_row.pk, claim=task_row.claim)
+    try:
+        func = get_task(task_row.name)
+        func(*task_row.args, **task_row.kwargs)
+    except Exception as exc:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if not isinstance(exc, UnknownTask) and task_row.attempts < task_row.max_attempts:
+            delay = datetime.timedelta(seconds=retry_delay(task_row.attempts))
+            current.update(status=Task.Status.QUEUED, run_at=now + delay, claim='', locked_until=None, last_error=error)
+            logger.warning('Task %s (%s) failed, retrying in %s', task_row.pk, task_row.name, delay)
+        else:
+            current.update(status=Task.Status.FAILED, finished_at=now, claim='', locked_until=None, last_error=error)
+            logger.error('Task %s (%s) failed permanently', task_row.pk, task_row.name)
+        return False
+    current.update(status=Task.Status.DONE, finished_at=timezone.now(), claim='', locked_until=None)
+    return True
+
+
+def purge():
+    """
+    Deletes finished tasks older than TASKS_KEEP_FINISHED seconds and fails
+    tasks whose lease expired on their last attempt.
+    """
+    now = timezone.now()
+    keep = datetime.timedelta(seconds=getattr(settings, 'TASKS_KEEP_FINISHED', 7 * 24 * 60 * 60))
+    Task.objects.filter(status=Task.Status.RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts')).update(
+        status=Task.Status.FAILED, finished_at=now, claim='', locked_until=None, last_error='Lease expired.'
+    )
+    deleted, _ = Task.objects.filter(status=Task.Status.DONE, finished_at__lt=now - keep).delete()
+    return deleted
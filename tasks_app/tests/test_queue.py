@@ -0,0 +1,142 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from tasks_app.models import Task
+from tasks_app.queue import UnknownTask, claim, enqueue, purge, run_task, task
+from tasks_app.worker import Worker
+
+calls = []
+
+
+@task
+def record(value, suffix=''):
+    calls.append(f'{value}{suffix}')
+
+
+@task(max_attempts=2)
+def explode():
+    raise RuntimeError('kaputt')
+
+
+@override_settings(TASKS_RETRY_BASE_DELAY=10, TASKS_LEASE_SECONDS=60)
+class TaskQueueTest(TestCase):
+    """
+    Test cases for enqueueing, claiming, retrying and running tasks.
+    """
+    def setUp(self):
+        calls.clear()
+
+    def queue(self, func, *args, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue(func, args=args, kwargs=kwargs)
+        return Task.objects.latest('id')
+
+    def test_enqueue_writes_row_on_commit(self):
+        """The task row is only written once the transaction commits."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            enqueue(record, args=('a',), kwargs={'suffix': '!'})
+            self.assertFalse(Task.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        row = Task.objects.get()
+        self.assertEqual(row.name, 'tasks_app.tests.test_queue.record')
+        self.assertEqual((row.args, row.kwargs, row.status), (['a'], {'suffix': '!'}, Task.Status.QUEUED))
+
+    def test_enqueue_rejects_unregistered_functions(self):
+        with self.assertRaises(UnknownTask):
+            enqueue(print)
+
+    def test_claim_is_exclusive(self):
+        """A claimed task is not handed out again while its lease is valid."""
+        self.queue(record, 'a')
+        self.queue(record, 'b')
+        first = claim(1)
+        second = claim(5)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].pk, second[0].pk)
+        self.assertEqual(claim(5), [])
+        self.assertEqual(first[0].status, Task.Status.RUNNING)
+        self.assertEqual(first[0].attempts, 1)
+
+    def test_expired_lease_is_claimed_again(self):
+        """Tasks of a crashed worker become claimable after the lease."""
+        row = self.queue(record, 'a')
+        claimed = claim(1)[0]
+        Task.objects.filter(pk=row.pk).update(locked_until=timezone.now() - datetime.timedelta(seconds=1))
+        reclaimed = claim(1)[0]
+        self.assertEqual(reclaimed.attempts, 2)
+        self.assertNotEqual(reclaimed.claim, claimed.claim)
+        # The first worker's late result must not overwrite the new claim.
+        run_task(claimed)
+        self.assertEqual(Task.objects.get(pk=row.pk).status, Task.Status.RUNNING)
+
+    def test_future_tasks_wait(self):
+        """Tasks are not claimed before run_at."""
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue(record, args=('a',), delay=60)
+        self.assertEqual(claim(1), [])
+
+    def test_run_marks_done(self):
+        self.queue(record, 'a', suffix='?')
+        self.assertTrue(run_task(claim(1)[0]))
+        self.assertEqual(calls, ['a?'])
+        row = Task.objects.get()
+        self.assertEqual(row.status, Task.Status.DONE)
+        self.assertIsNotNone(row.finished_at)
+
+    def test_failure_is_retried_with_backoff(self):
+        """A failing task is queued again later and fails for good after max_attempts."""
+        row = self.queue(explode)
+        before = timezone.now()
+        self.assertFalse(run_task(claim(1)[0]))
+        row.refresh_from_db()
+        self.assertEqual(row.status, Task.Status.QUEUED)
+        self.assertIn('RuntimeError: kaputt', row.last_error)
+        self.assertGreaterEqual(row.run_at, before + datetime.timedelta(seconds=7.5))
+        self.assertEqual(claim(1), [])
+
+        Task.objects.filter(pk=row.pk).update(run_at=timezone.now())
+        self.assertFalse(run_task(claim(1)[0]))
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Task.Status.FAILED, 2))
+
+    def test_unknown_task_fails_without_retry(self):
+        Task.objects.create(name='tasks_app.tests.test_queue.missing')
+        self.assertFalse(run_task(claim(1)[0]))
+        self.assertEqual(Task.objects.get().status, Task.Status.FAILED)
+
+    def test_purge(self):
+        """Old finished tasks are deleted; exhausted expired leases are failed."""
+        old = timezone.now() - datetime.timedelta(days=30)
+        Task.objects.create(name='x', status=Task.Status.DONE, finished_at=old)
+        stuck = Task.objects.create(name='x', status=Task.Status.RUNNING, attempts=5, max_attempts=5, locked_until=old)
+        self.assertEqual(purge(), 1)
+        stuck.refresh_from_db()
+        self.assertEqual(stuck.status, Task.Status.FAILED)
+
+
+class WorkerTest(TransactionTestCase):
+    """
+    Worker threads use their own connections, so rows must be committed.
+    One thread per worker: the in-memory test database locks whole tables.
+    """
+    def setUp(self):
+        calls.clear()
+
+    def test_worker_drains_queue(self):
+        """run_tasks --once runs every due task on the thread pool."""
+        for value in 'abcde':
+            enqueue(record, args=(value,))
+        self.assertEqual(Worker(threads=1).run(once=True), 5)
+        self.assertEqual(sorted(calls), list('abcde'))
+        self.assertEqual(Task.objects.filter(status=Task.Status.DONE).count(), 5)
+
+        enqueue(record, args=('f',))
+        out = StringIO()
+        call_command('run_tasks', once=True, threads=1, stdout=out)
+        self.assertIn('Processed 1 tasks.', out.getvalue())
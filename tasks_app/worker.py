@@ -0,0 +1,73 @@
+"""
+Task worker: claims due tasks and runs them on a thread pool.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from tasks_app.queue import claim, purge, run_task
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Runs up to `threads` tasks at once. stop() lets running tasks finish.
+    """
+    def __init__(self, threads=4, queues=None, poll_interval=None):
+        self.threads = threads
+        self.queues = queues
+        self.poll_interval = poll_interval or getattr(settings, 'TASKS_POLL_INTERVAL', 1.0)
+        self.stopping = threading.Event()
+        self.processed = 0
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def execute(self, task_row):
+        try:
+            return run_task(task_row)
+        except Exception:
+            # The outcome could not be stored; the task runs again after its lease.
+            logger.exception('Recording the result of task %s failed', task_row.pk)
+            return False
+        finally:
+            close_old_connections()
+
+    def run(self, once=False):
+        """
+        Processes tasks until stop() is called or, with once=True, until no
+        task is due.
+        """
+        in_flight = set()
+        next_purge = 0
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='task-worker') as pool:
+            while not self.stopping.is_set():
+                if time.monotonic() >= next_purge:
+                    purge()
+                    next_purge = time.monotonic() + getattr(settings, 'TASKS_PURGE_INTERVAL', 300)
+                finished = {future for future in in_flight if future.done()}
+                self.processed += len(finished)
+                in_flight -= finished
+
+                free = self.threads - len(in_flight)
+                claimed = claim(free, self.queues) if free else []
+                for task_row in claimed:
+                    in_flight.add(pool.submit(self.execute, task_row))
+
+                if once and not claimed and not in_flight:
+                    break
+                if claimed and len(in_flight) < self.threads:
+                    continue
+                if in_flight:
+                    wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                else:
+                    self.stopping.wait(self.poll_interval)
+            wait(in_flight)
+        self.processed += len(in_flight)
+        close_old_connections()
+        return self.processed
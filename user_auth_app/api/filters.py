@@ -0,0 +1,13 @@
+import django_filters
+from user_auth_app.models import UserProfile
+
+class UserProfileFilter(django_filters.FilterSet):
+    """
+    FilterSet for filtering profiles by location and creation date.
+    """
+    location = django_filters.CharFilter(field_name='location', lookup_expr='icontains')
+    created_at = django_filters.IsoDateTimeFromToRangeFilter(field_name='created_at')
+
+    class Meta:
+        model = UserProfile
+        fields = ['location', 'created_at']
@@ -0,0 +1,17 @@
+from rest_framework.pagination import CursorPagination
+
+class ProfileCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the profile lists, newest profiles first.
+    Pagination is opt-in: without a `cursor` or `page_size` query parameter the
+    full list is returned as before, so existing clients keep working.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params and self.page_size_query_param not in request.query_params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -1,6 +1,11 @@
 from rest_framework import serializers
+from django.utils import timezone
+from rest_framework.authtoken.serializers import AuthTokenSerializer
 from django.contrib.auth.models import User
 from user_auth_app.models import UserProfile
+from user_auth_app.hashing import hash_password
+from coderr_app.images import ImageVariantsField, NormalizedImageField
+from coderr_app.sparse import SparseFieldsMixin
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -34,21 +39,35 @@ class RegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({'username':['Dieser Benutzername ist bereits vergeben.']})
         return value
     
-    def save(self):
-        
+    def save(self, encoded_password=None):
+        """
+        Creates the user and its profile.
+        The password is hashed on the hashing pool unless the caller already
+        passes the encoded hash (the async registration view does).
+        """
         username = self.validated_data['username']
         email = self.validated_data['email']
         password = self.validated_data['password']
         user_type = self.validated_data['type']
 
         user = User(username=username, email=email)
-        user.set_password(password)
+        user.password = encoded_password or hash_password(password)
         user.save()
         
         UserProfile.objects.create(user=user, type=user_type)
         return user
 
 
+class LoginSerializer(AuthTokenSerializer):
+    """
+    Serializer for login credentials.
+    Only validates the fields; the credential check is awaited by the login view
+    so that hashing runs on the hashing pool instead of the request thread.
+    """
+    def validate(self, attrs):
+        return attrs
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for basic user information.
@@ -57,7 +76,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['first_name', 'last_name', 'username']
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for detailed user profile.
     """
@@ -66,14 +85,24 @@ class UserProfileSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')
     email = serializers.EmailField(source='user.email')
+    file = NormalizedImageField(required=False, allow_null=True)
+    file_variants = ImageVariantsField()
     
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type', 'email', 'created_at']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel', 'description', 'working_hours', 'type', 'email', 'created_at']
         read_only_fields = ['user', 'created_at']
 
+    def validate(self, attrs):
+        """
+        Stamps uploaded_at once a new profile picture has been normalized.
+        """
+        if attrs.get('file'):
+            attrs['uploaded_at'] = timezone.now()
+        return attrs
+
       
-class UserProfileBusinessSerializer(serializers.ModelSerializer):
+class UserProfileBusinessSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for business user profile.
     """
@@ -81,13 +110,14 @@ class UserProfileBusinessSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     first_name = serializers.CharField(source='user.first_name', read_only=True)
     last_name = serializers.CharField(source='user.last_name', read_only=True)
+    file_variants = ImageVariantsField()
     
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel', 'description', 'working_hours', 'type']
 
 
-class UserProfileCustomerSerializer(serializers.ModelSerializer):
+class UserProfileCustomerSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for customer user profile.
     """
@@ -95,7 +125,8 @@ class UserProfileCustomerSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     first_name = serializers.CharField(source='user.first_name', read_only=True)
     last_name = serializers.CharField(source='user.last_name', read_only=True)
+    file_variants = ImageVariantsField()
     
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type']
\ No newline at end of file
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'uploaded_at', 'type']
\ No newline at end of file
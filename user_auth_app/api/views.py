@@ -1,26 +1,43 @@
 from rest_framework import status, generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.filters import OrderingFilter
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404 
+from rest_framework.settings import api_settings
+from django.contrib.auth import aauthenticate
+from django.shortcuts import get_object_or_404, aget_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
+from django.utils.translation import gettext_lazy as _
+from asgiref.sync import sync_to_async
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from coderr_app.async_views import AsyncAPIView, AsyncGenericAPIView
+from coderr_app.cache import CachedResponseMixin
+from coderr_app.compiled import CompiledListMixin
+from coderr_app.sparse import SPARSE_PARAMETERS, SparseFieldsetMixin
+from user_auth_app.hashing import ahash_password
 
 from user_auth_app.models import UserProfile
 from user_auth_app.api.permissions import ProfilePermission
-from .serializers import RegistrationSerializer, UserProfileSerializer, UserProfileBusinessSerializer, UserProfileCustomerSerializer
+from user_auth_app.api.pagination import ProfileCursorPagination
+from user_auth_app.api.filters import UserProfileFilter
+from .serializers import RegistrationSerializer, LoginSerializer, UserProfileSerializer, UserProfileBusinessSerializer, UserProfileCustomerSerializer
 
-class RegistrationView(generics.GenericAPIView):
+class RegistrationView(AsyncGenericAPIView):
     permission_classes = [AllowAny]
     serializer_class = RegistrationSerializer
 
-    def post(self, request):
+    async def post(self, request):
         """
         Registers a new user and returns an authentication token.
+        The password is hashed on the bounded hashing pool.
         """
         serializer = self.get_serializer(data=request.data)
-        if serializer.is_valid():
-            saved_account = serializer.save()
-            token, _ = Token.objects.get_or_create(user=saved_account)
+        if await sync_to_async(serializer.is_valid)():
+            encoded_password = await ahash_password(serializer.validated_data['password'])
+            saved_account = await sync_to_async(serializer.save)(encoded_password=encoded_password)
+            token, _ = await Token.objects.aget_or_create(user=saved_account)
             data = {
                 'token': token.key,
                 'username': saved_account.username,
@@ -30,19 +47,28 @@ class RegistrationView(generics.GenericAPIView):
             return Response(data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class CustomLoginView(ObtainAuthToken):
+class CustomLoginView(AsyncAPIView, ObtainAuthToken):
     permission_classes = [AllowAny]
+    serializer_class = LoginSerializer
     
-    def post(self, request):
+    async def post(self, request):
         """
         Authenticates a user and returns an authentication token.
+        The password check runs on the bounded hashing pool.
         """
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(data=request.data, context={'request': request})
         
         data = {}
         if serializer.is_valid():
-            user = serializer.validated_data['user']
-            token, created = Token.objects.get_or_create(user=user)
+            user = await aauthenticate(
+                request,
+                username=serializer.validated_data['username'],
+                password=serializer.validated_data['password']
+            )
+            if user is None:
+                errors = {api_settings.NON_FIELD_ERRORS_KEY: [_('Unable to log in with provided credentials.')]}
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            token, created = await Token.objects.aget_or_create(user=user)
             data = {
                 'token' : token.key,
                 'username' : user.username,
@@ -53,10 +79,11 @@ class CustomLoginView(ObtainAuthToken):
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
+@extend_schema_view(get=extend_schema(parameters=SPARSE_PARAMETERS))
+class UserProfileDetail(CachedResponseMixin, SparseFieldsetMixin, AsyncGenericAPIView, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a user's profile.
-    GET requests are allowed for any authenticated user.
+    GET requests are allowed for any authenticated user, served by the async ORM and cached.
     PATCH, PUT, DELETE requests require that the user is the owner or an admin.
     """
     queryset = UserProfile.objects.all()
@@ -71,6 +98,30 @@ class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
         obj = get_object_or_404(UserProfile, user_id=self.kwargs['pk'])
         self.check_object_permissions(self.request, obj)
         return obj
+
+    async def aget_object(self):
+        """
+        Async variant of get_object, fetching the related user in the same query.
+        """
+        obj = await aget_object_or_404(UserProfile.objects.select_related('user'), user_id=self.kwargs['pk'])
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def get(self, request, *args, **kwargs):
+        async def render():
+            instance = await self.aget_object()
+            serializer = self.get_serializer(instance)
+            return Response(serializer.data)
+        return await self.acached_response(request, render)
+
+    async def put(self, request, *args, **kwargs):
+        return await sync_to_async(self.update)(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await sync_to_async(self.partial_update)(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await sync_to_async(self.destroy)(request, *args, **kwargs)
     
     def update(self, request, *args, **kwargs):
         """
@@ -91,18 +142,43 @@ class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
         self.perform_update(serializer)
         return Response(serializer.data)
     
-class UserProfileBusinessList(generics.ListAPIView):
+class UserProfileListMixin:
+    """
+    Shared configuration for the profile lists: the user columns are joined in
+    the same query, optional cursor pagination, filtering by location and
+    creation date, and ordering.
+    """
+    profile_type = None
+    profile_fields = []
+    permission_classes = [IsAuthenticated]
+    pagination_class = ProfileCursorPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = UserProfileFilter
+    ordering_fields = ['created_at', 'location']
+
+    def get_queryset(self):
+        user_fields = ['user__id', 'user__username', 'user__first_name', 'user__last_name']
+        return (
+            UserProfile.objects.filter(type=self.profile_type)
+            .select_related('user')
+            .only('user_id', 'type', 'created_at', *self.profile_fields, *user_fields)
+            .order_by('-created_at')
+        )
+
+@extend_schema_view(get=extend_schema(parameters=SPARSE_PARAMETERS))
+class UserProfileBusinessList(CachedResponseMixin, SparseFieldsetMixin, CompiledListMixin, UserProfileListMixin, generics.ListAPIView):
     """
     Lists all business user profiles.
     """
-    queryset = UserProfile.objects.filter(type=UserProfile.UserType.BUSINESS)
+    profile_type = UserProfile.UserType.BUSINESS
+    profile_fields = ['file', 'file_variants', 'location', 'tel', 'description', 'working_hours']
     serializer_class = UserProfileBusinessSerializer
-    permission_classes = [IsAuthenticated]
     
-class UserProfileCustomerList(generics.ListAPIView):
+@extend_schema_view(get=extend_schema(parameters=SPARSE_PARAMETERS))
+class UserProfileCustomerList(CachedResponseMixin, SparseFieldsetMixin, CompiledListMixin, UserProfileListMixin, generics.ListAPIView):
     """
     Lists all customer user profiles.
     """
-    queryset = UserProfile.objects.filter(type=UserProfile.UserType.CUSTOMER)
+    profile_type = UserProfile.UserType.CUSTOMER
+    profile_fields = ['file', 'file_variants', 'uploaded_at']
     serializer_class = UserProfileCustomerSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
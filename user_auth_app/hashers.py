@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth.hashers import ScryptPasswordHasher
+
+
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    Memory-hard scrypt hasher (hashlib.scrypt) whose cost parameters come from
+    settings.PASSWORD_SCRYPT_PARAMS. Changing the parameters makes must_update()
+    true for existing hashes, so they are upgraded on the next login.
+    """
+
+    def _param(self, name):
+        return getattr(settings, 'PASSWORD_SCRYPT_PARAMS', {}).get(name, getattr(ScryptPasswordHasher, name))
+
+    @property
+    def work_factor(self):
+        return self._param('work_factor')
+
+    @property
+    def block_size(self):
+        return self._param('block_size')
+
+    @property
+    def parallelism(self):
+        return self._param('parallelism')
+
+    @property
+    def maxmem(self):
+        return self._param('maxmem')
@@ -0,0 +1,59 @@
+"""
+Bounded worker pool for password hashing.
+
+PBKDF2 and scrypt release the GIL, so a small thread pool runs hashes in
+parallel while capping how many run at once. A burst of sign-ups or logins
+queues here instead of starving every other request of CPU.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the shared hashing pool, sized by PASSWORD_HASHING_WORKERS.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, 'PASSWORD_HASHING_WORKERS', None) or os.cpu_count() or 1
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+    return _executor
+
+
+def hash_password(raw_password):
+    """
+    Hashes a raw password on the pool and blocks until it is done.
+    """
+    return get_executor().submit(make_password, raw_password).result()
+
+
+def check_password(raw_password, encoded):
+    """
+    Verifies a raw password on the pool.
+    Returns (is_correct, must_update) like django.contrib.auth.hashers.verify_password.
+    """
+    return get_executor().submit(verify_password, raw_password, encoded).result()
+
+
+async def ahash_password(raw_password):
+    """
+    Async variant of hash_password that awaits the pool without holding a thread.
+    """
+    return await asyncio.wrap_future(get_executor().submit(make_password, raw_password))
+
+
+async def acheck_password(raw_password, encoded):
+    """
+    Async variant of check_password.
+    """
+    return await asyncio.wrap_future(get_executor().submit(verify_password, raw_password, encoded))
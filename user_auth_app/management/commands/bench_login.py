@@ -0,0 +1,66 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+
+from user_auth_app.hashing import check_password, get_executor
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks sustained password verifications (the CPU cost of a login)
+    through the bounded hashing pool and reports logins/sec per core.
+
+    Example:
+        python manage.py bench_login --duration 10 --clients 32
+    """
+    help = 'Measures sustained logins/sec per core for the configured password hashers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run per hasher.')
+        parser.add_argument('--clients', type=int, default=16, help='Concurrent simulated clients.')
+        parser.add_argument(
+            '--hasher',
+            action='append',
+            dest='hashers',
+            help='Hasher algorithm to measure (repeatable). Defaults to scrypt and pbkdf2_sha256.'
+        )
+
+    def handle(self, *args, **options):
+        duration = options['duration']
+        clients = options['clients']
+        hashers = options['hashers'] or ['scrypt', 'pbkdf2_sha256']
+        workers = get_executor()._max_workers
+        cores = min(workers, os.cpu_count() or 1)
+
+        self.stdout.write(f'pool workers: {workers}, cores used: {cores}, clients: {clients}')
+        for algorithm in hashers:
+            hasher = get_hasher(algorithm)
+            encoded = make_password('benchmark-password', hasher=algorithm)
+            logins = self._run(encoded, duration, clients)
+            rate = logins / duration
+            self.stdout.write(
+                f'{hasher.algorithm:<16} {logins:>7} logins in {duration:.1f}s '
+                f'{rate:>9.1f} logins/s {rate / cores:>9.1f} logins/s/core'
+            )
+
+    def _run(self, encoded, duration, clients):
+        """
+        Lets every client verify the password in a loop until the deadline passes.
+        """
+        deadline = time.perf_counter() + duration
+
+        def client():
+            count = 0
+            while time.perf_counter() < deadline:
+                is_correct, _ = check_password('benchmark-password', encoded)
+                assert is_correct
+                count += 1
+            return count
+
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            futures = [pool.submit(client) for _ in range(clients)]
+            wait(futures)
+        return sum(future.result() for future in futures)
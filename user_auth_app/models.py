@@ -11,6 +11,7 @@ class UserProfile(models.Model):
         CUSTOMER = 'customer', 'customer'
     user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='profile')
     file = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    file_variants = models.JSONField(default=dict, blank=True, editable=False)
     location = models.CharField(default="", max_length=100, blank=True, null=True)
     tel = models.CharField(default="012345678", max_length=20, blank=True, null=True)
     description= models.TextField(default="", blank=True, null=True)
@@ -18,6 +19,11 @@ class UserProfile(models.Model):
     type = models.CharField(max_length=8, choices=UserType.choices, default=UserType.CUSTOMER)
     created_at = models.DateTimeField(default=timezone.now)
     uploaded_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['type', '-created_at'], name='userprofile_type_created_idx'),
+        ]
     
 
     def __str__(self):
@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coderr_app.cache import collection_tag, invalidate_instance, invalidate_tags
+from coderr_app.images import schedule_variants, variants_outdated
+from offers_app.models import Offer
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=UserProfile)
+def render_profile_image_variants(sender, instance, **kwargs):
+    """
+    Queues thumbnail rendering whenever the profile picture changed.
+    """
+    if variants_outdated(instance, 'file', 'file_variants'):
+        schedule_variants(instance, 'file', 'file_variants')
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """
+    Drops cached profile responses of the user.
+    Offer lists embed the user's names, so they are invalidated as well.
+    """
+    invalidate_instance(UserProfile, instance.pk)
+    invalidate_tags(collection_tag(Offer))
@@ -1,8 +1,17 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
+from PIL import Image
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.auth.hashers import make_password
 from .models import UserProfile
 
 User = get_user_model()
@@ -80,6 +89,7 @@ class UserAuthAppTest(APITestCase):
             'first_name': 'Max',
             'last_name': 'Mustermann',
             'file': 'http://testserver/media/image.png',
+            'file_variants': {},
             'location': 'Hamburg',
             'tel': '+49040123456',
             'description': 'Test',
@@ -173,3 +183,162 @@ class UserAuthAppTest(APITestCase):
         url = reverse('userprofile-business-list')
         response = self.csrf_client.get(url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_registration_hashes_with_preferred_hasher(self):
+        """Test that registration stores the password with the configured scrypt profile."""
+        client = APIClient()
+        url = reverse('registration')
+        data = {
+            'username': 'scryptuser',
+            'email': 'scryptuser@gmail.com',
+            'password': 'werte',
+            'repeated_password': 'werte',
+            'type': 'business'
+        }
+        response = client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = User.objects.get(username='scryptuser')
+        self.assertTrue(user.password.startswith('scrypt$'))
+        self.assertTrue(user.check_password('werte'))
+        self.assertEqual(user.profile.type, 'business')
+
+    def test_login_rehashes_outdated_password(self):
+        """Test that a login with a PBKDF2 hash transparently upgrades it to scrypt."""
+        self.user2.password = make_password('werte12345', hasher='pbkdf2_sha256')
+        self.user2.save(update_fields=['password'])
+        client = APIClient()
+        url = reverse('login')
+        response = client.post(url, {'username': 'testbusinessuser', 'password': 'werte12345'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['token'], self.token2.key)
+        self.user2.refresh_from_db()
+        self.assertTrue(self.user2.password.startswith('scrypt$'))
+
+    def test_login_wrong_password_keeps_hash(self):
+        """Test that a failed login neither authenticates nor rewrites the stored hash."""
+        encoded = make_password('werte12345', hasher='pbkdf2_sha256')
+        self.user2.password = encoded
+        self.user2.save(update_fields=['password'])
+        client = APIClient()
+        url = reverse('login')
+        response = client.post(url, {'username': 'testbusinessuser', 'password': 'falsch'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user2.refresh_from_db()
+        self.assertEqual(self.user2.password, encoded)
+
+    def test_login_inactive_user_keeps_hash(self):
+        """Test that an inactive user is rejected before the stored hash is upgraded."""
+        encoded = make_password('werte12345', hasher='pbkdf2_sha256')
+        self.user2.password = encoded
+        self.user2.is_active = False
+        self.user2.save(update_fields=['password', 'is_active'])
+        failed = []
+
+        def record_failure(credentials, **kwargs):
+            failed.append(credentials['username'])
+
+        user_login_failed.connect(record_failure)
+        self.addCleanup(user_login_failed.disconnect, record_failure)
+        client = APIClient()
+        url = reverse('login')
+        response = client.post(url, {'username': 'testbusinessuser', 'password': 'werte12345'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(failed, ['testbusinessuser'])
+        self.user2.refresh_from_db()
+        self.assertEqual(self.user2.password, encoded)
+
+    def _create_business_profiles(self, count):
+        for i in range(count):
+            user = User.objects.create(username=f'business{i}', first_name=f'Vorname{i}', email=f'business{i}@gmail.com')
+            UserProfile.objects.create(user=user, type='business', location='Berlin' if i % 2 else 'Hamburg')
+
+    def test_business_list_query_count_is_constant(self):
+        """Test that the business list fetches users in the same query instead of one query per profile."""
+        self._create_business_profiles(10)
+        url = reverse('userprofile-business-list')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 11)
+        self.assertIn('first_name', response.data[0])
+
+    def test_business_list_cursor_pagination(self):
+        """Test that page_size switches the business list to cursor pagination."""
+        self._create_business_profiles(5)
+        url = reverse('userprofile-business-list')
+        response = self.client.get(url, {'page_size': 4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertIsNotNone(response.data['next'])
+        next_page = self.client.get(response.data['next'])
+        self.assertEqual(len(next_page.data['results']), 2)
+        self.assertIsNone(next_page.data['next'])
+        ids = [p['user'] for p in response.data['results'] + next_page.data['results']]
+        self.assertEqual(len(set(ids)), 6)
+
+    def test_business_list_filter_and_ordering(self):
+        """Test that the business list can be filtered by location and ordered by creation date."""
+        self._create_business_profiles(4)
+        url = reverse('userprofile-business-list')
+        response = self.client.get(url, {'location': 'berlin'})
+        self.assertEqual(len(response.data), 2)
+        self.assertTrue(all(p['location'] == 'Berlin' for p in response.data))
+        response = self.client.get(url, {'ordering': 'created_at', 'created_at_before': '2025-06-01T00:00:00Z'})
+        self.assertEqual([p['username'] for p in response.data], ['testbusinessuser'])
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_UPLOAD_MAX_SIDE=500)
+class UserProfileUploadTest(APITestCase):
+    """
+    Test cases for profile picture normalization on upload.
+    """
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='uploaduser', password='werte12345', email='upload@gmail.com')
+        self.userprofile = UserProfile.objects.create(user=self.user, type='customer')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('userprofile-detail', kwargs={'pk': self.user.id})
+
+    def make_upload(self, size, name='foto.jpg'):
+        exif = Image.Exif()
+        exif[0x0110] = 'Testkamera'
+        buffer = BytesIO()
+        Image.new('RGB', size, color=(10, 120, 200)).save(buffer, format='JPEG', exif=exif)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def test_upload_is_downsized_and_stripped(self):
+        """Test that an uploaded picture is downsized, stripped of EXIF and stamps uploaded_at."""
+        response = self.client.patch(self.url, {'file': self.make_upload((1600, 1200))}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.userprofile.refresh_from_db()
+        self.assertIsNotNone(self.userprofile.uploaded_at)
+        with self.userprofile.file.open('rb') as fh, Image.open(fh) as stored:
+            self.assertEqual(stored.size, (500, 375))
+            self.assertEqual(stored.format, 'JPEG')
+            self.assertEqual(len(stored.getexif()), 0)
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=100 * 100)
+    def test_upload_with_too_many_pixels_is_rejected(self):
+        """Test that an image above the pixel limit is rejected before it is decoded."""
+        response = self.client.patch(self.url, {'file': self.make_upload((200, 200))}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file', response.data)
+        self.userprofile.refresh_from_db()
+        self.assertFalse(self.userprofile.file)
+        self.assertIsNone(self.userprofile.uploaded_at)
+
+    def test_truncated_upload_is_rejected(self):
+        """Test that an image whose pixel data is cut off is rejected with 400."""
+        upload = self.make_upload((800, 600))
+        truncated = SimpleUploadedFile('foto.jpg', upload.read()[:-400], content_type='image/jpeg')
+        response = self.client.patch(self.url, {'file': truncated}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file', response.data)
+        self.userprofile.refresh_from_db()
+        self.assertFalse(self.userprofile.file)